@@ -0,0 +1,126 @@
+# ============================================
+# ACTIVITY FEED - k-way merge of time-sorted Mongo cursors
+# Newest-first pages with opaque `before` cursors; each source reads at most one page
+# ============================================
+
+from typing import Optional, Dict, Any, List, Callable, AsyncIterator, Tuple
+import asyncio
+import base64
+import heapq
+import json
+
+MAX_PAGE_SIZE = 100
+
+class FeedSource:
+    """One collection in the feed: its filter, timestamp field and entry formatter"""
+
+    def __init__(
+        self,
+        collection: str,
+        time_field: str,
+        format: Callable[[Dict[str, Any]], Dict[str, Any]],
+        filter: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ):
+        self.collection = collection
+        self.time_field = time_field
+        self.format = format
+        self.filter = filter or {}
+        self.projection = projection or {"_id": 0}
+
+    def query(self, before: Optional[Tuple[str, str]]) -> Dict[str, Any]:
+        """Filter for documents strictly older than `before` in (time, id) order"""
+        if before is None:
+            return self.filter
+        timestamp, entry_id = before
+        older = {"$or": [
+            {self.time_field: {"$lt": timestamp}},
+            {self.time_field: timestamp, "id": {"$lt": entry_id}}
+        ]}
+        return {"$and": [self.filter, older]} if self.filter else older
+
+# ---------- Cursors ----------
+
+def encode_cursor(entry: Dict[str, Any]) -> str:
+    raw = json.dumps([entry["timestamp"], entry["id"]], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(timestamp, id) from encode_cursor output; ValueError when malformed"""
+    try:
+        timestamp, entry_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(timestamp, str) or not isinstance(entry_id, str):
+        raise ValueError("Invalid cursor")
+    return timestamp, entry_id
+
+def entry_key(entry: Dict[str, Any]) -> Tuple[str, str]:
+    return entry["timestamp"], entry["id"]
+
+# ---------- k-way merge ----------
+
+class _Newest:
+    """Heap key that pops the largest (newest) key first"""
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other: "_Newest") -> bool:
+        return self.key > other.key
+
+async def merge_newest_first(streams: List[AsyncIterator[Dict[str, Any]]], key=entry_key) -> AsyncIterator[Dict[str, Any]]:
+    """Merge streams that are each sorted newest-first, holding one entry per stream"""
+    heads = await asyncio.gather(*(anext(stream, None) for stream in streams))
+    heap = [(_Newest(key(head)), index, head) for index, head in enumerate(heads) if head is not None]
+    heapq.heapify(heap)
+    try:
+        while heap:
+            _, index, entry = heapq.heappop(heap)
+            yield entry
+            following = await anext(streams[index], None)
+            if following is not None:
+                heapq.heappush(heap, (_Newest(key(following)), index, following))
+    finally:
+        for stream in streams:
+            await stream.aclose()
+
+# ---------- Feed ----------
+
+class ActivityFeed:
+    """Newest-first feed over several collections"""
+
+    def __init__(self, sources: List[FeedSource]):
+        self.sources = sources
+
+    async def _read(self, db, source: FeedSource, before: Optional[Tuple[str, str]], limit: int) -> AsyncIterator[Dict[str, Any]]:
+        cursor = db[source.collection].find(source.query(before), source.projection)
+        cursor = cursor.sort([(source.time_field, -1), ("id", -1)]).limit(limit)
+        async for doc in cursor:
+            yield source.format(doc)
+
+    async def page(self, db, limit: int = 15, before: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Up to `limit` entries older than the `before` cursor, plus the cursor for the
+        next page (None at the end). Each source reads at most limit + 1 documents.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        position = decode_cursor(before) if before else None
+        merged = merge_newest_first([self._read(db, source, position, limit + 1) for source in self.sources])
+        entries: List[Dict[str, Any]] = []
+        try:
+            async for entry in merged:
+                entries.append(entry)
+                if len(entries) > limit:
+                    break
+        finally:
+            await merged.aclose()
+
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        return {
+            "activities": entries,
+            "next_cursor": encode_cursor(entries[-1]) if has_more else None,
+            "has_more": has_more
+        }
@@ -4,13 +4,26 @@
 # ============================================
 
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, FrozenSet, Iterable
 from datetime import datetime, timezone
+from collections import OrderedDict
+import heapq
 import logging
 import os
 
+# NumPy for batch scoring (score_matrix)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None
+
 logger = logging.getLogger(__name__)
 
+# Distinct profile skills whose related keyword lists are memoized per matcher
+SKILL_CATEGORY_CACHE_SIZE = 2048
+
 # ============================================
 # MATCH RESULT MODEL
 # ============================================
@@ -57,6 +70,178 @@ class ProfileMatchInput(BaseModel):
     salary_expectation_max: Optional[int] = None
     open_to_remote: bool = True
 
+# ============================================
+# KEYWORD MATCHER - Shared, memoized keyword scan
+# ============================================
+
+class KeywordHits:
+    """
+    Keyword hits for one lowercased job text
+    Each keyword is searched at most once (on first use) and remembered, so skill and
+    interest scoring - and every profile scored against the same job - share the work
+    """
+    
+    __slots__ = ("text", "keywords", "_seen")
+    
+    def __init__(self, text: str, keywords: tuple):
+        self.text = text
+        self.keywords = keywords
+        self._seen: Dict[str, bool] = {}
+    
+    def any_of(self, keywords: Iterable[str]) -> bool:
+        """Same result as any(kw in text for kw in keywords)"""
+        seen = self._seen
+        for kw in keywords:
+            hit = seen.get(kw)
+            if hit is None:
+                hit = seen[kw] = kw in self.text
+            if hit:
+                return True
+        return False
+    
+    def all(self) -> FrozenSet[str]:
+        """Every keyword of the matcher vocabulary present in the text"""
+        seen = self._seen
+        for kw in self.keywords:
+            if kw not in seen:
+                seen[kw] = kw in self.text
+        return frozenset(kw for kw, hit in seen.items() if hit)
+
+class KeywordMatcher:
+    """
+    Deduplicated keyword vocabulary for job text scanning
+    Hits are found lazily with `kw in text` (same semantics as before, so scores are
+    unchanged) and memoized per text by KeywordHits
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        # Deduplicated once - "engineer", "data", "sales" etc. appear in several tables
+        self.keywords = tuple(sorted(set(keywords)))
+        self.index = {kw: i for i, kw in enumerate(self.keywords)}
+    
+    def scan(self, text: str) -> KeywordHits:
+        """Lazy, memoized hits for text (text should already be lowercased)"""
+        return KeywordHits(text, self.keywords)
+    
+    def find(self, text: str) -> FrozenSet[str]:
+        """Return all keywords present in text (text should already be lowercased)"""
+        return self.scan(text).all()
+    
+    def to_bits(self, keywords: Iterable[str]) -> int:
+        """Bitset of keywords (bit i = self.keywords[i])"""
+        bits = 0
+        for kw in keywords:
+            bits |= 1 << self.index[kw]
+        return bits
+
+# ============================================
+# JOB FEATURES - Parsed once per job, reused across profiles
+# ============================================
+
+def job_content_hash(job: Dict[str, Any]) -> int:
+    """
+    Hash of the job fields that affect matching
+    In-process only (str hashes are salted per process but cached on the string,
+    so re-hashing the same job dicts is nearly free)
+    """
+    return hash((
+        job.get("title", ""),
+        job.get("description", ""),
+        tuple(job.get("required_skills", []) or []),
+        job.get("required_experience_years"),
+        job.get("salary_min"),
+        job.get("salary_max")
+    ))
+
+class JobFeatures:
+    """
+    Profile-independent job data used by the matcher
+    Lowercased text/skills, keyword hits, salary midpoint and experience requirement
+    """
+    
+    __slots__ = (
+        "job_id", "content_hash", "job_text", "required_skills_lower", "keyword_hits",
+        "experience_years", "salary_min", "salary_max", "salary_mid", "_keyword_bits"
+    )
+    
+    def __init__(
+        self,
+        job_id: str,
+        content_hash: Optional[int],
+        job_text: str,
+        required_skills_lower: List[str],
+        keyword_hits: KeywordHits,
+        experience_years: Optional[int],
+        salary_min: Optional[int],
+        salary_max: Optional[int]
+    ):
+        self.job_id = job_id
+        self.content_hash = content_hash
+        self.job_text = job_text
+        self.required_skills_lower = required_skills_lower
+        self.keyword_hits = keyword_hits
+        self.experience_years = experience_years
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        # Same midpoint calculate_salary_match uses; None when salary not disclosed
+        self.salary_mid = (
+            ((salary_min or 0) + (salary_max or salary_min or 0)) / 2
+            if salary_min or salary_max else None
+        )
+        self._keyword_bits: Optional[int] = None
+    
+    def keyword_bits(self, matcher: KeywordMatcher) -> int:
+        """Bitset of every keyword hit (forces a full scan of the vocabulary once)"""
+        if self._keyword_bits is None:
+            self._keyword_bits = matcher.to_bits(self.keyword_hits.all())
+        return self._keyword_bits
+
+class JobFeatureCache:
+    """
+    LRU cache of JobFeatures keyed by job id
+    An entry is only reused while the job's content hash is unchanged
+    """
+    
+    def __init__(self, maxsize: int = 5000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Any, JobFeatures]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Any, content_hash: int) -> Optional[JobFeatures]:
+        features = self._entries.get(key)
+        if features is None or features.content_hash != content_hash:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return features
+    
+    def put(self, key: Any, features: JobFeatures):
+        self._entries[key] = features
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
 # ============================================
 # AI MATCHER SERVICE
 # ============================================
@@ -99,12 +284,71 @@ class AIJobMatcher:
         "EXPERT": (10, 20)
     }
     
-    def calculate_skill_match(self, profile_skills: List[str], job_skills: List[str], job_title: str, job_description: str) -> tuple[int, List[str]]:
-        """Calculate skill match score and reasons"""
+    def __init__(self, feature_cache_size: int = 5000):
+        # Built once from both keyword tables
+        self.keyword_matcher = KeywordMatcher(
+            [kw for keywords in self.SKILL_KEYWORDS.values() for kw in keywords] +
+            [kw for keywords in self.INTEREST_TO_JOB_TYPE.values() for kw in keywords]
+        )
+        self.feature_cache = JobFeatureCache(feature_cache_size)
+        self._skill_categories: Dict[str, tuple] = {}
+    
+    def skill_categories(self, skill_lower: str) -> tuple:
+        """SKILL_KEYWORDS keyword lists related to a profile skill (memoized per matcher)"""
+        categories = self._skill_categories.get(skill_lower)
+        if categories is None:
+            if len(self._skill_categories) >= SKILL_CATEGORY_CACHE_SIZE:
+                self._skill_categories.clear()
+            categories = self._skill_categories[skill_lower] = tuple(
+                keywords for category, keywords in self.SKILL_KEYWORDS.items()
+                if skill_lower in category.lower() or any(kw in skill_lower for kw in keywords)
+            )
+        return categories
+    
+    def build_job_features(self, job: Dict[str, Any], content_hash: Optional[int] = None) -> JobFeatures:
+        """Parse a job once: lowercased text and skills, keyword hits, salary and experience"""
+        job_text = f"{job.get('title', '')} {job.get('description', '')}".lower()
+        return JobFeatures(
+            job_id=job.get("id", ""),
+            content_hash=content_hash,
+            job_text=job_text,
+            required_skills_lower=[s.lower() for s in job.get("required_skills", []) or []],
+            keyword_hits=self.keyword_matcher.scan(job_text),
+            experience_years=job.get("required_experience_years"),
+            salary_min=job.get("salary_min"),
+            salary_max=job.get("salary_max")
+        )
+    
+    def get_job_features(self, job: Dict[str, Any]) -> JobFeatures:
+        """Cached JobFeatures for a job (keyed by id, invalidated when its content changes)"""
+        content_hash = job_content_hash(job)
+        key = job.get("id") or content_hash
+        features = self.feature_cache.get(key, content_hash)
+        if features is None:
+            features = self.build_job_features(job, content_hash)
+            self.feature_cache.put(key, features)
+        return features
+    
+    def calculate_skill_match(
+        self,
+        profile_skills: List[str],
+        job_skills: List[str],
+        job_title: str,
+        job_description: str,
+        features: Optional[JobFeatures] = None,
+        with_reasons: bool = True
+    ) -> tuple[int, List[str]]:
+        """Calculate skill match score and reasons (reasons skipped when with_reasons=False)"""
+        
+        if features is None:
+            features = self.build_job_features(
+                {"title": job_title, "description": job_description, "required_skills": job_skills}
+            )
         
-        if not job_skills:
+        if not features.required_skills_lower:
             # Extract skills from title and description
-            job_text = f"{job_title} {job_description}".lower()
+            job_text = features.job_text
+            keyword_hits = features.keyword_hits
             matched_keywords = []
             
             for skill in profile_skills:
@@ -113,22 +357,21 @@ class AIJobMatcher:
                     matched_keywords.append(skill)
                 else:
                     # Check skill keywords
-                    for category, keywords in self.SKILL_KEYWORDS.items():
-                        if skill_lower in category.lower() or any(kw in skill_lower for kw in keywords):
-                            if any(kw in job_text for kw in keywords):
-                                matched_keywords.append(skill)
-                                break
+                    for keywords in self.skill_categories(skill_lower):
+                        if keyword_hits.any_of(keywords):
+                            matched_keywords.append(skill)
+                            break
             
             if not profile_skills:
                 return 50, ["Skills not specified - general match"]
             
             match_score = min(100, (len(matched_keywords) / max(1, len(profile_skills))) * 100)
-            reasons = [f"Matched skill: {skill}" for skill in matched_keywords[:5]]
+            reasons = [f"Matched skill: {skill}" for skill in matched_keywords[:5]] if with_reasons else []
             return int(match_score), reasons
         
         # Direct skill comparison
         profile_skills_lower = [s.lower() for s in profile_skills]
-        job_skills_lower = [s.lower() for s in job_skills]
+        job_skills_lower = features.required_skills_lower
         
         matched = []
         for skill in profile_skills_lower:
@@ -138,17 +381,26 @@ class AIJobMatcher:
                     break
         
         match_score = min(100, (len(matched) / max(1, len(job_skills_lower))) * 100)
-        reasons = [f"Matched skill: {skill}" for skill in matched[:5]]
+        reasons = [f"Matched skill: {skill}" for skill in matched[:5]] if with_reasons else []
         
         return int(match_score), reasons
     
-    def calculate_interest_match(self, career_interests: Dict[str, int], job_title: str, job_description: str) -> tuple[int, List[str]]:
+    def calculate_interest_match(
+        self,
+        career_interests: Dict[str, int],
+        job_title: str,
+        job_description: str,
+        features: Optional[JobFeatures] = None,
+        with_reasons: bool = True
+    ) -> tuple[int, List[str]]:
         """Calculate interest match score"""
         
         if not career_interests:
             return 50, ["Career interests not specified"]
         
-        job_text = f"{job_title} {job_description}".lower()
+        if features is None:
+            features = self.build_job_features({"title": job_title, "description": job_description})
+        keyword_hits = features.keyword_hits
         
         # Find matching interests
         matched_interests = []
@@ -157,7 +409,7 @@ class AIJobMatcher:
         for interest, score in career_interests.items():
             if score >= 50:  # Only consider significant interests
                 keywords = self.INTEREST_TO_JOB_TYPE.get(interest, [])
-                if any(kw in job_text for kw in keywords):
+                if keyword_hits.any_of(keywords):
                     matched_interests.append((interest, score))
                     total_score += score
         
@@ -168,7 +420,7 @@ class AIJobMatcher:
         avg_interest_score = total_score / len(matched_interests)
         match_score = int(avg_interest_score)
         
-        reasons = [f"Aligns with {interest} interest ({score}%)" for interest, score in matched_interests[:3]]
+        reasons = [f"Aligns with {interest} interest ({score}%)" for interest, score in matched_interests[:3]] if with_reasons else []
         
         return match_score, reasons
     
@@ -220,11 +472,20 @@ class AIJobMatcher:
         else:
             return 30, ["Salary significantly below expectations"]
     
-    def match_job_to_profile(self, profile: ProfileMatchInput, job: Dict[str, Any]) -> JobMatchResult:
+    def match_job_to_profile(
+        self,
+        profile: ProfileMatchInput,
+        job: Dict[str, Any],
+        features: Optional[JobFeatures] = None
+    ) -> JobMatchResult:
         """
         Calculate comprehensive match score for a job
+        Job parsing is reused from the feature cache unless features are passed in
         """
         
+        if features is None:
+            features = self.get_job_features(job)
+        
         # Extract job data
         job_title = job.get("title", "")
         job_description = job.get("description", "")
@@ -236,11 +497,11 @@ class AIJobMatcher:
         
         # Calculate individual scores
         skill_score, skill_reasons = self.calculate_skill_match(
-            profile.skills, job_skills, job_title, job_description
+            profile.skills, job_skills, job_title, job_description, features
         )
         
         interest_score, interest_reasons = self.calculate_interest_match(
-            profile.career_interests, job_title, job_description
+            profile.career_interests, job_title, job_description, features
         )
         
         level_score, level_reasons = self.calculate_level_match(
@@ -254,20 +515,10 @@ class AIJobMatcher:
             job_salary_max
         )
         
-        # Calculate overall score (weighted)
-        overall_score = int(
-            skill_score * 0.35 +
-            interest_score * 0.30 +
-            level_score * 0.20 +
-            salary_score * 0.15
+        overall_score = self.calculate_overall_score(
+            profile.doers_score, skill_score, interest_score, level_score, salary_score
         )
         
-        # Boost based on DoersScore
-        if profile.doers_score >= 750:
-            overall_score = min(100, overall_score + 10)
-        elif profile.doers_score >= 650:
-            overall_score = min(100, overall_score + 5)
-        
         # Combine reasons
         all_reasons = skill_reasons + interest_reasons + level_reasons + salary_reasons
         
@@ -282,16 +533,6 @@ class AIJobMatcher:
         if salary_score < 50:
             suggestions.append("Negotiate based on your DoersScore™ and proven skills")
         
-        # Determine recommendation
-        if overall_score >= 80:
-            recommendation = "perfect_match"
-        elif overall_score >= 60:
-            recommendation = "good_match"
-        elif overall_score >= 40:
-            recommendation = "stretch_role"
-        else:
-            recommendation = "develop_first"
-        
         return JobMatchResult(
             job_id=job.get("id", ""),
             job_title=job_title,
@@ -303,20 +544,114 @@ class AIJobMatcher:
             salary_match_score=salary_score,
             match_reasons=all_reasons[:7],
             improvement_suggestions=suggestions,
-            recommendation=recommendation,
+            recommendation=self.recommendation_for_score(overall_score),
             confidence=min(0.95, overall_score / 100)
         )
     
-    def rank_jobs_for_profile(self, profile: ProfileMatchInput, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def calculate_overall_score(
+        self,
+        doers_score: int,
+        skill_score: int,
+        interest_score: int,
+        level_score: int,
+        salary_score: int
+    ) -> int:
+        """Weighted overall score with DoersScore boost"""
+        
+        # Calculate overall score (weighted)
+        overall_score = int(
+            skill_score * 0.35 +
+            interest_score * 0.30 +
+            level_score * 0.20 +
+            salary_score * 0.15
+        )
+        
+        # Boost based on DoersScore
+        if doers_score >= 750:
+            overall_score = min(100, overall_score + 10)
+        elif doers_score >= 650:
+            overall_score = min(100, overall_score + 5)
+        
+        return overall_score
+    
+    @staticmethod
+    def recommendation_for_score(overall_score: int) -> str:
+        """Map an overall match score to a recommendation bucket"""
+        if overall_score >= 80:
+            return "perfect_match"
+        elif overall_score >= 60:
+            return "good_match"
+        elif overall_score >= 40:
+            return "stretch_role"
+        return "develop_first"
+    
+    def score_job_to_profile(
+        self,
+        profile: ProfileMatchInput,
+        job: Dict[str, Any],
+        features: Optional[JobFeatures] = None
+    ) -> int:
+        """
+        Overall match score only - no reasons, suggestions or result model
+        Same value as match_job_to_profile(...).overall_match_score
+        """
+        if features is None:
+            features = self.get_job_features(job)
+        
+        job_title = job.get("title", "")
+        job_description = job.get("description", "")
+        
+        skill_score, _ = self.calculate_skill_match(
+            profile.skills, job.get("required_skills", []), job_title, job_description, features, with_reasons=False
+        )
+        interest_score, _ = self.calculate_interest_match(
+            profile.career_interests, job_title, job_description, features, with_reasons=False
+        )
+        level_score, _ = self.calculate_level_match(
+            profile.adaptive_level, features.experience_years, job.get("experience_level", "entry")
+        )
+        salary_score, _ = self.calculate_salary_match(
+            profile.salary_expectation_min, profile.salary_expectation_max, features.salary_min, features.salary_max
+        )
+        
+        return self.calculate_overall_score(profile.doers_score, skill_score, interest_score, level_score, salary_score)
+    
+    def score_jobs_for_profile(self, profile: ProfileMatchInput, jobs: List[Dict[str, Any]]) -> List[int]:
+        """Overall match scores for each job, in job order"""
+        return [self.score_job_to_profile(profile, job) for job in jobs]
+    
+    def rank_jobs_for_profile(
+        self,
+        profile: ProfileMatchInput,
+        jobs: List[Dict[str, Any]],
+        top_k: Optional[int] = None,
+        scores: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Rank all jobs by match score for a profile
-        Returns jobs with match data attached
+        Rank jobs by match score for a profile
+        Returns jobs with match data attached, best first (ties keep feed order)
+        Jobs are scored as plain numbers; match details are only built for the
+        returned jobs (top_k, or all when top_k is None). Pass scores from
+        score_jobs_for_profile to avoid scoring twice.
         """
         
+        features = None
+        if scores is None:
+            features = [self.get_job_features(job) for job in jobs]
+            scores = [self.score_job_to_profile(profile, job, f) for job, f in zip(jobs, features)]
+        
+        order = range(len(jobs))
+        if top_k is None:
+            winners = sorted(order, key=scores.__getitem__, reverse=True)
+        else:
+            # heapq.nlargest is stable, same order as the full sort
+            winners = heapq.nlargest(top_k, order, key=scores.__getitem__)
+        
         matched_jobs = []
         
-        for job in jobs:
-            match_result = self.match_job_to_profile(profile, job)
+        for i in winners:
+            job = jobs[i]
+            match_result = self.match_job_to_profile(profile, job, features[i] if features else None)
             
             # Attach match data to job
             job_with_match = {
@@ -333,10 +668,169 @@ class AIJobMatcher:
             
             matched_jobs.append(job_with_match)
         
-        # Sort by match score (descending)
-        matched_jobs.sort(key=lambda x: x["match_score"], reverse=True)
-        
         return matched_jobs
+    
+    # ============================================
+    # BATCH SCORING - N profiles x M jobs (NumPy)
+    # ============================================
+    
+    def score_matrix(
+        self,
+        profiles: List[ProfileMatchInput],
+        jobs: List[Dict[str, Any]],
+        top_k: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Score every profile against every job in one call
+        Returns (N x M) int16 matrices for overall/skill/interest/level/salary scores plus
+        "top_k": (N x k) job indices per profile, best first (ties keep job order, as
+        rank_jobs_for_profile does). Values are identical to match_job_to_profile.
+        Memory is O(N x M) - chunk profiles for very large batches.
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("numpy is required for score_matrix")
+        
+        n, m = len(profiles), len(jobs)
+        features = [self.get_job_features(job) for job in jobs]
+        
+        skill = self._skill_matrix(profiles, features)
+        interest = self._interest_matrix(profiles, features)
+        level = self._level_matrix(profiles, features)
+        salary = self._salary_matrix(profiles, features)
+        
+        # Same operation order as match_job_to_profile so float rounding matches
+        overall = np.trunc(skill * 0.35 + interest * 0.30 + level * 0.20 + salary * 0.15)
+        doers = np.array([p.doers_score for p in profiles], dtype=np.int64).reshape(n, 1)
+        boost = np.where(doers >= 750, 10, np.where(doers >= 650, 5, 0))
+        overall = np.where(boost > 0, np.minimum(100, overall + boost), overall)
+        
+        k = min(top_k, m)
+        top = np.argsort(-overall, axis=1, kind="stable")[:, :k] if m else np.zeros((n, 0), dtype=np.int64)
+        
+        return {
+            "overall": overall.astype(np.int16),
+            "skill": skill.astype(np.int16),
+            "interest": interest.astype(np.int16),
+            "level": level.astype(np.int16),
+            "salary": salary.astype(np.int16),
+            "top_k": top
+        }
+    
+    def _keyword_matrix(self, features: List[JobFeatures], groups: List[List[str]]):
+        """(M x G) bool: job text contains any keyword of group g"""
+        km = self.keyword_matcher
+        hits = np.zeros((len(features), len(km.keywords)), dtype=np.bool_)
+        for j, f in enumerate(features):
+            for kw in f.keyword_hits.all():
+                hits[j, km.index[kw]] = True
+        group_mask = np.zeros((len(groups), len(km.keywords)), dtype=np.int32)
+        for g, keywords in enumerate(groups):
+            for kw in keywords:
+                group_mask[g, km.index[kw]] = 1
+        return (hits.astype(np.int32) @ group_mask.T) > 0
+    
+    def _skill_matrix(self, profiles: List[ProfileMatchInput], features: List[JobFeatures]):
+        n, m = len(profiles), len(features)
+        
+        # Distinct lowercased profile skills, counted per profile (duplicates count twice)
+        vocab: Dict[str, int] = {}
+        for p in profiles:
+            for skill in p.skills:
+                vocab.setdefault(skill.lower(), len(vocab))
+        counts = np.zeros((n, len(vocab)), dtype=np.int64)
+        for i, p in enumerate(profiles):
+            for skill in p.skills:
+                counts[i, vocab[skill.lower()]] += 1
+        skills_lower = list(vocab)
+        
+        direct_jobs = [j for j, f in enumerate(features) if f.required_skills_lower]
+        keyword_jobs = [j for j, f in enumerate(features) if not f.required_skills_lower]
+        matched = np.zeros((n, m), dtype=np.int64)
+        denom = np.zeros((n, m), dtype=np.int64)
+        
+        if direct_jobs:
+            # Profile skill matches a job skill when either contains the other
+            related = np.zeros((len(skills_lower), len(direct_jobs)), dtype=np.int64)
+            for c, j in enumerate(direct_jobs):
+                job_skills = features[j].required_skills_lower
+                for s, skill in enumerate(skills_lower):
+                    if any(skill in js or js in skill for js in job_skills):
+                        related[s, c] = 1
+            matched[:, direct_jobs] = counts @ related
+            denom[:, direct_jobs] = [max(1, len(features[j].required_skills_lower)) for j in direct_jobs]
+        
+        if keyword_jobs:
+            category_keywords = list(self.SKILL_KEYWORDS.values())
+            category_index = {id(keywords): c for c, keywords in enumerate(category_keywords)}
+            kw_features = [features[j] for j in keyword_jobs]
+            category_hits = self._keyword_matrix(kw_features, category_keywords)
+            
+            skill_hits = np.zeros((len(skills_lower), len(keyword_jobs)), dtype=np.bool_)
+            for s, skill in enumerate(skills_lower):
+                categories = [category_index[id(kws)] for kws in self.skill_categories(skill)]
+                if categories:
+                    skill_hits[s] = category_hits[:, categories].any(axis=1)
+                for c, f in enumerate(kw_features):
+                    if not skill_hits[s, c] and skill in f.job_text:
+                        skill_hits[s, c] = True
+            matched[:, keyword_jobs] = counts @ skill_hits.astype(np.int64)
+            denom[:, keyword_jobs] = np.maximum(1, counts.sum(axis=1)).reshape(n, 1)
+        
+        skill = np.trunc(np.minimum(100, (matched / np.maximum(1, denom)) * 100))
+        if keyword_jobs:
+            # No profile skills on the keyword path -> general match
+            no_skills = np.array([not p.skills for p in profiles]).reshape(n, 1)
+            skill[:, keyword_jobs] = np.where(no_skills, 50, skill[:, keyword_jobs])
+        return skill
+    
+    def _interest_matrix(self, profiles: List[ProfileMatchInput], features: List[JobFeatures]):
+        n = len(profiles)
+        interests = list(self.INTEREST_TO_JOB_TYPE)
+        job_hits = self._keyword_matrix(features, list(self.INTEREST_TO_JOB_TYPE.values())).astype(np.int64)
+        
+        weights = np.zeros((n, len(interests)), dtype=np.int64)
+        for i, p in enumerate(profiles):
+            for c, interest in enumerate(interests):
+                score = p.career_interests.get(interest)
+                if score is not None and score >= 50:
+                    weights[i, c] = score
+        
+        total = weights @ job_hits.T
+        count = (weights > 0).astype(np.int64) @ job_hits.T
+        interest = np.where(count > 0, np.trunc(total / np.maximum(1, count)), 30)
+        no_interests = np.array([not p.career_interests for p in profiles]).reshape(n, 1)
+        return np.where(no_interests, 50, interest).astype(np.float64)
+    
+    def _level_matrix(self, profiles: List[ProfileMatchInput], features: List[JobFeatures]):
+        profile_avg = np.array([
+            sum(self.LEVEL_TO_EXPERIENCE.get(p.adaptive_level, (0, 5))) / 2 for p in profiles
+        ], dtype=np.float64).reshape(len(profiles), 1)
+        known = np.array([f.experience_years is not None for f in features])
+        years = np.array([f.experience_years if f.experience_years is not None else 0 for f in features], dtype=np.float64)
+        
+        diff = np.abs(profile_avg - years)
+        level = np.select([diff <= 1, diff <= 2, diff <= 3], [100, 80, 60], default=40)
+        return np.where(known, level, 70).astype(np.float64)
+    
+    def _salary_matrix(self, profiles: List[ProfileMatchInput], features: List[JobFeatures]):
+        n = len(profiles)
+        disclosed = np.array([f.salary_mid is not None for f in features])
+        job_mid = np.array([f.salary_mid or 0.0 for f in features], dtype=np.float64)
+        
+        has_expectation = np.array([bool(p.salary_expectation_min) for p in profiles]).reshape(n, 1)
+        exp_mid = np.array([
+            (p.salary_expectation_min + (p.salary_expectation_max or p.salary_expectation_min * 1.3)) / 2
+            if p.salary_expectation_min else 0.0
+            for p in profiles
+        ], dtype=np.float64).reshape(n, 1)
+        
+        salary = np.select(
+            [job_mid >= exp_mid, job_mid >= exp_mid * 0.8, job_mid >= exp_mid * 0.6],
+            [100, 80, 50],
+            default=30
+        )
+        salary = np.where(has_expectation, salary, 70)
+        return np.where(disclosed, salary, 50).astype(np.float64)
 
 # Singleton instance
 ai_matcher = AIJobMatcher()
@@ -0,0 +1,147 @@
+"""
+Benchmark: /ping latency during an AIMEE chat burst against a local fake LLM server
+Compares the old inline send_message (blocks the event loop) with GeminiChatService
+using a sync client (thread pool) and an async client
+
+Run from backend/:  python benchmarks/bench_aimee_chat.py [--chats 32] [--llm-latency-ms 300]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gemini_service import GeminiChatService  # noqa: E402
+
+class BurstHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128  # the default backlog of 5 drops SYNs during a burst
+
+class FakeLLMServer:
+    """Threaded HTTP server answering POST /generate after `latency` seconds"""
+
+    def __init__(self, latency: float):
+        latency_s = latency
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                message = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["message"]
+                time.sleep(latency_s)
+                body = json.dumps({"text": f"reply to {message}"}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = BurstHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/generate"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+class Reply:
+    def __init__(self, text):
+        self.text = text
+
+class SyncModel:
+    """Like the SDK's sync chat: blocking HTTP in send_message"""
+
+    def __init__(self, url, **kwargs):
+        self.url = url
+
+    def start_chat(self, history):
+        return self
+
+    def send_message(self, message):
+        request = urllib.request.Request(self.url, data=json.dumps({"message": message}).encode(), method="POST")
+        with urllib.request.urlopen(request) as response:
+            return Reply(json.loads(response.read())["text"])
+
+class AsyncModel(SyncModel):
+    """Like the SDK's send_message_async"""
+
+    client: httpx.AsyncClient = None
+
+    async def send_message_async(self, message):
+        response = await self.client.post(self.url, json={"message": message})
+        return Reply(response.json()["text"])
+
+def make_app(mode: str, url: str) -> FastAPI:
+    app = FastAPI()
+    if mode == "async":
+        AsyncModel.client = httpx.AsyncClient(timeout=60)
+    model_class = AsyncModel if mode == "async" else SyncModel
+    service = GeminiChatService(max_concurrency=16, model_factory=lambda **kwargs: model_class(url, **kwargs))
+
+    @app.post("/chat")
+    async def chat(message: str):
+        if mode == "inline":
+            return {"text": SyncModel(url).start_chat([]).send_message(message).text}  # the old code path
+        return {"text": await service.send(message, system_instruction="AIMEE")}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+async def run(mode: str, url: str, chats: int, pings: int):
+    app = make_app(mode, url)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app", timeout=120) as client:
+        ping_latencies = []
+
+        async def pinger():
+            # Latency from each ping's scheduled time, so time spent waiting for a
+            # blocked event loop counts
+            for i in range(pings):
+                scheduled = started + 0.02 + i * 0.025
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - scheduled)
+
+        started = time.perf_counter()
+        await asyncio.gather(pinger(), *(client.post("/chat", params={"message": f"m{i}"}) for i in range(chats)))
+        elapsed = time.perf_counter() - started
+    if AsyncModel.client is not None:
+        await AsyncModel.client.aclose()
+        AsyncModel.client = None
+    return ping_latencies, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chats", type=int, default=32)
+    parser.add_argument("--pings", type=int, default=20)
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    with FakeLLMServer(args.llm_latency_ms / 1000) as llm:
+        print(f"{args.chats} concurrent chats, fake LLM latency {args.llm_latency_ms:.0f}ms")
+        print(f"{'mode':<28}{'ping p50':>12}{'ping max':>12}{'burst total':>14}")
+        for mode, label in [("inline", "inline send_message (old)"), ("sync", "service, thread pool"), ("async", "service, async client")]:
+            pings, elapsed = asyncio.run(run(mode, llm.url, args.chats, args.pings))
+            print(f"{label:<28}{statistics.median(pings) * 1000:>10.1f}ms{max(pings) * 1000:>10.1f}ms{elapsed:>12.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: job source search latency, per-call AsyncClient vs the shared pooled client
+Runs JSearchClient/AdzunaClient against the local stub server and reports p50/p99
+
+Run from backend/:  python benchmarks/bench_http_pool.py [--requests 500] [--concurrency 8]
+Note: the stub is plain HTTP on loopback; against the real APIs every per-call client
+also pays a TLS handshake and a full network RTT, so the production gap is larger.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from job_aggregator import JobAggregatorService, JSearchClient, AdzunaClient  # noqa: E402
+from stub_job_sources import StubJobSourceServer  # noqa: E402
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def run(service: JobAggregatorService, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            jobs = await service.search_all_sources(f"query {i % 20}", "India", include_sample=False)
+            latencies.append(time.perf_counter() - start)
+            assert len(jobs) == 20
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies
+
+def make_service(stub: StubJobSourceServer) -> JobAggregatorService:
+    service = JobAggregatorService()
+    service.jsearch = JSearchClient(api_key="stub", base_url=f"{stub.url}/jsearch")
+    service.adzuna = AdzunaClient(app_id="stub", app_key="stub", base_url=f"{stub.url}/adzuna")
+    # Measure the transport, not the search cache
+    service.cache.ttl = service.cache.stale_ttl = 0
+    return service
+
+async def main_async(args):
+    with StubJobSourceServer(latency=args.latency_ms / 1000) as stub:
+        rows = []
+        for label, pooled in [("per-call client", False), ("shared pool", True)]:
+            service = make_service(stub)
+            if pooled:
+                await service.startup()
+            await run(service, 20, args.concurrency)  # warm-up
+            connections_before = stub.connections
+            latencies = await run(service, args.requests, args.concurrency)
+            await service.close()
+            rows.append((label, latencies, stub.connections - connections_before))
+
+    print(f"{args.requests} searches (2 sources each), concurrency {args.concurrency}, stub latency {args.latency_ms}ms")
+    for label, latencies, connections in rows:
+        print(
+            f"{label:<16}: p50 {percentile(latencies, 50) * 1000:6.2f}ms  "
+            f"p99 {percentile(latencies, 99) * 1000:6.2f}ms  "
+            f"mean {statistics.mean(latencies) * 1000:6.2f}ms  new TCP connections: {connections}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
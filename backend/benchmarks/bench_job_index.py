@@ -0,0 +1,101 @@
+"""
+Benchmark: JobSkillIndex candidate pre-filtering for /api/jobs/match
+Scores every job vs only index candidates (+ exploration sample), and reports the
+pruned fraction and top-k recall against full scoring
+
+Run from backend/:  python benchmarks/bench_job_index.py [--jobs 20000] [--top-k 20]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_matcher import AIJobMatcher, ProfileMatchInput  # noqa: E402
+from job_index import JobSkillIndex  # noqa: E402
+
+FILLER = "we are hiring motivated candidates to join our fast growing company in bengaluru with good pay".split()
+
+# Feeds are topical: each vertical brings its own vocabulary
+VERTICALS = {
+    "tech": ("Software Engineer", "python java cloud api backend microservices code review deploy".split(), ["Python", "SQL", "AWS"]),
+    "health": ("Staff Nurse", "nursing hospital patient ward icu shifts clinical care".split(), ["Nursing", "Patient Care"]),
+    "fashion": ("Fashion Designer", "apparel textile garment fashion collection sustainable fabric".split(), ["Fashion Design", "Textile"]),
+    "logistics": ("Delivery Driver", "delivery driver vehicle route warehouse logistics two-wheeler".split(), ["Driving"]),
+    "education": ("Math Teacher", "teacher school students classroom curriculum tutor".split(), ["Teaching"]),
+    "finance": ("Accountant", "accounting ledger gst tally audit finance banking".split(), ["Accounting", "Tally"]),
+    "retail": ("Store Associate", "store retail customers billing inventory shelves".split(), ["Customer Service"]),
+    "construction": ("Site Supervisor", "construction site civil workers safety materials".split(), ["Civil Engineering"]),
+}
+
+PROFILES = [
+    ProfileMatchInput(
+        skills=["Fashion Design", "Sustainability", "ESG", "Adobe Suite"],
+        career_interests={"Artistic": 73, "Enterprising": 64}
+    ),
+    ProfileMatchInput(skills=["Python", "SQL", "Data Analysis"], career_interests={"Investigative": 80}),
+    ProfileMatchInput(skills=["Nursing", "Patient Care"], career_interests={"Social": 75}),
+    ProfileMatchInput(skills=["Tally", "GST"], career_interests={"Conventional": 70}),
+]
+
+def make_jobs(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    names = list(VERTICALS)
+    jobs = []
+    for i in range(n):
+        title, vocab, skills = VERTICALS[rng.choice(names)]
+        words = [rng.choice(vocab) for _ in range(rng.randint(10, 40))] + rng.sample(FILLER, 6)
+        rng.shuffle(words)
+        jobs.append({
+            "id": f"synthetic_{i}",
+            "title": title,
+            "company_name": f"Company {i % 500}",
+            "description": " ".join(words),
+            "required_skills": [] if rng.random() < 0.7 else skills,
+            "required_experience_years": rng.choice([None, 0, 2, 5, 8]),
+            "salary_min": rng.choice([None, 300000, 800000]),
+            "salary_max": rng.choice([None, 1200000]),
+        })
+    return jobs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--top-k", type=int, default=20)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    matcher = AIJobMatcher(feature_cache_size=len(jobs))
+    index = JobSkillIndex(matcher=matcher, max_jobs=len(jobs))
+
+    start = time.perf_counter()
+    index.add_jobs(jobs)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for p in PROFILES:
+        matcher.rank_jobs_for_profile(p, jobs, top_k=args.top_k)
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    selections = []
+    for p in PROFILES:
+        candidates = index.select_candidates(p, jobs)
+        matcher.rank_jobs_for_profile(p, candidates, top_k=args.top_k)
+        selections.append(candidates)
+    pruned_time = time.perf_counter() - start
+
+    recalls = [index.record_recall(p, jobs, c, args.top_k) for p, c in zip(PROFILES, selections)]
+    stats = index.stats()
+
+    print(f"{len(jobs)} jobs, {len(PROFILES)} profiles, top-{args.top_k} (index built in {build_time:.3f}s, features warm)")
+    print(f"score all          : {full_time:.3f}s")
+    print(f"index candidates   : {pruned_time:.3f}s  ({full_time / pruned_time:.2f}x)")
+    print(f"pruned fraction    : {stats['pruned_fraction']:.3f}   term hit rate: {stats['term_hit_rate']:.3f}")
+    print(f"top-k recall       : {', '.join(f'{r:.2f}' for r in recalls)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: GET /api/jobs filters on a large jobs collection
+Legacy unanchored $regex / pincode regex vs the jobs_text index + pincode_prefix
+compound index; reports p50/p99 latency and documents examined (explain)
+
+Run from backend/:  python benchmarks/bench_job_search.py [--jobs 1000000] [--mongo-url mongodb://localhost:27017]
+Needs a mongod; the database (bench_job_search) is dropped unless --keep is given.
+Loading 1M jobs takes a few minutes; with --keep, later runs reuse the data.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from pymongo import MongoClient, DESCENDING
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from job_search import JOB_INDEXES, build_jobs_filter, pincode_prefix  # noqa: E402
+
+TITLES = [
+    "Software Developer", "Data Entry Operator", "Delivery Partner", "Nurse - ICU", "Lab Technician",
+    "Mathematics Teacher", "Security Guard", "Chef - Indian Cuisine", "Legal Associate", "Financial Analyst",
+    "Fashion Designer", "Sales Executive", "Warehouse Associate", "Electrician", "Content Writer"
+]
+DIVISIONS = ["Technology", "Health", "Education", "Transport & Logistics", "Security", "Finance & Banking", "Legal"]
+WORDS = (
+    "build apps react python patients hospital teach students delivery bike route premises security "
+    "dishes kitchen compliance corporate investment reporting garments textile customers store shifts "
+    "wiring maintenance articles seo experience required training provided salary benefits growth"
+).split()
+# Pincodes cluster in metros, like the real user base
+PINCODE_AREAS = ["560", "400", "110", "600", "500", "411", "700", "380", "302", "226"] + [str(p) for p in range(121, 855, 7)]
+
+QUERIES = [
+    ("search", {"search": "python"}),
+    ("search rare", {"search": "electrician wiring"}),
+    ("pincode", {"pincode": "560001"}),
+    ("pincode + search", {"pincode": "400001", "search": "nurse"}),
+    ("division + level", {"division": "Health", "level": "L2"}),
+    ("no filter", {}),
+]
+
+def make_job(i: int, rng: random.Random, now: datetime):
+    area = rng.choice(PINCODE_AREAS[:10]) if rng.random() < 0.7 else rng.choice(PINCODE_AREAS)
+    pincode = f"{area}{rng.randint(1, 99):03d}"
+    return {
+        "id": f"bench-{i}",
+        "title": rng.choice(TITLES),
+        "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))),
+        "company_name": f"Company {rng.randint(1, 20000)}",
+        "division": rng.choice(DIVISIONS),
+        "level": rng.choice(["L1", "L2", "L3", "L4"]),
+        "pincode": pincode,
+        "pincode_prefix": pincode_prefix(pincode),
+        "is_active": rng.random() < 0.9,
+        "created_at": (now - timedelta(minutes=i)).isoformat(),
+    }
+
+def load(collection, jobs: int, seed: int = 5):
+    existing = collection.estimated_document_count()
+    if existing >= jobs:
+        return
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    for start in range(existing, jobs, 10000):
+        collection.insert_many([make_job(i, rng, now) for i in range(start, min(jobs, start + 10000))], ordered=False)
+    print(f"Loaded {jobs - existing} jobs in {time.perf_counter() - started:.0f}s")
+
+def legacy_filter(division=None, level=None, pincode=None, search=None):
+    """The filter GET /api/jobs built before the text index"""
+    query = {"is_active": True}
+    if division:
+        query["division"] = division
+    if level:
+        query["level"] = level
+    if pincode:
+        query["pincode"] = {"$regex": f"^{pincode[:3]}", "$options": "i"}
+    if search:
+        query["$or"] = [
+            {"title": {"$regex": search, "$options": "i"}},
+            {"description": {"$regex": search, "$options": "i"}},
+            {"company_name": {"$regex": search, "$options": "i"}}
+        ]
+    return query
+
+def cursor_for(collection, query, limit):
+    if "$text" in query:
+        score = {"$meta": "textScore"}
+        return collection.find(query, {"_id": 0, "score": score}).sort([("score", score), ("created_at", DESCENDING)]).limit(limit)
+    return collection.find(query, {"_id": 0}).sort("created_at", DESCENDING).limit(limit)
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def measure(collection, query, limit, repeats):
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        list(cursor_for(collection, query, limit))
+        latencies.append((time.perf_counter() - started) * 1000)
+    stats = cursor_for(collection, query, limit).explain()["executionStats"]
+    return percentile(latencies, 50), percentile(latencies, 99), stats["totalDocsExamined"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    client = MongoClient(args.mongo_url)
+    db = client.bench_job_search
+    try:
+        load(db.jobs, args.jobs)
+        print(f"{'query':<18} {'legacy p50/p99 ms':>18} {'docs':>9} {'indexed p50/p99 ms':>19} {'docs':>7}")
+        db.jobs.drop_indexes()
+        legacy = {name: measure(db.jobs, legacy_filter(**params), args.limit, args.repeats) for name, params in QUERIES}
+        started = time.perf_counter()
+        db.jobs.create_indexes(JOB_INDEXES)
+        print(f"(indexes built in {time.perf_counter() - started:.0f}s)")
+        for name, params in QUERIES:
+            indexed = measure(db.jobs, build_jobs_filter(**params, mode="text"), args.limit, args.repeats)
+            old = legacy[name]
+            print(f"{name:<18} {old[0]:>8.1f} /{old[1]:>8.1f} {old[2]:>9} {indexed[0]:>9.1f} /{indexed[1]:>8.1f} {indexed[2]:>7}")
+    finally:
+        if not args.keep:
+            client.drop_database("bench_job_search")
+        client.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Micro-benchmark: AIJobMatcher keyword scoring
+Legacy per-skill/per-keyword substring scans vs the shared, memoized KeywordMatcher,
+with and without the JobFeatures cache
+
+Run from backend/:  python benchmarks/bench_keyword_matcher.py [--jobs 10000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_matcher import AIJobMatcher, ProfileMatchInput  # noqa: E402
+
+WORDS = (
+    "we are hiring a motivated team player to join our fast growing company in bengaluru "
+    "software developer engineer data analyst sql excel marketing brand digital social media "
+    "sales client account manager lead supervisor nursing hospital patient teacher tutor "
+    "finance banking accounting designer creative content writer technician operator driver "
+    "researcher scientist assistant coordinator clerk hr community through with strong skills"
+).split()
+
+TITLES = [
+    "Software Engineer", "Data Analyst", "Marketing Manager", "Fashion Designer",
+    "Sales Executive", "Staff Nurse", "Math Teacher", "Accountant", "Delivery Driver",
+    "Content Writer", "Research Scientist", "Office Assistant"
+]
+
+PROFILES = [
+    ProfileMatchInput(
+        skills=["Fashion Design", "Sustainability", "ESG", "Project Management", "Adobe Suite"],
+        career_interests={"Artistic": 73, "Enterprising": 64, "Social": 60}
+    ),
+    ProfileMatchInput(
+        skills=["Python", "SQL", "Data Analysis", "Statistics"],
+        career_interests={"Investigative": 80, "Conventional": 55}
+    ),
+    ProfileMatchInput(
+        skills=["Sales", "Marketing", "Client Handling"],
+        career_interests={"Enterprising": 90, "Social": 40}
+    ),
+    ProfileMatchInput(
+        skills=["Team Leadership", "Brand Strategy", "Negotiation", "Public Speaking", "CRM",
+                "Budgeting", "Hiring", "Operations", "Vendor Management", "Reporting"],
+        career_interests={"Enterprising": 85, "Social": 70, "Conventional": 65,
+                          "Investigative": 55, "Realistic": 50, "Artistic": 52}
+    )
+]
+
+def make_jobs(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        jobs.append({
+            "id": f"synthetic_{i}",
+            "title": rng.choice(TITLES),
+            "company_name": f"Company {i % 500}",
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 300))),
+            # Most aggregated jobs arrive without structured skills
+            "required_skills": [] if rng.random() < 0.8 else rng.sample(["Python", "SQL", "Sales", "Design"], 2),
+            "required_experience_years": rng.choice([None, 0, 2, 5, 8]),
+            "salary_min": rng.choice([None, 300000, 800000]),
+            "salary_max": rng.choice([None, 1200000]),
+        })
+    return jobs
+
+class LegacyMatcher(AIJobMatcher):
+    """Scoring paths as they were before KeywordMatcher / JobFeatures"""
+    
+    def calculate_skill_match(self, profile_skills, job_skills, job_title, job_description, features=None):
+        if not job_skills:
+            job_text = f"{job_title} {job_description}".lower()
+            matched_keywords = []
+            for skill in profile_skills:
+                skill_lower = skill.lower()
+                if skill_lower in job_text:
+                    matched_keywords.append(skill)
+                else:
+                    for category, keywords in self.SKILL_KEYWORDS.items():
+                        if skill_lower in category.lower() or any(kw in skill_lower for kw in keywords):
+                            if any(kw in job_text for kw in keywords):
+                                matched_keywords.append(skill)
+                                break
+            if not profile_skills:
+                return 50, ["Skills not specified - general match"]
+            match_score = min(100, (len(matched_keywords) / max(1, len(profile_skills))) * 100)
+            return int(match_score), [f"Matched skill: {skill}" for skill in matched_keywords[:5]]
+        profile_skills_lower = [s.lower() for s in profile_skills]
+        job_skills_lower = [s.lower() for s in job_skills]
+        matched = []
+        for skill in profile_skills_lower:
+            for job_skill in job_skills_lower:
+                if skill in job_skill or job_skill in skill:
+                    matched.append(skill)
+                    break
+        match_score = min(100, (len(matched) / max(1, len(job_skills_lower))) * 100)
+        return int(match_score), [f"Matched skill: {skill}" for skill in matched[:5]]
+    
+    def calculate_interest_match(self, career_interests, job_title, job_description, features=None):
+        if not career_interests:
+            return 50, ["Career interests not specified"]
+        job_text = f"{job_title} {job_description}".lower()
+        matched_interests = []
+        total_score = 0
+        for interest, score in career_interests.items():
+            if score >= 50:
+                keywords = self.INTEREST_TO_JOB_TYPE.get(interest, [])
+                if any(kw in job_text for kw in keywords):
+                    matched_interests.append((interest, score))
+                    total_score += score
+        if not matched_interests:
+            return 30, ["Job doesn't align with top career interests"]
+        match_score = int(total_score / len(matched_interests))
+        return match_score, [f"Aligns with {i} interest ({s}%)" for i, s in matched_interests[:3]]
+    
+    def build_job_features(self, job, content_hash=None):
+        return None
+    
+    def get_job_features(self, job):
+        return None
+
+def keyword_scores(matcher, profile, job, features=None):
+    return (
+        matcher.calculate_skill_match(profile.skills, job["required_skills"], job["title"], job["description"], features),
+        matcher.calculate_interest_match(profile.career_interests, job["title"], job["description"], features)
+    )
+
+def run(matcher, jobs):
+    """Job parsed once per (profile, job), i.e. without the feature cache"""
+    start = time.perf_counter()
+    results = [keyword_scores(matcher, p, job, matcher.build_job_features(job)) for p in PROFILES for job in jobs]
+    return time.perf_counter() - start, results
+
+def run_shared(matcher, jobs):
+    """JobFeatures from the LRU feature cache, reused for every profile"""
+    matcher.feature_cache.clear()
+    start = time.perf_counter()
+    results = [keyword_scores(matcher, p, job, matcher.get_job_features(job)) for p in PROFILES for job in jobs]
+    return time.perf_counter() - start, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=10000)
+    args = parser.parse_args()
+    
+    jobs = make_jobs(args.jobs)
+    legacy, matcher = LegacyMatcher(), AIJobMatcher(feature_cache_size=len(jobs))
+    legacy_time, legacy_results = run(legacy, jobs)
+    new_time, new_results = run(matcher, jobs)
+    shared_time, shared_results = run_shared(matcher, jobs)
+    
+    assert legacy_results == new_results == shared_results, "KeywordMatcher changed skill/interest scores"
+    for p in PROFILES:
+        for job in jobs[:500]:
+            assert legacy.match_job_to_profile(p, job) == matcher.match_job_to_profile(p, job)
+    
+    pairs = len(PROFILES) * len(jobs)
+    print(f"{len(jobs)} jobs x {len(PROFILES)} profiles = {pairs} skill+interest scorings (results identical)")
+    for label, elapsed in [("legacy", legacy_time), ("shared vocabulary", new_time), ("feature cache", shared_time)]:
+        print(f"{label:<20}: {elapsed:.3f}s  ({elapsed / pairs * 1e6:5.1f} us/match, {legacy_time / elapsed:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: AIJobMatcher.score_matrix vs rank_jobs_for_profile per profile
+(the nightly "every user x today's feed" digest)
+
+Run from backend/:  python benchmarks/bench_score_matrix.py [--profiles 500] [--jobs 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_matcher import AIJobMatcher, ProfileMatchInput  # noqa: E402
+from bench_keyword_matcher import make_jobs  # noqa: E402
+
+SKILLS = ["Python", "SQL", "Fashion Design", "Sales", "Marketing", "Team Leadership", "Nursing",
+          "Excel", "React.js", "Textile", "Data Analysis", "Coding", "Teaching", "Accounting"]
+INTERESTS = ["Artistic", "Enterprising", "Social", "Realistic", "Investigative", "Conventional"]
+
+def make_profiles(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [
+        ProfileMatchInput(
+            doers_score=rng.randint(450, 900),
+            adaptive_level=rng.choice(["PARA", "ASSOCIATE", "MANAGER", "PROFESSIONAL", "EXPERT"]),
+            skills=rng.sample(SKILLS, rng.randint(1, 6)),
+            career_interests={i: rng.randint(30, 95) for i in rng.sample(INTERESTS, 3)},
+            salary_expectation_min=rng.choice([None, 300000, 900000])
+        )
+        for _ in range(n)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--top-k", type=int, default=20)
+    args = parser.parse_args()
+    
+    profiles, jobs = make_profiles(args.profiles), make_jobs(args.jobs)
+    matcher = AIJobMatcher(feature_cache_size=len(jobs))
+    
+    start = time.perf_counter()
+    scalar_top = [[j["id"] for j in matcher.rank_jobs_for_profile(p, jobs)[:args.top_k]] for p in profiles]
+    scalar_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    result = matcher.score_matrix(profiles, jobs, top_k=args.top_k)
+    matrix_time = time.perf_counter() - start
+    
+    assert [[jobs[j]["id"] for j in row] for row in result["top_k"]] == scalar_top, "top-k differs"
+    
+    print(f"{len(profiles)} profiles x {len(jobs)} jobs, top {args.top_k} (identical rankings)")
+    print(f"rank_jobs_for_profile loop: {scalar_time:.2f}s")
+    print(f"score_matrix              : {matrix_time:.2f}s  ({scalar_time / matrix_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Local stub of the JSearch and Adzuna search APIs
+Serves canned results over HTTP/1.1 keep-alive and counts TCP connections, so
+clients can be tested and benchmarked without API keys or network access
+
+Run from backend/:  python benchmarks/stub_job_sources.py [--port 8099] [--latency-ms 0]
+Then point the backend at it with JSEARCH_BASE_URL=http://127.0.0.1:8099/jsearch
+and ADZUNA_BASE_URL=http://127.0.0.1:8099/adzuna
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+def slug(text: str) -> str:
+    return "-".join(text.lower().split())
+
+def jsearch_payload(query: str, page: str, count: int = 10) -> dict:
+    return {"status": "OK", "data": [
+        {
+            "job_id": f"js-{slug(query)}-{page}-{i}",
+            "job_title": f"{query.split(' in ')[0].title()} {i}",
+            "employer_name": f"Stub Employer {i}",
+            "job_city": "Bengaluru",
+            "job_country": "India",
+            "job_description": f"Stub JSearch listing {i} for {query}",
+            "job_employment_type": "FULLTIME",
+            "job_min_salary": 400000 + 10000 * i,
+            "job_max_salary": 900000 + 10000 * i,
+            "job_apply_link": f"https://example.com/jsearch/{page}/{i}"
+        }
+        for i in range(count)
+    ]}
+
+def adzuna_payload(query: str, page: str, count: int = 10) -> dict:
+    return {"results": [
+        {
+            "id": f"az-{slug(query)}-{page}-{i}",
+            "title": f"{query.title()} Specialist {i}",
+            "company": {"display_name": f"Stub Company {i}"},
+            "location": {"display_name": "Pune, Maharashtra"},
+            "description": f"Stub Adzuna listing {i} for {query}",
+            "salary_min": 350000 + 10000 * i,
+            "salary_max": 700000 + 10000 * i,
+            "redirect_url": f"https://example.com/adzuna/{page}/{i}",
+            "created": "2025-01-01T00:00:00Z"
+        }
+        for i in range(count)
+    ]}
+
+class StubJobSourceServer:
+    """
+    Threaded stub server; routes /jsearch/search and /adzuna/{country}/search/{page}
+    latency: seconds slept per request; delays: extra seconds per source ("jsearch"/"adzuna");
+    status: forced HTTP status for every request
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.delays = {}
+        self.status = 200
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                parts = parsed.path.strip("/").split("/")
+                delay = stub.latency + stub.delays.get(parts[0], 0.0)
+                if delay:
+                    time.sleep(delay)
+                if parts[0] == "jsearch":
+                    payload = jsearch_payload(params.get("query", "jobs"), params.get("page", "1"))
+                elif parts[0] == "adzuna":
+                    payload = adzuna_payload(params.get("what", "jobs"), parts[-1])
+                else:
+                    payload = {"error": "not found"}
+                status = stub.status if parts[0] in ("jsearch", "adzuna") else 404
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self) -> "StubJobSourceServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubJobSourceServer(port=args.port, latency=args.latency_ms / 1000)
+    print(f"Stub job sources on {stub.url} (/jsearch, /adzuna)")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
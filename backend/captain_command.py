@@ -5,13 +5,25 @@ Varun Mayya Style: Company as Organism, 16-Kata System
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 from enum import Enum
+from pymongo import ReturnDocument
+import asyncio
+import json
+import logging
+import os
 import uuid
 import hashlib
 
+from ttl_cache import TTLCache
+from activity_feed import ActivityFeed, FeedSource
+from event_bus import event_bus, relay_change_streams
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/captain", tags=["Captain Command Centre"])
 
 # Business Vertical Enum
@@ -376,6 +388,7 @@ async def assign_vertical_leader(request: AssignLeaderRequest):
         
         # Insert new leader
         await db.vertical_leaders.insert_one(leader.model_dump())
+        await mission_board_changed(activity=leader_activity(leader.model_dump(mode="json")))
     
     return {
         "success": True,
@@ -437,6 +450,7 @@ async def start_onboarding(request: StartOnboardingRequest):
     
     if db is not None:
         await db.onboarding_sessions.insert_one(session.model_dump())
+        await mission_board_changed(activity=session_activity(session.model_dump(mode="json")))
     
     return {
         "success": True,
@@ -542,14 +556,18 @@ async def update_kata_progress(request: UpdateKataProgressRequest):
         status = OnboardingStatus.ORBIT
     
     if db is not None:
-        await db.onboarding_sessions.update_one(
+        session = await db.onboarding_sessions.find_one_and_update(
             {"id": request.session_id},
             {"$set": {
                 "current_kata": request.kata_number,
                 "status": status.value,
                 "completed_modules": request.completed_modules
-            }}
+            }},
+            projection=SESSION_ACTIVITY_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
+        if session is not None:
+            await mission_board_changed(activity=session_activity(session))
     
     kata_info = KATA_SYSTEM.get(request.kata_number, KATA_SYSTEM[1])
     next_kata = KATA_SYSTEM.get(request.kata_number + 1) if request.kata_number < 4 else None
@@ -643,6 +661,110 @@ class ActivityLog(BaseModel):
 # Dubai Launch Target Date
 DUBAI_LAUNCH_DATE = "2026-01-09T00:00:00+04:00"  # Dubai timezone
 
+# ============================================
+# MISSION BOARD SNAPSHOT
+# Leaders + latest sessions for all verticals in two aggregations, cached
+# ============================================
+
+# Dashboards poll every few seconds; writes below invalidate it sooner
+mission_board_cache = TTLCache(ttl=float(os.environ.get("MISSION_BOARD_TTL_SECONDS", "30")), maxsize=1)
+
+ACTIVE_LEADERS_PIPELINE = [
+    {"$match": {"status": "active"}},
+    {"$sort": {"assigned_at": -1}},
+    {"$group": {"_id": "$vertical", "leader": {"$first": "$$ROOT"}}},
+    {"$unset": "leader._id"}
+]
+
+LATEST_SESSIONS_PIPELINE = [
+    {"$match": {"status": {"$ne": "not_started"}}},
+    {"$sort": {"started_at": -1}},
+    {"$group": {"_id": "$vertical", "session": {"$first": {"current_kata": "$current_kata", "status": "$status"}}}}
+]
+
+def vertical_progress(vertical: BusinessVertical, leader: Optional[Dict[str, Any]], session: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Mission board entry for one vertical; readiness_raw is the unrounded readiness"""
+    config = VERTICAL_CONFIG[vertical]
+    kata_progress = 0
+    status = "vacant"
+    team_size = 0
+    
+    if leader:
+        team_size = leader.get("team_size", 0)
+        if session:
+            current_kata = session.get("current_kata", 1)
+            kata_progress = current_kata * 25  # 25% per kata
+            status = session.get("status", "in_progress")
+        else:
+            status = "assigned"
+            kata_progress = 10  # Just assigned
+    
+    # Calculate vertical readiness
+    readiness = 0
+    if leader:
+        readiness += 30  # Leader assigned = 30%
+        readiness += kata_progress * 0.5  # Kata progress contributes up to 50%
+        readiness += min(team_size * 5, 20)  # Team size contributes up to 20%
+    
+    return {
+        "code": vertical.value,
+        "name": config["name"],
+        "icon": config["icon"],
+        "color": config["color"],
+        "mission": config["mission"],
+        "leader_name": leader.get("leader_name") if leader else None,
+        "leader_designation": leader.get("designation") if leader else None,
+        "status": status,
+        "kata_progress": kata_progress,
+        "team_size": team_size,
+        "readiness_percent": min(100, int(readiness)),
+        "readiness_raw": readiness,
+        "is_orbit": status == "orbit"
+    }
+
+async def build_mission_snapshot() -> Dict[str, Any]:
+    """Readiness of every vertical from two concurrent aggregations (was 2 queries per vertical)"""
+    leaders: Dict[str, Dict[str, Any]] = {}
+    sessions: Dict[str, Dict[str, Any]] = {}
+    if db is not None:
+        leader_rows, session_rows = await asyncio.gather(
+            db.vertical_leaders.aggregate(ACTIVE_LEADERS_PIPELINE).to_list(None),
+            db.onboarding_sessions.aggregate(LATEST_SESSIONS_PIPELINE).to_list(None)
+        )
+        leaders = {row["_id"]: row["leader"] for row in leader_rows}
+        sessions = {row["_id"]: row["session"] for row in session_rows}
+    
+    verticals_progress = [
+        vertical_progress(vertical, leaders.get(vertical.value), sessions.get(vertical.value))
+        for vertical in BusinessVertical
+    ]
+    total_progress = sum(v.pop("readiness_raw") for v in verticals_progress)
+    
+    return {
+        "verticals_progress": verticals_progress,
+        "launch_readiness_percent": int(total_progress / len(BusinessVertical)),
+        "built_at": datetime.now(timezone.utc).isoformat()
+    }
+
+async def get_mission_snapshot() -> Dict[str, Any]:
+    """Cached snapshot; callers must copy entries before modifying them"""
+    return await mission_board_cache.get_or_compute("snapshot", build_mission_snapshot)
+
+def invalidate_mission_board():
+    mission_board_cache.invalidate()
+
+def mission_status_for(launch_readiness: int) -> tuple:
+    """(mission_status, status_color) for an overall readiness percent"""
+    if launch_readiness >= 90:
+        return "LAUNCH_READY", "#00ff88"
+    elif launch_readiness >= 70:
+        return "FINAL_PREP", "#22c55e"
+    elif launch_readiness >= 50:
+        return "ON_TRACK", "#eab308"
+    elif launch_readiness >= 30:
+        return "ACCELERATE", "#f97316"
+    return "MOBILIZING", "#ef4444"
+
 @router.get("/mission-board")
 async def get_mission_board():
     """Get real-time mission board for Dubai launch - all 7 verticals progress"""
@@ -653,85 +775,12 @@ async def get_mission_board():
     days_to_launch = max(0, (launch_date - now).days)
     hours_to_launch = max(0, int((launch_date - now).total_seconds() / 3600))
     
-    # Get vertical progress
-    verticals_progress = []
-    total_progress = 0
-    
-    for vertical in BusinessVertical:
-        config = VERTICAL_CONFIG[vertical]
-        
-        # Get leader and their progress
-        leader = None
-        kata_progress = 0
-        status = "vacant"
-        team_size = 0
-        
-        if db is not None:
-            leader_doc = await db.vertical_leaders.find_one(
-                {"vertical": vertical.value, "status": "active"},
-                {"_id": 0}
-            )
-            if leader_doc:
-                leader = leader_doc
-                team_size = leader_doc.get("team_size", 0)
-                
-                # Get onboarding progress
-                session = await db.onboarding_sessions.find_one(
-                    {"vertical": vertical.value, "status": {"$ne": "not_started"}},
-                    {"_id": 0},
-                    sort=[("started_at", -1)]
-                )
-                if session:
-                    current_kata = session.get("current_kata", 1)
-                    kata_progress = current_kata * 25  # 25% per kata
-                    status = session.get("status", "in_progress")
-                else:
-                    status = "assigned"
-                    kata_progress = 10  # Just assigned
-        
-        # Calculate vertical readiness
-        readiness = 0
-        if leader:
-            readiness += 30  # Leader assigned = 30%
-            readiness += kata_progress * 0.5  # Kata progress contributes up to 50%
-            readiness += min(team_size * 5, 20)  # Team size contributes up to 20%
-        
-        verticals_progress.append({
-            "code": vertical.value,
-            "name": config["name"],
-            "icon": config["icon"],
-            "color": config["color"],
-            "mission": config["mission"],
-            "leader_name": leader.get("leader_name") if leader else None,
-            "leader_designation": leader.get("designation") if leader else None,
-            "status": status,
-            "kata_progress": kata_progress,
-            "team_size": team_size,
-            "readiness_percent": min(100, int(readiness)),
-            "is_orbit": status == "orbit"
-        })
-        
-        total_progress += readiness
+    snapshot = await get_mission_snapshot()
+    verticals_progress = [dict(v) for v in snapshot["verticals_progress"]]
     
     # Calculate overall launch readiness
-    launch_readiness = int(total_progress / len(BusinessVertical))
-    
-    # Determine mission status
-    if launch_readiness >= 90:
-        mission_status = "LAUNCH_READY"
-        status_color = "#00ff88"
-    elif launch_readiness >= 70:
-        mission_status = "FINAL_PREP"
-        status_color = "#22c55e"
-    elif launch_readiness >= 50:
-        mission_status = "ON_TRACK"
-        status_color = "#eab308"
-    elif launch_readiness >= 30:
-        mission_status = "ACCELERATE"
-        status_color = "#f97316"
-    else:
-        mission_status = "MOBILIZING"
-        status_color = "#ef4444"
+    launch_readiness = snapshot["launch_readiness_percent"]
+    mission_status, status_color = mission_status_for(launch_readiness)
     
     return {
         "launch_target": "DUBAI GLOBAL LAUNCH",
@@ -748,71 +797,101 @@ async def get_mission_board():
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
+def leader_activity(leader: Dict[str, Any]) -> Dict[str, Any]:
+    """Activity feed entry for a leader assignment"""
+    config = VERTICAL_CONFIG.get(BusinessVertical(leader["vertical"]), {})
+    return {
+        "id": leader.get("id", str(uuid.uuid4())),
+        "type": "leader_assigned",
+        "icon": "🎖️",
+        "title": f"Leader Assigned to {leader['vertical']}",
+        "description": f"{leader['leader_name']} appointed as {leader.get('designation', 'Director')}",
+        "vertical": leader["vertical"],
+        "vertical_color": config.get("color", "#00ff88"),
+        "timestamp": leader.get("assigned_at", datetime.now(timezone.utc).isoformat()),
+        "points": 100
+    }
+
+# Fields session_activity reads (the conversation log is large)
+SESSION_ACTIVITY_PROJECTION = {"_id": 0, "id": 1, "vertical": 1, "user_name": 1, "status": 1, "current_kata": 1, "started_at": 1}
+
+def session_activity(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Activity feed entry for an onboarding session's current milestone"""
+    config = VERTICAL_CONFIG.get(BusinessVertical(session["vertical"]), {})
+    milestone_type = "kata_started"
+    icon = "📚"
+    points = 50
+    
+    if session.get("status") == "orbit":
+        milestone_type = "orbit_achieved"
+        icon = "🚀"
+        points = 500
+        title = f"ORBIT Achieved! {session['vertical']}"
+        desc = f"{session['user_name']} reached self-sustaining productivity"
+    else:
+        current_kata = session.get("current_kata", 1)
+        title = f"Kata {current_kata} Progress - {session['vertical']}"
+        desc = f"{session['user_name']} advancing through onboarding"
+    
+    return {
+        "id": session.get("id", str(uuid.uuid4())),
+        "type": milestone_type,
+        "icon": icon,
+        "title": title,
+        "description": desc,
+        "vertical": session["vertical"],
+        "vertical_color": config.get("color", "#00ff88"),
+        "timestamp": session.get("started_at", datetime.now(timezone.utc).isoformat()),
+        "points": points
+    }
+
+MILESTONE_ICONS = {
+    "leader_assigned": "🎖️",
+    "kata_started": "📚",
+    "kata_completed": "✅",
+    "orbit_achieved": "🚀",
+    "team_expanded": "👥",
+    "first_win": "🏆"
+}
+
+def milestone_activity(activity: Dict[str, Any]) -> Dict[str, Any]:
+    """Activity feed entry for a logged ActivityLog milestone"""
+    config = VERTICAL_CONFIG.get(BusinessVertical(activity["vertical"]), {})
+    return {
+        "id": activity["id"],
+        "type": activity["milestone_type"],
+        "icon": MILESTONE_ICONS.get(activity["milestone_type"], "🏆"),
+        "title": activity["title"],
+        "description": activity["description"],
+        "vertical": activity["vertical"],
+        "vertical_color": config.get("color", "#00ff88"),
+        "timestamp": activity["timestamp"],
+        "points": activity.get("points", 0)
+    }
+
+# Leader assignments, onboarding milestones and logged milestones, merged newest-first
+mission_activity_feed = ActivityFeed([
+    FeedSource("vertical_leaders", "assigned_at", leader_activity, filter={"status": "active"}),
+    FeedSource(
+        "onboarding_sessions", "started_at", session_activity,
+        filter={"status": {"$ne": "not_started"}}, projection=SESSION_ACTIVITY_PROJECTION
+    ),
+    FeedSource("mission_activities", "timestamp", milestone_activity),
+])
+
 @router.get("/mission-board/activity")
-async def get_mission_activity():
-    """Get recent activity feed for mission board"""
+async def get_mission_activity(limit: int = 15, before: Optional[str] = None):
+    """Get recent activity feed for mission board; pass next_cursor as `before` for older entries"""
     
-    activities = []
+    page = {"activities": [], "next_cursor": None, "has_more": False}
     
     if db is not None:
-        # Get recent leader assignments
-        cursor = db.vertical_leaders.find(
-            {"status": "active"},
-            {"_id": 0}
-        ).sort("assigned_at", -1).limit(10)
-        
-        async for leader in cursor:
-            config = VERTICAL_CONFIG.get(BusinessVertical(leader["vertical"]), {})
-            activities.append({
-                "id": leader.get("id", str(uuid.uuid4())),
-                "type": "leader_assigned",
-                "icon": "🎖️",
-                "title": f"Leader Assigned to {leader['vertical']}",
-                "description": f"{leader['leader_name']} appointed as {leader.get('designation', 'Director')}",
-                "vertical": leader["vertical"],
-                "vertical_color": config.get("color", "#00ff88"),
-                "timestamp": leader.get("assigned_at", datetime.now(timezone.utc).isoformat()),
-                "points": 100
-            })
-        
-        # Get recent onboarding milestones
-        cursor = db.onboarding_sessions.find(
-            {"status": {"$ne": "not_started"}},
-            {"_id": 0}
-        ).sort("started_at", -1).limit(10)
-        
-        async for session in cursor:
-            config = VERTICAL_CONFIG.get(BusinessVertical(session["vertical"]), {})
-            milestone_type = "kata_started"
-            icon = "📚"
-            points = 50
-            
-            if session.get("status") == "orbit":
-                milestone_type = "orbit_achieved"
-                icon = "🚀"
-                points = 500
-                title = f"ORBIT Achieved! {session['vertical']}"
-                desc = f"{session['user_name']} reached self-sustaining productivity"
-            else:
-                current_kata = session.get("current_kata", 1)
-                title = f"Kata {current_kata} Progress - {session['vertical']}"
-                desc = f"{session['user_name']} advancing through onboarding"
-            
-            activities.append({
-                "id": session.get("id", str(uuid.uuid4())),
-                "type": milestone_type,
-                "icon": icon,
-                "title": title,
-                "description": desc,
-                "vertical": session["vertical"],
-                "vertical_color": config.get("color", "#00ff88"),
-                "timestamp": session.get("started_at", datetime.now(timezone.utc).isoformat()),
-                "points": points
-            })
-    
-    # Sort by timestamp and limit
-    activities.sort(key=lambda x: x["timestamp"], reverse=True)
-    activities = activities[:15]
+        try:
+            page = await mission_activity_feed.page(db, limit=limit, before=before)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    activities = page["activities"]
     
     # Calculate total points
     total_points = sum(a["points"] for a in activities)
@@ -821,6 +900,8 @@ async def get_mission_activity():
         "activities": activities,
         "total_activities": len(activities),
         "total_points": total_points,
+        "next_cursor": page["next_cursor"],
+        "has_more": page["has_more"],
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
@@ -851,6 +932,7 @@ async def log_milestone(
     
     if db is not None:
         await db.mission_activities.insert_one(activity.model_dump())
+        await mission_board_changed(activity=milestone_activity(activity.model_dump(mode="json")))
     
     return {
         "success": True,
@@ -862,11 +944,11 @@ async def log_milestone(
 async def get_vertical_leaderboard():
     """Get leaderboard ranking verticals by readiness"""
     
-    board = await get_mission_board()
+    snapshot = await get_mission_snapshot()
     
-    # Sort verticals by readiness
+    # Sort verticals by readiness (copies: the snapshot is shared)
     ranked = sorted(
-        board["verticals_progress"],
+        (dict(v) for v in snapshot["verticals_progress"]),
         key=lambda x: (x["readiness_percent"], x["kata_progress"]),
         reverse=True
     )
@@ -950,6 +1032,9 @@ async def trigger_notification(payload: NotificationPayload):
         db_notification["_id"] = str(uuid.uuid4())  # Use our own ID
         await db.notifications.insert_one(db_notification)
     
+    if not live_relay["active"]:
+        event_bus.publish("notification", notification_data)
+    
     return {
         "success": True,
         "notification": notification_data,
@@ -991,7 +1076,151 @@ async def get_notification_settings():
             {"type": "win", "description": "First win achievements", "priority": "medium"}
         ],
         "auto_notify": True,
-        "check_interval_seconds": 60
+        "check_interval_seconds": 60,  # polling fallback when the live stream is unavailable
+        "live_stream": {
+            "url": "/api/captain/mission-board/live",
+            "events": ["snapshot", *MISSION_BOARD_TOPICS]
+        }
     }
 
+# ============================================
+# MISSION BOARD LIVE - Server-Sent Events
+# Readiness deltas, activity and notifications pushed as they happen (replaces polling)
+# ============================================
+
+MISSION_BOARD_TOPICS = ("readiness", "activity", "notification")
+LIVE_HEARTBEAT_SECONDS = float(os.environ.get("MISSION_BOARD_HEARTBEAT_SECONDS", "15"))
+
+# With MISSION_BOARD_CHANGE_STREAMS=true every worker publishes what its change stream
+# sees (including other workers' writes) and write paths stop publishing locally
+live_relay: Dict[str, Any] = {"task": None, "active": False, "published_board": None}
+
+def readiness_delta(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Verticals whose board entry changed plus the new totals; None when nothing changed"""
+    seen = {v["code"]: v for v in previous["verticals_progress"]} if previous else {}
+    changed = [dict(v) for v in current["verticals_progress"] if seen.get(v["code"]) != v]
+    if not changed and previous and previous["launch_readiness_percent"] == current["launch_readiness_percent"]:
+        return None
+    mission_status, status_color = mission_status_for(current["launch_readiness_percent"])
+    return {
+        "verticals": changed,
+        "launch_readiness_percent": current["launch_readiness_percent"],
+        "mission_status": mission_status,
+        "status_color": status_color,
+        "verticals_ready": sum(1 for v in current["verticals_progress"] if v["readiness_percent"] >= 80)
+    }
+
+async def publish_board_changes():
+    """Rebuild the snapshot and push what changed since the last push"""
+    invalidate_mission_board()
+    snapshot = await get_mission_snapshot()
+    delta = readiness_delta(live_relay["published_board"], snapshot)
+    live_relay["published_board"] = snapshot
+    if delta is not None:
+        event_bus.publish("readiness", delta)
+
+async def mission_board_changed(activity: Optional[Dict[str, Any]] = None):
+    """Called after mission board writes: invalidate, and push unless the change stream will"""
+    if live_relay["active"]:
+        invalidate_mission_board()
+        return
+    if activity is not None:
+        event_bus.publish("activity", activity)
+    try:
+        await publish_board_changes()
+    except Exception as e:
+        logger.error(f"Mission board push failed: {e}")
+
+def encode_event(event_type: str, data: Any, event_id: Optional[int] = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def mission_board_events(subscription, heartbeat: float = LIVE_HEARTBEAT_SECONDS):
+    """
+    SSE frames for one client: the full board, then pushed events, with a comment line
+    every `heartbeat` idle seconds. A client that fell behind gets the full board again
+    instead of the events it missed (and should reload the activity feed).
+    """
+    yield encode_event("snapshot", await get_mission_board())
+    while True:
+        event = await subscription.get(timeout=heartbeat)
+        if subscription.lagged:
+            subscription.resynced()
+            yield encode_event("snapshot", await get_mission_board())
+        elif event is None:
+            yield ": heartbeat\n\n"
+        else:
+            yield encode_event(event["topic"], event["data"], event["id"])
+
+@router.get("/mission-board/live")
+async def stream_mission_board():
+    """Live mission board over Server-Sent Events"""
+    async def stream():
+        with event_bus.subscribe(MISSION_BOARD_TOPICS) as subscription:
+            async for frame in mission_board_events(subscription):
+                yield frame
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/mission-board/live/stats")
+async def get_live_stats():
+    """Subscribers, published/dropped event counts"""
+    return {**event_bus.stats(), "change_streams": live_relay["active"]}
+
+# ---------- Change stream relay ----------
+
+async def _relay_leaders(change: Dict[str, Any]):
+    leader = change.get("fullDocument")
+    if change["operationType"] == "insert" and leader:
+        event_bus.publish("activity", leader_activity(leader))
+    await publish_board_changes()
+
+async def _relay_sessions(change: Dict[str, Any]):
+    updated = change.get("updateDescription", {}).get("updatedFields", {})
+    if change["operationType"] == "update" and not {"status", "current_kata"} & set(updated):
+        return  # chat messages etc. don't move the board
+    session = change.get("fullDocument")
+    if session and session.get("status") != "not_started":
+        event_bus.publish("activity", session_activity(session))
+    await publish_board_changes()
+
+async def _relay_milestones(change: Dict[str, Any]):
+    if change["operationType"] == "insert":
+        event_bus.publish("activity", milestone_activity(change["fullDocument"]))
+
+async def _relay_notifications(change: Dict[str, Any]):
+    if change["operationType"] == "insert":
+        event_bus.publish("notification", {k: v for k, v in change["fullDocument"].items() if k != "_id"})
+
+async def _run_relay():
+    live_relay["active"] = True
+    try:
+        await relay_change_streams(db, {
+            "vertical_leaders": _relay_leaders,
+            "onboarding_sessions": _relay_sessions,
+            "mission_activities": _relay_milestones,
+            "notifications": _relay_notifications
+        })
+    finally:
+        live_relay["active"] = False
+
+def start_live_relay():
+    """Start the change stream relay if MISSION_BOARD_CHANGE_STREAMS=true"""
+    if db is None or os.environ.get("MISSION_BOARD_CHANGE_STREAMS", "false").lower() != "true":
+        return
+    if live_relay["task"] is None or live_relay["task"].done():
+        live_relay["task"] = asyncio.create_task(_run_relay())
 
+async def stop_live_relay():
+    task = live_relay["task"]
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    live_relay["task"] = None
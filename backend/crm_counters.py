@@ -0,0 +1,138 @@
+# ============================================
+# CRM COUNTERS - Materialized pipeline counters
+# crm_pipeline_counters is kept in step with lead writes; $group rebuilds it
+# ============================================
+
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timezone
+from enum import Enum
+from pymongo import ReturnDocument
+import logging
+
+from crm_service import LeadStage
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_COUNTERS_ID = "pipeline"
+
+# New Path funnel, in order
+FUNNEL_STAGES = [
+    LeadStage.AUDIENCE, LeadStage.VIBED, LeadStage.ENGAGED, LeadStage.LAUNCHED,
+    LeadStage.COMMUNITY_PLUS, LeadStage.AI_AUTOMATED, LeadStage.REPEAT
+]
+
+def _number(value) -> float:
+    """Numeric value as $sum sees it (non-numbers count as 0)"""
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+def lead_counter_delta(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    $inc document moving one lead's contribution from `before` to `after`
+    (None = lead absent). Enum stages count under their value; other
+    non-string stages are not counted.
+    """
+    inc: Dict[str, float] = {}
+
+    def add(field: str, amount: float):
+        inc[field] = inc.get(field, 0) + amount
+
+    for lead, sign in ((before, -1), (after, 1)):
+        if lead is None:
+            continue
+        add("total_leads", sign)
+        add("vibe_score_sum", sign * _number(lead.get("vibe_score")))
+        stage = lead.get("stage")
+        if isinstance(stage, Enum):
+            stage = stage.value
+        if isinstance(stage, str):
+            add(f"stages.{stage}", sign)
+    return {field: amount for field, amount in inc.items() if amount}
+
+async def apply_delta(db, inc: Dict[str, float]):
+    if inc:
+        await db.crm_pipeline_counters.update_one(
+            {"_id": PIPELINE_COUNTERS_ID},
+            {"$inc": inc, "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}},
+            upsert=True
+        )
+
+# ---------- Lead writes ----------
+
+async def insert_lead(db, lead: Dict[str, Any]):
+    """Insert a lead and count it"""
+    await db.crm_leads.insert_one(lead)
+    await apply_delta(db, lead_counter_delta(None, lead))
+
+async def update_lead_counted(db, lead_id: str, updates: Dict[str, Any]) -> bool:
+    """
+    $set updates on a lead and move its counters; False when the lead doesn't exist.
+    find_one_and_update returns the exact pre-image, so concurrent updates of one lead
+    still produce correct deltas.
+    """
+    tracked = {"_id": 0, "stage": 1, "vibe_score": 1}
+    before = await db.crm_leads.find_one_and_update(
+        {"id": lead_id}, {"$set": updates}, projection=tracked, return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        return False
+    after = {**before, **{field: updates[field] for field in ("stage", "vibe_score") if field in updates}}
+    await apply_delta(db, lead_counter_delta(before, after))
+    return True
+
+# ---------- Read + rebuild ----------
+
+async def rebuild_pipeline_counters(db) -> Dict[str, Any]:
+    """Recount from crm_leads with one $group (repairs drift after a crash between writes)"""
+    rows = await db.crm_leads.aggregate([
+        {"$group": {"_id": "$stage", "count": {"$sum": 1}, "vibe_score_sum": {"$sum": "$vibe_score"}}}
+    ]).to_list(None)
+    counters = {
+        "stages": {row["_id"]: row["count"] for row in rows if isinstance(row["_id"], str)},
+        "total_leads": sum(row["count"] for row in rows),
+        "vibe_score_sum": sum(row["vibe_score_sum"] for row in rows),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "rebuilt_at": datetime.now(timezone.utc).isoformat(),
+    }
+    await db.crm_pipeline_counters.replace_one({"_id": PIPELINE_COUNTERS_ID}, counters, upsert=True)
+    logger.info(f"Rebuilt CRM pipeline counters: {counters['total_leads']} leads")
+    return counters
+
+async def get_pipeline_counters(db) -> Dict[str, Any]:
+    counters = await db.crm_pipeline_counters.find_one({"_id": PIPELINE_COUNTERS_ID})
+    if counters is None or "rebuilt_at" not in counters:
+        counters = await rebuild_pipeline_counters(db)
+    return counters
+
+def funnel(stages: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Per funnel stage: leads at it, leads that reached it (it or later), conversion from the previous stage"""
+    counts = [stages.get(stage.value, 0) for stage in FUNNEL_STAGES]
+    reached = [sum(counts[i:]) for i in range(len(counts))]
+    return [
+        {
+            "stage": stage.value,
+            "count": counts[i],
+            "reached": reached[i],
+            "conversion": round(reached[i] / reached[i - 1], 3) if i and reached[i - 1] else None,
+        }
+        for i, stage in enumerate(FUNNEL_STAGES)
+    ]
+
+async def pipeline_summary(db) -> Dict[str, Any]:
+    """GTM pipeline: lead counters from the counters document, deal totals via $group"""
+    counters = await get_pipeline_counters(db)
+    deals = await db.crm_deals.aggregate([
+        {"$group": {"_id": None, "count": {"$sum": 1}, "value": {"$sum": "$value"}}}
+    ]).to_list(1)
+    deal_totals = deals[0] if deals else {"count": 0, "value": 0}
+    stages = counters.get("stages", {})
+    total_leads = counters.get("total_leads", 0)
+
+    return {
+        "stages": {stage.value: stages.get(stage.value, 0) for stage in FUNNEL_STAGES},
+        "total_leads": total_leads,
+        "total_deals": deal_totals["count"],
+        "total_value": deal_totals["value"],
+        "avg_vibe_score": counters.get("vibe_score_sum", 0) / max(1, total_leads),
+        "funnel": funnel(stages),
+        "counters_updated_at": counters.get("updated_at"),
+    }
@@ -0,0 +1,193 @@
+# ============================================
+# DB INDEXES - Declarative index registry + startup migrations
+# Applied on startup; /api/db/indexes reports usage via $indexStats
+# ============================================
+
+from typing import List, Dict, Any, Tuple, Callable, Awaitable
+from datetime import datetime, timezone
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+import logging
+
+from job_search import JOB_INDEXES, backfill_pincode_prefix
+from job_ingestion import AGGREGATED_JOB_INDEXES
+from crm_counters import rebuild_pipeline_counters
+
+logger = logging.getLogger(__name__)
+
+# Option/key-spec conflicts with an existing index of the same name or keys
+INDEX_CONFLICT_CODES = {85, 86}
+
+def index(name: str, *keys: Tuple[str, int], **options) -> IndexModel:
+    return IndexModel(list(keys), name=name, **options)
+
+# Collection -> indexes for the lookups and sorts on hot request paths
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "users": [
+        index("users_id", ("id", ASCENDING), unique=True),
+        index("users_phone", ("phone", ASCENDING)),
+        index("users_role", ("role", ASCENDING)),
+        index("users_division", ("division", ASCENDING)),
+    ],
+    "jobs": [
+        index("jobs_id", ("id", ASCENDING), unique=True),
+        index("jobs_employer", ("employer_id", ASCENDING)),
+        *JOB_INDEXES,
+    ],
+    "applications": [
+        # Also answers "already applied?" (job_id + doer_id)
+        index("applications_job_doer", ("job_id", ASCENDING), ("doer_id", ASCENDING)),
+        index("applications_doer", ("doer_id", ASCENDING)),
+    ],
+    "profiles": [
+        index("profiles_id", ("id", ASCENDING), unique=True),
+        index("profiles_user", ("user_id", ASCENDING)),
+    ],
+    "families": [
+        index("families_id", ("id", ASCENDING), unique=True),
+        index("families_member", ("members.user_id", ASCENDING)),
+        index("families_creator", ("creator_user_id", ASCENDING)),
+    ],
+    "crm_leads": [
+        index("crm_leads_id", ("id", ASCENDING), unique=True),
+        index("crm_leads_vertical_stage_recent", ("vertical", ASCENDING), ("stage", ASCENDING), ("created_at", DESCENDING)),
+        index("crm_leads_stage_recent", ("stage", ASCENDING), ("created_at", DESCENDING)),
+        index("crm_leads_recent", ("created_at", DESCENDING)),
+    ],
+    "crm_orders": [
+        index("crm_orders_id", ("id", ASCENDING), unique=True),
+        index("crm_orders_vertical", ("vertical", ASCENDING)),
+        index("crm_orders_status", ("status", ASCENDING)),
+    ],
+    "crm_metrics": [
+        index("crm_metrics_type", ("type", ASCENDING)),
+    ],
+    "legal_documents": [
+        index("legal_documents_id", ("id", ASCENDING), unique=True),
+        index("legal_documents_recent", ("created_at", DESCENDING)),
+    ],
+    "whatsapp_signings": [
+        index("whatsapp_signings_id", ("id", ASCENDING), unique=True),
+        index("whatsapp_signings_status_recent", ("status", ASCENDING), ("created_at", DESCENDING)),
+        index("whatsapp_signings_recent", ("created_at", DESCENDING)),
+    ],
+    "vertical_leaders": [
+        index("vertical_leaders_vertical_status", ("vertical", ASCENDING), ("status", ASCENDING)),
+        index("vertical_leaders_feed", ("status", ASCENDING), ("assigned_at", DESCENDING), ("id", DESCENDING)),
+    ],
+    "onboarding_sessions": [
+        index("onboarding_sessions_id", ("id", ASCENDING), unique=True),
+        index("onboarding_sessions_vertical_started", ("vertical", ASCENDING), ("started_at", DESCENDING)),
+        index("onboarding_sessions_status_started", ("status", ASCENDING), ("started_at", DESCENDING)),
+        index("onboarding_sessions_feed", ("started_at", DESCENDING), ("id", DESCENDING)),
+    ],
+    "mission_activities": [
+        index("mission_activities_feed", ("timestamp", DESCENDING), ("id", DESCENDING)),
+    ],
+    "notifications": [
+        index("notifications_recent", ("timestamp", DESCENDING)),
+    ],
+    "aggregated_jobs": AGGREGATED_JOB_INDEXES,
+}
+
+# ---------- Migrations ----------
+
+async def migrate_jobs_pincode_prefix(db):
+    return await backfill_pincode_prefix(db.jobs)
+
+async def migrate_crm_pipeline_counters(db):
+    return (await rebuild_pipeline_counters(db))["total_leads"]
+
+# (id, coroutine); applied ids are recorded in schema_migrations. A migration must be
+# safe to re-run: two workers starting together, or a crash mid-way, can repeat it.
+MIGRATIONS: List[Tuple[str, Callable[[Any], Awaitable[Any]]]] = [
+    ("0001_jobs_pincode_prefix", migrate_jobs_pincode_prefix),
+    ("0002_crm_pipeline_counters", migrate_crm_pipeline_counters),
+]
+
+async def run_migrations(db, migrations=MIGRATIONS) -> List[str]:
+    """Run migrations not yet recorded, in order; returns the ids run"""
+    done = {doc["_id"] async for doc in db.schema_migrations.find({}, {"_id": 1})}
+    applied = []
+    for migration_id, migrate in migrations:
+        if migration_id in done:
+            continue
+        result = await migrate(db)
+        await db.schema_migrations.update_one(
+            {"_id": migration_id},
+            {"$set": {"applied_at": datetime.now(timezone.utc).isoformat(), "result": result}},
+            upsert=True
+        )
+        logger.info(f"Applied migration {migration_id}: {result}")
+        applied.append(migration_id)
+    return applied
+
+# ---------- Apply + report ----------
+
+async def apply_indexes(db, registry: Dict[str, List[IndexModel]] = INDEX_REGISTRY) -> Dict[str, Any]:
+    """
+    create_indexes per collection (a no-op for indexes that already exist). When the
+    batch fails, each index is retried on its own: one that conflicts with an existing
+    index (same name or keys, other options) or cannot be built (e.g. duplicate keys
+    under a unique index) is reported without costing the collection its other indexes.
+    """
+    result: Dict[str, Any] = {"ensured": 0, "conflicts": [], "errors": []}
+    for collection_name, models in registry.items():
+        collection = db[collection_name]
+        try:
+            await collection.create_indexes(models)
+            result["ensured"] += len(models)
+            continue
+        except OperationFailure:
+            pass
+        for model in models:
+            name = model.document["name"]
+            try:
+                await collection.create_indexes([model])
+                result["ensured"] += 1
+            except OperationFailure as e:
+                target = "conflicts" if e.code in INDEX_CONFLICT_CODES else "errors"
+                result[target].append(f"{collection_name}.{name}: {e}")
+    for message in result["conflicts"] + result["errors"]:
+        logger.warning(f"Index not created: {message}")
+    return result
+
+async def ensure_database(db) -> Dict[str, Any]:
+    """Registry indexes, then pending migrations (run in the background at startup)"""
+    result = await apply_indexes(db)
+    result["migrations"] = await run_migrations(db)
+    return result
+
+async def index_report(db, registry: Dict[str, List[IndexModel]] = INDEX_REGISTRY) -> Dict[str, Any]:
+    """
+    Per collection: every index with its $indexStats usage (ops since the counter reset
+    at `since`), whether it is registered, and registered indexes that are missing
+    """
+    collections = {}
+    for collection_name, models in registry.items():
+        registered = {model.document["name"] for model in models}
+        try:
+            stats = await db[collection_name].aggregate([{"$indexStats": {}}]).to_list(None)
+        except OperationFailure as e:
+            collections[collection_name] = {"error": str(e)}
+            continue
+        indexes = sorted(
+            (
+                {
+                    "name": stat["name"],
+                    "key": dict(stat["key"]),
+                    "ops": stat["accesses"]["ops"],
+                    "since": stat["accesses"]["since"].isoformat(),
+                    "registered": stat["name"] in registered,
+                }
+                for stat in stats
+            ),
+            key=lambda entry: entry["name"]
+        )
+        present = {entry["name"] for entry in indexes}
+        collections[collection_name] = {
+            "indexes": indexes,
+            "missing": sorted(registered - present),
+            "unused": [entry["name"] for entry in indexes if entry["ops"] == 0 and entry["name"] != "_id_"],
+        }
+    return {"collections": collections, "generated_at": datetime.now(timezone.utc).isoformat()}
@@ -0,0 +1,122 @@
+# ============================================
+# DB LOADER - Batched, memoized document lookups (DataLoader style)
+# Replaces one find_one per item with one $in query per batch
+# ============================================
+
+from typing import Optional, List, Dict, Any, Hashable, Set
+import asyncio
+import functools
+
+class DocumentLoader:
+    """
+    Loads documents of one collection by a unique field
+    - load(key) calls made in the same event-loop tick are coalesced into one
+      {field: {"$in": keys}} query (split into max_batch sized chunks)
+    - results are memoized for the loader's lifetime, misses included (None)
+    Create one per request (see RequestLoaders) so memoized documents never go stale.
+    """
+
+    def __init__(self, collection, field: str = "id", projection: Optional[Dict[str, Any]] = None, max_batch: int = 500):
+        self.collection = collection
+        self.field = field
+        self.projection = projection if projection is not None else {"_id": 0}
+        self.max_batch = max_batch
+
+        self._memo: Dict[Hashable, asyncio.Future] = {}
+        self._queue: Dict[Hashable, asyncio.Future] = {}
+        # running dispatch tasks (strong references until they finish)
+        self._dispatches: Set[asyncio.Task] = set()
+        self.stats_counters = {"loads": 0, "queries": 0, "memo_hits": 0}
+
+    def load(self, key: Hashable) -> "asyncio.Future[Optional[Dict[str, Any]]]":
+        self.stats_counters["loads"] += 1
+        future = self._memo.get(key)
+        if future is not None:
+            self.stats_counters["memo_hits"] += 1
+            return future
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._memo[key] = future
+        if not self._queue:
+            loop.call_soon(self._start_dispatch)
+        self._queue[key] = future
+        return future
+
+    async def load_many(self, keys: List[Hashable]) -> List[Optional[Dict[str, Any]]]:
+        """Documents in key order (None where missing)"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: Hashable, document: Optional[Dict[str, Any]]):
+        """Memoize a document already fetched elsewhere"""
+        if key not in self._memo:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(document)
+            self._memo[key] = future
+
+    def clear(self, key: Hashable):
+        self._memo.pop(key, None)
+
+    def _start_dispatch(self):
+        queue, self._queue = self._queue, {}
+        task = asyncio.get_running_loop().create_task(self._dispatch(queue))
+        self._dispatches.add(task)
+        task.add_done_callback(functools.partial(self._dispatch_done, queue))
+
+    def _dispatch_done(self, queue: Dict[Hashable, asyncio.Future], task: asyncio.Task):
+        """Fail loads the dispatch left pending (unexpected error or cancellation)"""
+        self._dispatches.discard(task)
+        error = None if task.cancelled() else task.exception()
+        if error is None and not task.cancelled():
+            return
+        for key, future in queue.items():
+            if future.done():
+                continue
+            self._memo.pop(key, None)  # let a later load retry
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    async def _dispatch(self, queue: Dict[Hashable, asyncio.Future]):
+        keys = list(queue)
+        for start in range(0, len(keys), self.max_batch):
+            chunk = keys[start:start + self.max_batch]
+            self.stats_counters["queries"] += 1
+            try:
+                documents = await self.collection.find({self.field: {"$in": chunk}}, self.projection).to_list(None)
+            except Exception as e:
+                for key in chunk:
+                    self._memo.pop(key, None)  # let a later load retry
+                    if not queue[key].done():
+                        queue[key].set_exception(e)
+                continue
+            found: Dict[Hashable, Dict[str, Any]] = {}
+            for document in documents:
+                found.setdefault(document.get(self.field), document)
+            for key in chunk:
+                if not queue[key].done():
+                    queue[key].set_result(found.get(key))
+
+class RequestLoaders:
+    """Per-request DocumentLoaders, created on first use (FastAPI dependency)"""
+
+    def __init__(self, db):
+        self.db = db
+        self._loaders: Dict[tuple, DocumentLoader] = {}
+
+    def get(self, collection: str, field: str = "id") -> DocumentLoader:
+        loader = self._loaders.get((collection, field))
+        if loader is None:
+            loader = self._loaders[(collection, field)] = DocumentLoader(self.db[collection], field)
+        return loader
+
+    @property
+    def jobs(self) -> DocumentLoader:
+        return self.get("jobs")
+
+    @property
+    def users(self) -> DocumentLoader:
+        return self.get("users")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {f"{collection}.{field}": dict(loader.stats_counters) for (collection, field), loader in self._loaders.items()}
@@ -0,0 +1,139 @@
+# ============================================
+# EVENT BUS - In-process pub/sub for server push (SSE)
+# Bounded per-subscriber queues: a slow client loses its oldest events and is told to
+# resync; publishers never block
+# ============================================
+
+from typing import Optional, Dict, Any, Set, Iterable, Callable, Awaitable
+from collections import deque
+from datetime import datetime, timezone
+import asyncio
+import itertools
+import logging
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """
+    One subscriber's queue of events for the topics it asked for (None = all).
+    When more than max_queue events are waiting, the oldest are dropped and `lagged`
+    is set; the consumer should then resend full state and call resynced().
+    """
+
+    def __init__(self, bus: "EventBus", topics: Optional[Set[str]], max_queue: int):
+        self.bus = bus
+        self.topics = topics
+        self.max_queue = max_queue
+        self.lagged = False
+        self.dropped = 0
+        self.closed = False
+        self._events: deque = deque()
+        self._ready = asyncio.Event()
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def offer(self, event: Dict[str, Any]):
+        if len(self._events) >= self.max_queue:
+            self._events.popleft()
+            self.dropped += 1
+            self.lagged = True
+        self._events.append(event)
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None when timeout passes first (use it for heartbeats)"""
+        while not self._events:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._events.popleft()
+
+    def resynced(self):
+        """Full state was resent: queued deltas are obsolete"""
+        self._events.clear()
+        self.lagged = False
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.bus.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class EventBus:
+    """Fan-out of published events to every interested subscription"""
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscriptions: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+        self.stats_counters = {"published": 0, "delivered": 0, "dropped": 0}
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None, max_queue: Optional[int] = None) -> Subscription:
+        subscription = Subscription(self, set(topics) if topics is not None else None, max_queue or self.max_queue)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+        self.stats_counters["dropped"] += subscription.dropped
+
+    def publish(self, topic: str, data: Any) -> int:
+        """Queue an event for every subscriber of topic; returns how many got it"""
+        event = {"id": next(self._ids), "topic": topic, "data": data, "timestamp": datetime.now(timezone.utc).isoformat()}
+        delivered = 0
+        for subscription in list(self._subscriptions):
+            if subscription.wants(topic):
+                subscription.offer(event)
+                delivered += 1
+        self.stats_counters["published"] += 1
+        self.stats_counters["delivered"] += delivered
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscriptions),
+            "lagged_subscribers": sum(1 for s in self._subscriptions if s.lagged),
+            **self.stats_counters,
+            "dropped": self.stats_counters["dropped"] + sum(s.dropped for s in self._subscriptions)
+        }
+
+# ---------- Mongo change streams (optional) ----------
+
+async def relay_change_streams(db, handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]], retry_delay: float = 5.0):
+    """
+    Call handlers[collection](change) for inserts/updates/replaces on those collections,
+    so every worker sees writes made by the others. Needs a replica set; returns (after
+    logging) when change streams are unsupported, and reconnects after other errors.
+    """
+    pipeline = [{"$match": {"ns.coll": {"$in": list(handlers)}, "operationType": {"$in": ["insert", "update", "replace"]}}}]
+    while True:
+        try:
+            async with db.watch(pipeline, full_document="updateLookup") as stream:
+                async for change in stream:
+                    try:
+                        await handlers[change["ns"]["coll"]](change)
+                    except Exception as e:
+                        logger.error(f"Change stream handler failed: {e}")
+        except asyncio.CancelledError:
+            raise
+        except OperationFailure as e:
+            if e.code in (40573, 40324):  # not a replica set / $changeStream unsupported
+                logger.warning(f"Change streams unavailable, live updates stay local to this worker: {e}")
+                return
+            logger.error(f"Change stream failed, reconnecting: {e}")
+        except Exception as e:
+            logger.error(f"Change stream failed, reconnecting: {e}")
+        await asyncio.sleep(retry_delay)
+
+# Singleton instance
+event_bus = EventBus()
@@ -0,0 +1,199 @@
+# ============================================
+# GEMINI SERVICE - Non-blocking AIMEE chat calls
+# One cached GenerativeModel per system prompt, async client API (thread pool for
+# sync-only clients), and a concurrency limit with a bounded wait queue
+# ============================================
+
+from typing import Optional, Dict, Any, List, Callable, AsyncIterator
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+
+try:
+    import google.generativeai as genai
+    HAS_GEMINI = True
+except ImportError:
+    HAS_GEMINI = False
+    genai = None
+
+logger = logging.getLogger(__name__)
+
+class LLMBusyError(Exception):
+    """Too many chat requests are already waiting for a Gemini slot"""
+    pass
+
+class GeminiChatService:
+    """
+    Chat turns against Gemini without blocking the event loop.
+    model_factory(model_name=..., system_instruction=..., generation_config=...) builds
+    a model; the default is genai.GenerativeModel.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gemini-2.5-flash",
+        max_concurrency: int = 8,
+        max_waiting: int = 64,
+        timeout: float = 30.0,
+        cache_size: int = 32,
+        model_factory: Optional[Callable[..., Any]] = None
+    ):
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.model_factory = model_factory or (genai.GenerativeModel if genai else None)
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats_counters = {
+            "requests": 0, "completed": 0, "failed": 0, "rejected": 0, "timeouts": 0,
+            "models_built": 0, "peak_waiting": 0, "total_seconds": 0.0
+        }
+
+    def model(self, system_instruction: str, generation_config: Optional[Dict[str, Any]] = None):
+        """Cached model for this system prompt + config (LRU, cache_size entries)"""
+        key = json.dumps([system_instruction, generation_config], sort_keys=True)
+        model = self._models.get(key)
+        if model is None:
+            kwargs = {"model_name": self.model_name, "system_instruction": system_instruction}
+            if generation_config:
+                kwargs["generation_config"] = generation_config
+            model = self.model_factory(**kwargs)
+            self.stats_counters["models_built"] += 1
+            self._models[key] = model
+            while len(self._models) > self.cache_size:
+                self._models.popitem(last=False)
+        else:
+            self._models.move_to_end(key)
+        return model
+
+    async def _send(self, chat, message: str):
+        if hasattr(chat, "send_message_async"):
+            return await chat.send_message_async(message)
+        return await self._run_in_thread(chat.send_message, message)
+
+    def _run_in_thread(self, func, *args, **kwargs):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="gemini")
+        return asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _acquire(self):
+        self.stats_counters["requests"] += 1
+        if self._slots.locked() and self.waiting >= self.max_waiting:
+            self.stats_counters["rejected"] += 1
+            raise LLMBusyError(f"{self.waiting} Gemini requests already waiting")
+
+        self.waiting += 1
+        self.stats_counters["peak_waiting"] = max(self.stats_counters["peak_waiting"], self.waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+
+    def _release(self, started: float):
+        self.stats_counters["total_seconds"] += time.perf_counter() - started
+        self.in_flight -= 1
+        self._slots.release()
+
+    async def send(
+        self,
+        message: str,
+        system_instruction: str,
+        history: Optional[List[Dict[str, Any]]] = None,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Response text for one chat turn. Raises LLMBusyError when max_waiting requests
+        are already queued, asyncio.TimeoutError after `timeout` seconds.
+        """
+        await self._acquire()
+        started = time.perf_counter()
+        try:
+            chat = self.model(system_instruction, generation_config).start_chat(history=history or [])
+            response = await asyncio.wait_for(self._send(chat, message), self.timeout)
+            self.stats_counters["completed"] += 1
+            return response.text
+        except asyncio.TimeoutError:
+            self.stats_counters["timeouts"] += 1
+            raise
+        except Exception:
+            self.stats_counters["failed"] += 1
+            raise
+        finally:
+            self._release(started)
+
+    async def stream(
+        self,
+        message: str,
+        system_instruction: str,
+        history: Optional[List[Dict[str, Any]]] = None,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Response text chunks as Gemini generates them. Holds a slot until the stream
+        ends; `timeout` applies to the wait for each chunk.
+        """
+        await self._acquire()
+        started = time.perf_counter()
+        try:
+            chat = self.model(system_instruction, generation_config).start_chat(history=history or [])
+            if hasattr(chat, "send_message_async"):
+                response = await asyncio.wait_for(chat.send_message_async(message, stream=True), self.timeout)
+                chunks = response.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    yield chunk.text
+            else:
+                response = await asyncio.wait_for(self._run_in_thread(chat.send_message, message, stream=True), self.timeout)
+                chunks = iter(response)
+                while True:
+                    chunk = await asyncio.wait_for(self._run_in_thread(next, chunks, None), self.timeout)
+                    if chunk is None:
+                        break
+                    yield chunk.text
+            self.stats_counters["completed"] += 1
+        except asyncio.TimeoutError:
+            self.stats_counters["timeouts"] += 1
+            raise
+        except Exception:
+            self.stats_counters["failed"] += 1
+            raise
+        finally:
+            self._release(started)
+
+    def stats(self) -> Dict[str, Any]:
+        finished = self.stats_counters["completed"] + self.stats_counters["failed"] + self.stats_counters["timeouts"]
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_waiting": self.max_waiting,
+            "models_cached": len(self._models),
+            **{k: v for k, v in self.stats_counters.items() if k != "total_seconds"},
+            "avg_seconds": round(self.stats_counters["total_seconds"] / finished, 3) if finished else None
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+# Singleton instance
+gemini_chat = GeminiChatService(
+    max_concurrency=int(os.environ.get("GEMINI_MAX_CONCURRENCY", "8")),
+    max_waiting=int(os.environ.get("GEMINI_MAX_WAITING", "64")),
+    timeout=float(os.environ.get("GEMINI_TIMEOUT_SECONDS", "30"))
+)
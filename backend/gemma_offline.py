@@ -15,13 +15,18 @@ import os
 import json
 import hashlib
 import asyncio
+import re
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import logging
 import uuid
 
+from response_cache import normalize_prompt, prompt_version
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -255,9 +260,98 @@ OFFLINE_FAQ = {
         "how_to_improve_income": "ಆದಾಯವನ್ನು ಸುಧಾರಿಸಲು: 1) ITI/ಸ್ಕಿಲ್ ಇಂಡಿಯಾ ಮೂಲಕ ಪ್ರಮಾಣಿತ ಕೌಶಲ್ಯಗಳನ್ನು ಪಡೆಯಿರಿ, 2) PMKVY ನಂತಹ ಸರ್ಕಾರಿ ಯೋಜನೆಗಳಲ್ಲಿ ಸೇರಿ, 3) ಡಿಜಿಟಲ್ ಕೌಶಲ್ಯಗಳನ್ನು ಕಲಿಯಿರಿ, 4) SHG ಬೆಂಬಲದೊಂದಿಗೆ ಸಣ್ಣ ವ್ಯಾಪಾರ ಪ್ರಾರಂಭಿಸಿ.",
         "government_schemes": "ಪ್ರಮುಖ ಸರ್ಕಾರಿ ಯೋಜನೆಗಳು: 1) PMKVY, 2) ವ್ಯಾಪಾರಕ್ಕೆ ಮುದ್ರಾ ಸಾಲ, 3) ಸ್ಕಿಲ್ ಇಂಡಿಯಾ ಡಿಜಿಟಲ್, 4) ರಾಷ್ಟ್ರೀಯ ಅಪ್ರೆಂಟಿಸ್‌ಶಿಪ್ ಯೋಜನೆ. ಸಹಾಯಕ್ಕಾಗಿ ನಿಮ್ಮ ಹತ್ತಿರದ ಕಾಮನ್ ಸರ್ವೀಸ್ ಸೆಂಟರ್ ಭೇಟಿ ಮಾಡಿ.",
         "default": "ನಾನು ವೃತ್ತಿ ಮಾರ್ಗದರ್ಶನದಲ್ಲಿ ಸಹಾಯ ಮಾಡಲು ಇಲ್ಲಿದ್ದೇನೆ. ನೀವು ಕೇಳಬಹುದು: 1) ನಿಮ್ಮ ಶಿಕ್ಷಣ ಮಟ್ಟಕ್ಕೆ ವೃತ್ತಿ ಆಯ್ಕೆಗಳು, 2) ಸರ್ಕಾರಿ ಯೋಜನೆಗಳು, 3) ಕೌಶಲ್ಯ ಅಭಿವೃದ್ಧಿ ಕಾರ್ಯಕ್ರಮಗಳು, 4) ನಿಮ್ಮ ಪ್ರದೇಶದಲ್ಲಿ ಉದ್ಯೋಗಾವಕಾಶಗಳು."
+    },
+    "hi": {
+        "what_career_suits_me": "आपकी रुचि और शिक्षा के आधार पर, मेरा सुझाव है: 1) स्थिर ऑफिस नौकरियों के लिए डिजिटल स्किल्स, 2) अधिक आय के लिए कुशल ट्रेड, 3) खेती की पृष्ठभूमि हो तो एग्रीकल्चर टेक। आपकी शिक्षा का स्तर क्या है?",
+        "how_to_improve_income": "आय बढ़ाने के लिए: 1) ITI/स्किल इंडिया से प्रमाणित स्किल्स पाएं, 2) PMKVY जैसी सरकारी योजनाओं से जुड़ें, 3) डिजिटल स्किल्स (कंप्यूटर, मोबाइल ऐप) सीखें, 4) SHG की मदद से छोटा व्यवसाय शुरू करें।",
+        "government_schemes": "मुख्य सरकारी योजनाएं: 1) PMKVY (प्रधानमंत्री कौशल विकास योजना), 2) व्यवसाय के लिए मुद्रा लोन, 3) स्किल इंडिया डिजिटल, 4) राष्ट्रीय अप्रेंटिसशिप योजना। मदद के लिए अपने नज़दीकी कॉमन सर्विस सेंटर जाएं।",
+        "default": "मैं करियर मार्गदर्शन में आपकी मदद के लिए यहां हूं। आप पूछ सकते हैं: 1) आपकी शिक्षा के अनुसार करियर विकल्प, 2) सरकारी योजनाएं, 3) स्किल डेवलपमेंट प्रोग्राम, 4) आपके क्षेत्र में नौकरी के अवसर।"
     }
 }
 
+# ============================================
+# OFFLINE QUERY ROUTING
+# Keyword -> FAQ tables; English keywords apply to every language (job, PMKVY and
+# salary are used as-is in Telugu, Kannada and Hindi questions)
+# ============================================
+
+FAQ_KEYWORDS = {
+    "en": {
+        "career": "what_career_suits_me",
+        "job": "what_career_suits_me",
+        "work": "what_career_suits_me",
+        "income": "how_to_improve_income",
+        "salary": "how_to_improve_income",
+        "money": "how_to_improve_income",
+        "government": "government_schemes",
+        "scheme": "government_schemes",
+        "pmkvy": "government_schemes",
+        "mudra": "government_schemes",
+    },
+    "te": {
+        "కెరీర్": "what_career_suits_me",
+        "ఉద్యోగం": "what_career_suits_me",
+        "ఆదాయం": "how_to_improve_income",
+        "ప్రభుత్వ": "government_schemes",
+    },
+    "kn": {
+        "ವೃತ್ತಿ": "what_career_suits_me",
+        "ಕೆಲಸ": "what_career_suits_me",
+        "ಆದಾಯ": "how_to_improve_income",
+        "ಸರ್ಕಾರ": "government_schemes",
+    },
+    "hi": {
+        "करियर": "what_career_suits_me",
+        "कैरियर": "what_career_suits_me",
+        "नौकरी": "what_career_suits_me",
+        "रोजगार": "what_career_suits_me",
+        "रोज़गार": "what_career_suits_me",
+        # not "आय" alone: it is also the start of आयु (age) and आयोग (commission)
+        "आमदनी": "how_to_improve_income",
+        "कमाई": "how_to_improve_income",
+        "वेतन": "how_to_improve_income",
+        "तनख्वाह": "how_to_improve_income",
+        "पैसा": "how_to_improve_income",
+        "पैसे": "how_to_improve_income",
+        "सरकार": "government_schemes",
+        "योजना": "government_schemes",
+    }
+}
+
+# Tie-break order between equally scored FAQs (the order the keyword tables used to
+# be checked in)
+FAQ_PRIORITY = ("what_career_suits_me", "how_to_improve_income", "government_schemes")
+
+class FAQMatcher:
+    """
+    Keyword -> FAQ router for one language, compiled once
+    - one regex alternation (longest keyword first) finds every keyword in a single
+      pass over the casefolded query; keywords match as substrings, so inflected
+      forms like ప్రభుత్వం or सरकारी still hit
+    - candidates(query) -> [(faq_key, score), ...], score = distinct keywords hit,
+      best first; ties broken by FAQ_PRIORITY, then FAQ key
+    """
+    
+    def __init__(self, keywords: Dict[str, str], priority: tuple = FAQ_PRIORITY):
+        self.keywords = {keyword.casefold(): faq_key for keyword, faq_key in keywords.items()}
+        ordered = sorted(self.keywords, key=lambda keyword: (-len(keyword), keyword))
+        self.pattern = re.compile("|".join(map(re.escape, ordered))) if ordered else None
+        self.rank = {faq_key: i for i, faq_key in enumerate(priority)}
+    
+    def candidates(self, query: str) -> List[tuple]:
+        if self.pattern is None:
+            return []
+        hits = self.pattern.findall(query.casefold())
+        if not hits:
+            return []
+        if len(hits) == 1:  # the common case: skip scoring
+            return [(self.keywords[hits[0]], 1)]
+        scores: Dict[str, int] = {}
+        for keyword in set(hits):
+            faq_key = self.keywords[keyword]
+            scores[faq_key] = scores.get(faq_key, 0) + 1
+        return sorted(scores.items(), key=lambda item: (-item[1], self.rank.get(item[0], len(self.rank)), item[0]))
+
 # ============================================
 # PYDANTIC MODELS
 # ============================================
@@ -292,10 +386,269 @@ class OfflineCacheEntry(BaseModel):
     expires_at: str
     access_count: int = 0
 
+# ============================================
+# ONLINE ANSWER CACHE
+# LLM answers kept for repeat and offline queries
+# ============================================
+
+class OnlineAnswerCache:
+    """
+    OfflineCacheEntry store keyed by GemmaOfflineService._generate_cache_key
+    - bounded by max_entries and max_bytes (UTF-8 size of the answers)
+    - eviction: "lfu" drops the lowest access_count (least recently used among ties),
+      "lru" the least recently used
+    - entries stop being served at expires_at
+    - optional Mongo collection as second tier (TTL index on expires_at), so answers
+      survive restarts and are shared between workers
+    - hits are counted in memory and written to Mongo in the background, every
+      flush_interval seconds, when an entry is evicted, and on close()
+    """
+    
+    def __init__(
+        self,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 2000,
+        max_bytes: int = 4 * 1024 * 1024,
+        policy: str = "lfu",
+        collection=None,
+        flush_interval: float = 60,
+        clock: Callable[[], float] = time.time
+    ):
+        if policy not in ("lfu", "lru"):
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.collection = collection
+        self.flush_interval = flush_interval
+        self.clock = clock
+        
+        # key -> (entry, expires at as epoch seconds, size in bytes); order = recency
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.bytes_used = 0
+        
+        # key -> hits not yet written to Mongo
+        self._pending_access: Dict[str, int] = {}
+        self._last_flush = clock()
+        self._flush_tasks = set()
+        
+        self.stats_counters = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+            "rejected_too_large": 0,
+            "mongo_hits": 0,
+            "mongo_errors": 0
+        }
+    
+    # ---------- Second tier ----------
+    
+    async def attach_collection(self, collection):
+        """Use a Motor collection as second tier; Mongo expires documents via a TTL index"""
+        self.collection = collection
+        try:
+            await collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            self.stats_counters["mongo_errors"] += 1
+            logger.warning(f"Gemma answer cache TTL index not created: {e}")
+    
+    async def _load(self, key: str) -> Optional[OfflineCacheEntry]:
+        if self.collection is None:
+            return None
+        try:
+            doc = await self.collection.find_one({"_id": key})
+        except Exception as e:
+            self.stats_counters["mongo_errors"] += 1
+            logger.warning(f"Gemma answer cache read failed: {e}")
+            return None
+        if not doc:
+            return None
+        expires_at = doc["expires_at"]
+        if expires_at.tzinfo is None:  # Motor returns naive UTC datetimes by default
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at.timestamp() <= self.clock():
+            return None  # Mongo's TTL monitor only runs once a minute
+        doc.pop("_id")
+        entry = OfflineCacheEntry(**{**doc, "expires_at": expires_at.isoformat()})
+        self._store(entry)
+        self.stats_counters["mongo_hits"] += 1
+        return entry
+    
+    async def _save(self, entry: OfflineCacheEntry):
+        if self.collection is None:
+            return
+        try:
+            await self.collection.replace_one(
+                {"_id": entry.cache_key},
+                {**entry.model_dump(exclude={"expires_at"}), "expires_at": datetime.fromisoformat(entry.expires_at)},
+                upsert=True
+            )
+        except Exception as e:
+            self.stats_counters["mongo_errors"] += 1
+            logger.warning(f"Gemma answer cache write failed: {e}")
+    
+    def _record_access(self, key: str):
+        self._pending_access[key] = self._pending_access.get(key, 0) + 1
+        if self.clock() - self._last_flush >= self.flush_interval:
+            self._last_flush = self.clock()
+            self._schedule_flush()
+    
+    def _schedule_flush(self, keys: Optional[List[str]] = None):
+        """Write pending access counts in a background task (kept referenced until done)"""
+        if self.collection is None or not self._pending_access:
+            return
+        task = asyncio.get_running_loop().create_task(self.flush_access_counts(keys))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+    
+    async def flush_access_counts(self, keys: Optional[List[str]] = None) -> int:
+        """One $inc per key with pending hits (all keys by default); failed writes stay pending"""
+        if self.collection is None:
+            return 0
+        keys = list(self._pending_access) if keys is None else [key for key in keys if key in self._pending_access]
+        pending = {key: self._pending_access.pop(key) for key in keys}
+        results = await asyncio.gather(*(
+            self.collection.update_one({"_id": key}, {"$inc": {"access_count": count}})
+            for key, count in pending.items()
+        ), return_exceptions=True)
+        for (key, count), result in zip(pending.items(), results):
+            if isinstance(result, Exception):
+                self.stats_counters["mongo_errors"] += 1
+                self._pending_access[key] = self._pending_access.get(key, 0) + count
+                logger.warning(f"Gemma answer cache access count not saved: {result}")
+        return len(pending)
+    
+    async def close(self):
+        """Wait for scheduled writes, then flush the remaining access counts"""
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush_access_counts()
+    
+    # ---------- Memory tier ----------
+    
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self.bytes_used -= size
+    
+    def _evict_one(self):
+        if self.policy == "lru":
+            victim = next(iter(self._entries))
+        else:
+            # Scans from least to most recently used, so ties go to the older entry;
+            # O(entries) but only runs when a store overflows the limits
+            victim = min(self._entries, key=lambda key: self._entries[key][0].access_count)
+        self._remove(victim)
+        self._schedule_flush([victim])
+        self.stats_counters["evictions"] += 1
+    
+    def _store(self, entry: OfflineCacheEntry) -> bool:
+        size = len(entry.response.encode("utf-8"))
+        if size > self.max_bytes:
+            self.stats_counters["rejected_too_large"] += 1
+            return False
+        if entry.cache_key in self._entries:
+            self._remove(entry.cache_key)
+        while self._entries and (len(self._entries) >= self.max_entries or self.bytes_used + size > self.max_bytes):
+            self._evict_one()
+        expires = datetime.fromisoformat(entry.expires_at).timestamp()
+        self._entries[entry.cache_key] = (entry, expires, size)
+        self.bytes_used += size
+        return True
+    
+    def _live(self, key: str) -> Optional[OfflineCacheEntry]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        if self.clock() >= item[1]:
+            self._remove(key)
+            self._pending_access.pop(key, None)  # the Mongo document has expired too
+            self.stats_counters["expired"] += 1
+            return None
+        return item[0]
+    
+    # ---------- Public API ----------
+    
+    async def get(self, key: str) -> Optional[OfflineCacheEntry]:
+        """Live entry for key (memory, then Mongo); counts the access without waiting on Mongo"""
+        entry = self._live(key)
+        if entry is None:
+            entry = await self._load(key)
+        if entry is None:
+            self.stats_counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        entry.access_count += 1
+        self.stats_counters["hits"] += 1
+        if self.collection is not None:
+            self._record_access(key)
+        return entry
+    
+    async def set(self, key: str, query: str, response: str, language: str, category: str = "online_answer") -> OfflineCacheEntry:
+        now = self.clock()
+        entry = OfflineCacheEntry(
+            cache_key=key,
+            query_hash=hashlib.sha1(normalize_prompt(query).encode()).hexdigest(),
+            response=response,
+            language=language,
+            category=category,
+            created_at=datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            expires_at=datetime.fromtimestamp(now + self.ttl, timezone.utc).isoformat()
+        )
+        if self._store(entry):
+            self.stats_counters["stores"] += 1
+            await self._save(entry)
+        return entry
+    
+    def clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.stats_counters["hits"] + self.stats_counters["misses"]
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "policy": self.policy,
+            "ttl_seconds": self.ttl,
+            "persistent": self.collection is not None,
+            "pending_access_writes": sum(self._pending_access.values()),
+            **self.stats_counters,
+            "hit_rate": round(self.stats_counters["hits"] / lookups, 3) if lookups else None
+        }
+
 # ============================================
 # GEMMA OFFLINE SERVICE
 # ============================================
 
+# (provider, model) for online answers
+GEMMA_ONLINE_MODEL = ("gemini", "gemini-3-flash-preview")
+
+GEMMA_SYSTEM_PROMPT = """You are DOERS Career Guide AI, helping people in rural India find career opportunities.
+            
+Current user language: {language} ({native})
+Region focus: {language_region}
+
+Your role:
+1. Provide practical career guidance for LIG (Low Income Group) workers
+2. Recommend government schemes like PMKVY, Mudra Loan, Skill India
+3. Suggest skill development paths based on education level
+4. Be encouraging and use simple language
+5. ALWAYS respond in {language} language
+
+Context about the user:
+- Education level: {education_level}
+- Region: {region}
+
+Provide helpful, practical career advice."""
+
+# Changing the prompt template or model starts a fresh answer cache
+GEMMA_PROMPT_VERSION = prompt_version(GEMMA_SYSTEM_PROMPT, GEMMA_ONLINE_MODEL)
+
 class GemmaOfflineService:
     """
     Gemma 3n Offline AI Service for Rural India
@@ -311,11 +664,19 @@ class GemmaOfflineService:
         self.api_key = os.environ.get("EMERGENT_LLM_KEY")
         self.ollama_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
         self.model_name = "gemma-3-270m"  # Gemma 3n for mobile
-        self.cache = {}
+        self.cache = {}  # static FAQ answers
+        self.answers = OnlineAnswerCache(
+            ttl=float(os.environ.get("GEMMA_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            max_entries=int(os.environ.get("GEMMA_CACHE_MAX_ENTRIES", "2000")),
+            max_bytes=int(os.environ.get("GEMMA_CACHE_MAX_BYTES", str(4 * 1024 * 1024))),
+            policy=os.environ.get("GEMMA_CACHE_POLICY", "lfu"),
+            flush_interval=float(os.environ.get("GEMMA_CACHE_FLUSH_SECONDS", "60"))
+        )
+        self.matchers: Dict[str, FAQMatcher] = {}
         self._load_offline_cache()
     
     def _load_offline_cache(self):
-        """Pre-load offline cache with common responses"""
+        """Pre-load offline cache with common responses and compile the FAQ matchers"""
         for lang, faqs in OFFLINE_FAQ.items():
             for key, response in faqs.items():
                 cache_key = f"{lang}:{key}"
@@ -324,59 +685,30 @@ class GemmaOfflineService:
                     "language": lang,
                     "is_cached": True
                 }
+        for lang in RURAL_LANGUAGES:
+            keywords = {**FAQ_KEYWORDS["en"], **FAQ_KEYWORDS.get(lang, {})}
+            self.matchers[lang] = FAQMatcher({
+                keyword: faq_key for keyword, faq_key in keywords.items() if f"{lang}:{faq_key}" in self.cache
+            })
         logger.info(f"Loaded {len(self.cache)} offline cache entries")
     
-    def _generate_cache_key(self, query: str, language: str) -> str:
-        """Generate cache key from query"""
-        normalized = query.lower().strip()
-        hash_input = f"{language}:{normalized}"
+    def _generate_cache_key(self, query: GemmaQuery) -> str:
+        """Cache key from the normalized question plus everything the online prompt depends on"""
+        hash_input = "|".join([
+            GEMMA_PROMPT_VERSION, query.language, query.education_level or "", query.region or "", normalize_prompt(query.query)
+        ])
         return hashlib.md5(hash_input.encode()).hexdigest()[:12]
     
+    def rank_offline_faqs(self, query: str, language: str) -> List[tuple]:
+        """Scored FAQ candidates for query, best first: [(faq_key, score), ...]"""
+        matcher = self.matchers.get(language)
+        return matcher.candidates(query) if matcher else []
+    
     def _match_offline_query(self, query: str, language: str) -> Optional[str]:
-        """Match query to pre-cached response using keyword matching"""
-        query_lower = query.lower()
-        
-        # Keyword matching for common questions
-        keyword_map = {
-            "career": "what_career_suits_me",
-            "job": "what_career_suits_me",
-            "work": "what_career_suits_me",
-            "income": "how_to_improve_income",
-            "salary": "how_to_improve_income",
-            "money": "how_to_improve_income",
-            "government": "government_schemes",
-            "scheme": "government_schemes",
-            "pmkvy": "government_schemes",
-            "mudra": "government_schemes",
-        }
-        
-        # Telugu keywords
-        telugu_keywords = {
-            "కెరీర్": "what_career_suits_me",
-            "ఉద్యోగం": "what_career_suits_me",
-            "ఆదాయం": "how_to_improve_income",
-            "ప్రభుత్వ": "government_schemes",
-        }
-        
-        # Kannada keywords
-        kannada_keywords = {
-            "ವೃತ್ತಿ": "what_career_suits_me",
-            "ಕೆಲಸ": "what_career_suits_me",
-            "ಆದಾಯ": "how_to_improve_income",
-            "ಸರ್ಕಾರ": "government_schemes",
-        }
-        
-        all_keywords = {**keyword_map}
-        if language == "te":
-            all_keywords.update(telugu_keywords)
-        elif language == "kn":
-            all_keywords.update(kannada_keywords)
-        
-        for keyword, faq_key in all_keywords.items():
-            if keyword in query_lower:
-                cache_key = f"{language}:{faq_key}"
-                if cache_key in self.cache:
-                    return self.cache[cache_key]["response"]
+        """Best pre-cached FAQ response for query, else the language's default"""
+        candidates = self.rank_offline_faqs(query, language)
+        if candidates:
+            return self.cache[f"{language}:{candidates[0][0]}"]["response"]
         
         # Return default response
         default_key = f"{language}:default"
@@ -399,6 +731,19 @@ class GemmaOfflineService:
     
     async def get_offline_response(self, query: GemmaQuery) -> GemmaResponse:
         """Get response using offline cache"""
+        cache_key = self._generate_cache_key(query)
+        
+        # An earlier online answer to the same question beats a keyword-matched FAQ
+        answered = await self.answers.get(cache_key)
+        if answered is not None:
+            return GemmaResponse(
+                response=answered.response,
+                language=query.language,
+                is_cached=True,
+                cache_key=cache_key,
+                related_resources=self._get_related_resources(query)
+            )
+        
         # Try to match from cache
         cached_response = self._match_offline_query(query.query, query.language)
         
@@ -407,7 +752,7 @@ class GemmaOfflineService:
                 response=cached_response,
                 language=query.language,
                 is_cached=True,
-                cache_key=self._generate_cache_key(query.query, query.language),
+                cache_key=cache_key,
                 related_resources=self._get_related_resources(query)
             )
         
@@ -424,46 +769,42 @@ class GemmaOfflineService:
     
     async def get_online_response(self, query: GemmaQuery) -> GemmaResponse:
         """Get response using online Gemma API or LLM"""
+        cache_key = self._generate_cache_key(query)
+        answered = await self.answers.get(cache_key)
+        if answered is not None:
+            return GemmaResponse(
+                response=answered.response,
+                language=query.language,
+                is_cached=True,
+                cache_key=cache_key,
+                related_resources=self._get_related_resources(query)
+            )
+        
         try:
             from emergentintegrations.llm.chat import LlmChat, UserMessage
             
             # Build system prompt
             lang_info = RURAL_LANGUAGES.get(query.language, RURAL_LANGUAGES["en"])
             
-            system_prompt = f"""You are DOERS Career Guide AI, helping people in rural India find career opportunities.
-            
-Current user language: {lang_info['name']} ({lang_info['native']})
-Region focus: {lang_info['region']}
-
-Your role:
-1. Provide practical career guidance for LIG (Low Income Group) workers
-2. Recommend government schemes like PMKVY, Mudra Loan, Skill India
-3. Suggest skill development paths based on education level
-4. Be encouraging and use simple language
-5. ALWAYS respond in {lang_info['name']} language
-
-Context about the user:
-- Education level: {query.education_level or 'Not specified'}
-- Region: {query.region or lang_info['region']}
-
-Provide helpful, practical career advice."""
+            system_prompt = GEMMA_SYSTEM_PROMPT.format(
+                language=lang_info['name'],
+                native=lang_info['native'],
+                language_region=lang_info['region'],
+                education_level=query.education_level or 'Not specified',
+                region=query.region or lang_info['region']
+            )
 
             chat = LlmChat(
                 api_key=self.api_key,
                 session_id=f"gemma_{uuid.uuid4()}",
                 system_message=system_prompt
-            ).with_model("gemini", "gemini-3-flash-preview")
+            ).with_model(*GEMMA_ONLINE_MODEL)
             
             user_message = UserMessage(text=query.query)
             response = await chat.send_message(user_message)
             
-            # Cache the response for future offline use
-            cache_key = self._generate_cache_key(query.query, query.language)
-            self.cache[cache_key] = {
-                "response": response,
-                "language": query.language,
-                "is_cached": False
-            }
+            # Keep the answer for repeat and offline queries
+            await self.answers.set(cache_key, query.query, response, query.language)
             
             return GemmaResponse(
                 response=response,
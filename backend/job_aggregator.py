@@ -4,13 +4,17 @@
 # ============================================
 
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable, Awaitable, AsyncIterator
 from datetime import datetime, timezone
+from collections import OrderedDict
 import httpx
 import asyncio
 import logging
+import time
 import os
 
+from job_dedup import JobDeduplicator
+
 logger = logging.getLogger(__name__)
 
 def utc_now() -> str:
@@ -63,29 +67,448 @@ class AggregatedJob(BaseModel):
     posted_date: Optional[str] = None
     expires_date: Optional[str] = None
     applicants_count: Optional[int] = None
+    merged_sources: List[str] = Field(default_factory=list)  # sources of near-duplicate copies folded into this job
     
     # Timestamps
     fetched_at: str = Field(default_factory=utc_now)
 
+# ============================================
+# SEARCH CACHE - TTL + stale-while-revalidate
+# Per-source results, so paid API quotas aren't spent on repeat searches
+# ============================================
+
+SearchKey = Tuple[str, str, str, int]  # (source, query, location, page)
+
+def normalize_search_text(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+def search_cache_key(source: str, query: str, location: str, page: int) -> SearchKey:
+    return (source, normalize_search_text(query), normalize_search_text(location), int(page))
+
+class CachedSearch:
+    __slots__ = ("jobs", "fetched_at")
+    
+    def __init__(self, jobs: List[AggregatedJob], fetched_at: float):
+        self.jobs = jobs
+        self.fetched_at = fetched_at
+
+class SearchResultCache:
+    """
+    Cache of per-source search results keyed by (source, query, location, page)
+    - fresh for ttl seconds; then served stale for up to stale_ttl more while a single
+      background task refreshes the entry
+    - concurrent misses for the same key share one upstream call (coalescing)
+    - empty results only live empty_ttl; fetches raise on upstream errors, so a failed
+      refresh keeps serving the stale entry instead of replacing it with nothing
+    - optional Mongo collection as second tier, so entries survive restarts
+    """
+    
+    def __init__(
+        self,
+        ttl: float = 900,
+        stale_ttl: float = 6 * 3600,
+        empty_ttl: float = 60,
+        maxsize: int = 1000,
+        collection=None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.empty_ttl = empty_ttl
+        self.maxsize = maxsize
+        self.collection = collection
+        self.clock = clock
+        
+        self._entries: "OrderedDict[SearchKey, CachedSearch]" = OrderedDict()
+        self._inflight: Dict[SearchKey, asyncio.Future] = {}
+        self._refreshing: Dict[SearchKey, asyncio.Task] = {}
+        
+        self.stats_counters = {
+            "hits": 0,
+            "misses": 0,
+            "stale_served": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "mongo_hits": 0,
+            "mongo_errors": 0,
+            "evictions": 0
+        }
+    
+    # ---------- Second tier ----------
+    
+    async def attach_collection(self, collection):
+        """Use a Motor collection as second tier; Mongo expires documents via a TTL index"""
+        self.collection = collection
+        try:
+            await collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            self.stats_counters["mongo_errors"] += 1
+            logger.warning(f"Search cache TTL index not created: {e}")
+    
+    async def _load(self, key: SearchKey) -> Optional[CachedSearch]:
+        if self.collection is None:
+            return None
+        try:
+            doc = await self.collection.find_one({"_id": "|".join(map(str, key))})
+        except Exception as e:
+            self.stats_counters["mongo_errors"] += 1
+            logger.warning(f"Search cache read failed: {e}")
+            return None
+        if not doc:
+            return None
+        entry = CachedSearch([AggregatedJob(**job) for job in doc["jobs"]], doc["fetched_at"])
+        self._store(key, entry)
+        self.stats_counters["mongo_hits"] += 1
+        return entry
+    
+    async def _save(self, key: SearchKey, entry: CachedSearch):
+        if self.collection is None:
+            return
+        lifetime = (self.ttl + self.stale_ttl) if entry.jobs else self.empty_ttl
+        try:
+            await self.collection.replace_one(
+                {"_id": "|".join(map(str, key))},
+                {
+                    "source": key[0],
+                    "query": key[1],
+                    "location": key[2],
+                    "page": key[3],
+                    "jobs": [job.model_dump() for job in entry.jobs],
+                    "fetched_at": entry.fetched_at,
+                    "expires_at": datetime.fromtimestamp(entry.fetched_at + lifetime, timezone.utc)
+                },
+                upsert=True
+            )
+        except Exception as e:
+            self.stats_counters["mongo_errors"] += 1
+            logger.warning(f"Search cache write failed: {e}")
+    
+    # ---------- Lookup ----------
+    
+    def _store(self, key: SearchKey, entry: CachedSearch):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats_counters["evictions"] += 1
+    
+    def _age_limits(self, entry: CachedSearch) -> Tuple[float, float]:
+        """(fresh until, usable until) in seconds of age"""
+        if not entry.jobs:
+            return self.empty_ttl, self.empty_ttl
+        return self.ttl, self.ttl + self.stale_ttl
+    
+    async def get_or_fetch(
+        self,
+        key: SearchKey,
+        fetch: Callable[[], Awaitable[List[AggregatedJob]]]
+    ) -> List[AggregatedJob]:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = await self._load(key)
+        
+        if entry is not None:
+            age = self.clock() - entry.fetched_at
+            fresh_for, usable_for = self._age_limits(entry)
+            if age < fresh_for:
+                self._entries.move_to_end(key)
+                self.stats_counters["hits"] += 1
+                return list(entry.jobs)
+            if age < usable_for:
+                self.stats_counters["stale_served"] += 1
+                self._schedule_refresh(key, fetch)
+                return list(entry.jobs)
+        
+        self.stats_counters["misses"] += 1
+        return list(await self._fetch(key, fetch))
+    
+    async def _fetch(self, key: SearchKey, fetch) -> List[AggregatedJob]:
+        """One upstream call per key at a time; concurrent callers await the same result"""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats_counters["coalesced"] += 1
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            jobs = await fetch()
+            entry = CachedSearch(jobs, self.clock())
+            self._store(key, entry)
+            await self._save(key, entry)
+            future.set_result(jobs)
+            return jobs
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an uncoalesced failure isn't reported as "never retrieved"
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+    
+    def _schedule_refresh(self, key: SearchKey, fetch):
+        if key in self._refreshing or key in self._inflight:
+            return
+        task = asyncio.create_task(self._refresh(key, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+    
+    async def _refresh(self, key: SearchKey, fetch):
+        self.stats_counters["refreshes"] += 1
+        try:
+            await self._fetch(key, fetch)
+        except Exception as e:
+            self.stats_counters["refresh_errors"] += 1
+            logger.error(f"Search cache refresh failed for {key[0]}: {e}")
+    
+    async def close(self):
+        """Cancel background refreshes (shutdown)"""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        c = self.stats_counters
+        lookups = c["hits"] + c["misses"] + c["stale_served"]
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "mongo_tier": self.collection is not None,
+            "inflight": len(self._inflight),
+            "refreshing": len(self._refreshing),
+            **c,
+            "hit_rate": round((c["hits"] + c["stale_served"]) / lookups, 4) if lookups else 0.0
+        }
+
+# ============================================
+# SHARED HTTP CLIENT - Pooled, keep-alive connections
+# ============================================
+
+try:
+    import h2  # noqa: F401 - enables httpx HTTP/2 support
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+def create_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    AsyncClient shared by all job sources: connections are pooled per host and kept alive,
+    HTTP/2 when the h2 package is installed
+    """
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    kwargs.setdefault("limits", HTTP_LIMITS)
+    kwargs.setdefault("http2", HAS_HTTP2)
+    return httpx.AsyncClient(**kwargs)
+
+# ============================================
+# CIRCUIT BREAKER - Stop calling failing providers
+# ============================================
+
+class SourceUnavailable(Exception):
+    """Raised instead of calling a source whose circuit is open"""
+
+class SourceError(Exception):
+    """A source answered with an error status (raised when search_jobs(raise_errors=True))"""
+
+class CircuitBreaker:
+    """
+    closed -> open after failure_threshold consecutive failures (errors, timeouts, 429, 5xx)
+    open -> half_open after reset_timeout seconds: one trial call is let through
+    half_open -> closed on success, back to open on failure
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.stats_counters = {"failures": 0, "rate_limited": 0, "opened": 0, "rejected": 0}
+    
+    def allow(self) -> bool:
+        if self.state == "open" and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._trial_in_flight = False
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.stats_counters["rejected"] += 1
+        return False
+    
+    def release_trial(self):
+        """A half-open trial call was cancelled without an outcome"""
+        self._trial_in_flight = False
+    
+    def record_success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+    
+    def record_failure(self, rate_limited: bool = False):
+        self.stats_counters["failures"] += 1
+        if rate_limited:
+            self.stats_counters["rate_limited"] += 1
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.stats_counters["opened"] += 1
+                logger.warning(f"Circuit for {self.name} opened after {self.consecutive_failures} failures")
+            self.state = "open"
+            self.opened_at = self.clock()
+            self._trial_in_flight = False
+    
+    def snapshot(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == "open":
+            retry_in = max(0.0, round(self.reset_timeout - (self.clock() - self.opened_at), 1))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_in_seconds": retry_in,
+            **self.stats_counters
+        }
+
+# ============================================
+# SOURCE CLIENT BASE
+# ============================================
+
+class SourceClient:
+    """
+    Base for job source clients
+    Uses the shared pooled client once JobAggregatorService.startup() ran; otherwise
+    (scripts, one-off use) falls back to a short-lived client per request.
+    BASE_URL can be overridden per instance or via BASE_URL_ENV (e.g. a local stub).
+    Every request goes through the client's circuit breaker and request_timeout; with
+    hedge_after set, a duplicate request is sent when the first is still pending after
+    that many seconds and whichever answers first wins (costs quota, so off by default).
+    """
+    
+    NAME = ""
+    BASE_URL = ""
+    BASE_URL_ENV = ""
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        request_timeout: float = 10.0,
+        hedge_after: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.base_url = base_url or os.environ.get(self.BASE_URL_ENV, "") or self.BASE_URL
+        self.http_client = http_client
+        self.request_timeout = request_timeout
+        if hedge_after is None and os.environ.get("JOB_SOURCE_HEDGE_AFTER"):
+            hedge_after = float(os.environ["JOB_SOURCE_HEDGE_AFTER"])
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker(self.NAME)
+        self.stats_counters = {"requests": 0, "hedges_sent": 0, "hedge_wins": 0}
+    
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        if not self.breaker.allow():
+            raise SourceUnavailable(f"{self.NAME} circuit open")
+        kwargs.setdefault("timeout", self.request_timeout)
+        try:
+            response = await self._send(url, **kwargs)
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        if response.status_code == 429 or response.status_code >= 500:
+            self.breaker.record_failure(rate_limited=response.status_code == 429)
+        else:
+            self.breaker.record_success()
+        return response
+    
+    async def _send(self, url: str, **kwargs) -> httpx.Response:
+        """Single request, or a hedged pair once hedge_after elapses"""
+        if self.hedge_after is None:
+            return await self._request(url, **kwargs)
+        
+        first = asyncio.ensure_future(self._request(url, **kwargs))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if not done:
+                self.stats_counters["hedges_sent"] += 1
+                tasks.add(asyncio.ensure_future(self._request(url, **kwargs)))
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.stats_counters["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _request(self, url: str, **kwargs) -> httpx.Response:
+        self.stats_counters["requests"] += 1
+        if self.http_client is not None:
+            return await self.http_client.get(url, **kwargs)
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            return await client.get(url, **kwargs)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "request_timeout_seconds": self.request_timeout,
+            "hedge_after_seconds": self.hedge_after,
+            "breaker": self.breaker.snapshot(),
+            **self.stats_counters
+        }
+
 # ============================================
 # JSEARCH API (RapidAPI) - LinkedIn/Indeed/Glassdoor
 # ============================================
 
-class JSearchClient:
+class JSearchClient(SourceClient):
     """
     JSearch API from RapidAPI - Aggregates jobs from LinkedIn, Indeed, Glassdoor, ZipRecruiter
     Free tier: 100 requests/month
     """
     
+    NAME = "jsearch"
     BASE_URL = "https://jsearch.p.rapidapi.com"
+    BASE_URL_ENV = "JSEARCH_BASE_URL"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
         self.api_key = api_key or os.environ.get("RAPIDAPI_KEY", "")
         self.headers = {
             "X-RapidAPI-Key": self.api_key,
             "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
         }
     
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+    
     async def search_jobs(
         self,
         query: str,
@@ -94,9 +517,10 @@ class JSearchClient:
         num_pages: int = 1,
         date_posted: str = "all",  # all, today, 3days, week, month
         remote_only: bool = False,
-        employment_types: Optional[str] = None  # FULLTIME, PARTTIME, CONTRACTOR, INTERN
+        employment_types: Optional[str] = None,  # FULLTIME, PARTTIME, CONTRACTOR, INTERN
+        raise_errors: bool = False
     ) -> List[AggregatedJob]:
-        """Search jobs from JSearch API"""
+        """Search jobs from JSearch API (errors yield [] unless raise_errors)"""
         
         if not self.api_key:
             logger.warning("JSearch API key not configured")
@@ -116,55 +540,60 @@ class JSearchClient:
             if employment_types:
                 params["employment_types"] = employment_types
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/search",
-                    headers=self.headers,
-                    params=params
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"JSearch API error: {response.status_code}")
-                    return []
-                
-                data = response.json()
-                jobs = []
-                
-                for job_data in data.get("data", []):
-                    try:
-                        job = AggregatedJob(
-                            id=f"jsearch_{job_data.get('job_id', '')}",
-                            source="jsearch",
-                            source_job_id=job_data.get("job_id", ""),
-                            title=job_data.get("job_title", ""),
-                            company_name=job_data.get("employer_name", ""),
-                            company_logo=job_data.get("employer_logo"),
-                            location=job_data.get("job_city", "") or job_data.get("job_country", "India"),
-                            is_remote=job_data.get("job_is_remote", False),
-                            country=job_data.get("job_country", "India"),
-                            description=job_data.get("job_description", "")[:2000],
-                            job_type=self._map_employment_type(job_data.get("job_employment_type")),
-                            salary_min=job_data.get("job_min_salary"),
-                            salary_max=job_data.get("job_max_salary"),
-                            salary_currency=job_data.get("job_salary_currency", "INR"),
-                            salary_period=job_data.get("job_salary_period", "yearly"),
-                            required_skills=job_data.get("job_required_skills", []) or [],
-                            required_experience_years=job_data.get("job_required_experience", {}).get("required_experience_in_months", 0) // 12 if job_data.get("job_required_experience") else None,
-                            required_education=job_data.get("job_required_education", {}).get("required_education_level") if job_data.get("job_required_education") else None,
-                            apply_url=job_data.get("job_apply_link", ""),
-                            source_url=job_data.get("job_google_link"),
-                            posted_date=job_data.get("job_posted_at_datetime_utc"),
-                            expires_date=job_data.get("job_offer_expiration_datetime_utc")
-                        )
-                        jobs.append(job)
-                    except Exception as e:
-                        logger.error(f"Error parsing JSearch job: {e}")
-                        continue
-                
-                return jobs
-                
+            response = await self._get(
+                f"{self.base_url}/search",
+                headers=self.headers,
+                params=params
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"JSearch API error: {response.status_code}")
+                if raise_errors:
+                    raise SourceError(f"JSearch API error: {response.status_code}")
+                return []
+            
+            data = response.json()
+            jobs = []
+            
+            for job_data in data.get("data", []):
+                try:
+                    job = AggregatedJob(
+                        id=f"jsearch_{job_data.get('job_id', '')}",
+                        source="jsearch",
+                        source_job_id=job_data.get("job_id", ""),
+                        title=job_data.get("job_title", ""),
+                        company_name=job_data.get("employer_name", ""),
+                        company_logo=job_data.get("employer_logo"),
+                        location=job_data.get("job_city", "") or job_data.get("job_country", "India"),
+                        is_remote=job_data.get("job_is_remote", False),
+                        country=job_data.get("job_country", "India"),
+                        description=job_data.get("job_description", "")[:2000],
+                        job_type=self._map_employment_type(job_data.get("job_employment_type")),
+                        salary_min=job_data.get("job_min_salary"),
+                        salary_max=job_data.get("job_max_salary"),
+                        salary_currency=job_data.get("job_salary_currency", "INR"),
+                        salary_period=job_data.get("job_salary_period", "yearly"),
+                        required_skills=job_data.get("job_required_skills", []) or [],
+                        required_experience_years=job_data.get("job_required_experience", {}).get("required_experience_in_months", 0) // 12 if job_data.get("job_required_experience") else None,
+                        required_education=job_data.get("job_required_education", {}).get("required_education_level") if job_data.get("job_required_education") else None,
+                        apply_url=job_data.get("job_apply_link", ""),
+                        source_url=job_data.get("job_google_link"),
+                        posted_date=job_data.get("job_posted_at_datetime_utc"),
+                        expires_date=job_data.get("job_offer_expiration_datetime_utc")
+                    )
+                    jobs.append(job)
+                except Exception as e:
+                    logger.error(f"Error parsing JSearch job: {e}")
+                    continue
+            
+            return jobs
+            
+        except SourceError:
+            raise
         except Exception as e:
             logger.error(f"JSearch API exception: {e}")
+            if raise_errors:
+                raise
             return []
     
     def _map_employment_type(self, emp_type: Optional[str]) -> str:
@@ -180,18 +609,25 @@ class JSearchClient:
 # ADZUNA API - Official Job Board Aggregator
 # ============================================
 
-class AdzunaClient:
+class AdzunaClient(SourceClient):
     """
     Adzuna API - Official job aggregator for 16+ countries
     Free tier: 1000 requests/month
     """
     
+    NAME = "adzuna"
     BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+    BASE_URL_ENV = "ADZUNA_BASE_URL"
     
-    def __init__(self, app_id: Optional[str] = None, app_key: Optional[str] = None):
+    def __init__(self, app_id: Optional[str] = None, app_key: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
         self.app_id = app_id or os.environ.get("ADZUNA_APP_ID", "")
         self.app_key = app_key or os.environ.get("ADZUNA_APP_KEY", "")
     
+    @property
+    def configured(self) -> bool:
+        return bool(self.app_id and self.app_key)
+    
     async def search_jobs(
         self,
         query: str,
@@ -201,9 +637,10 @@ class AdzunaClient:
         results_per_page: int = 20,
         salary_min: Optional[int] = None,
         full_time: bool = False,
-        part_time: bool = False
+        part_time: bool = False,
+        raise_errors: bool = False
     ) -> List[AggregatedJob]:
-        """Search jobs from Adzuna API"""
+        """Search jobs from Adzuna API (errors yield [] unless raise_errors)"""
         
         if not self.app_id or not self.app_key:
             logger.warning("Adzuna API credentials not configured")
@@ -229,48 +666,53 @@ class AdzunaClient:
             if part_time:
                 params["part_time"] = 1
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/{country}/search/{page}",
-                    params=params
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"Adzuna API error: {response.status_code}")
-                    return []
-                
-                data = response.json()
-                jobs = []
-                
-                for job_data in data.get("results", []):
-                    try:
-                        job = AggregatedJob(
-                            id=f"adzuna_{job_data.get('id', '')}",
-                            source="adzuna",
-                            source_job_id=str(job_data.get("id", "")),
-                            title=job_data.get("title", ""),
-                            company_name=job_data.get("company", {}).get("display_name", ""),
-                            location=job_data.get("location", {}).get("display_name", ""),
-                            is_remote="remote" in job_data.get("title", "").lower(),
-                            country="India",
-                            description=job_data.get("description", "")[:2000],
-                            job_type="full-time",
-                            salary_min=int(job_data.get("salary_min")) if job_data.get("salary_min") else None,
-                            salary_max=int(job_data.get("salary_max")) if job_data.get("salary_max") else None,
-                            salary_currency="INR",
-                            salary_period="yearly",
-                            apply_url=job_data.get("redirect_url", ""),
-                            posted_date=job_data.get("created")
-                        )
-                        jobs.append(job)
-                    except Exception as e:
-                        logger.error(f"Error parsing Adzuna job: {e}")
-                        continue
-                
-                return jobs
-                
+            response = await self._get(
+                f"{self.base_url}/{country}/search/{page}",
+                params=params
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Adzuna API error: {response.status_code}")
+                if raise_errors:
+                    raise SourceError(f"Adzuna API error: {response.status_code}")
+                return []
+            
+            data = response.json()
+            jobs = []
+            
+            for job_data in data.get("results", []):
+                try:
+                    job = AggregatedJob(
+                        id=f"adzuna_{job_data.get('id', '')}",
+                        source="adzuna",
+                        source_job_id=str(job_data.get("id", "")),
+                        title=job_data.get("title", ""),
+                        company_name=job_data.get("company", {}).get("display_name", ""),
+                        location=job_data.get("location", {}).get("display_name", ""),
+                        is_remote="remote" in job_data.get("title", "").lower(),
+                        country="India",
+                        description=job_data.get("description", "")[:2000],
+                        job_type="full-time",
+                        salary_min=int(job_data.get("salary_min")) if job_data.get("salary_min") else None,
+                        salary_max=int(job_data.get("salary_max")) if job_data.get("salary_max") else None,
+                        salary_currency="INR",
+                        salary_period="yearly",
+                        apply_url=job_data.get("redirect_url", ""),
+                        posted_date=job_data.get("created")
+                    )
+                    jobs.append(job)
+                except Exception as e:
+                    logger.error(f"Error parsing Adzuna job: {e}")
+                    continue
+            
+            return jobs
+            
+        except SourceError:
+            raise
         except Exception as e:
             logger.error(f"Adzuna API exception: {e}")
+            if raise_errors:
+                raise
             return []
 
 # ============================================
@@ -445,9 +887,93 @@ class JobAggregatorService:
     Unified service to fetch jobs from multiple sources
     """
     
-    def __init__(self):
+    def __init__(self, budget: Optional[float] = None):
         self.jsearch = JSearchClient()
         self.adzuna = AdzunaClient()
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.cache = SearchResultCache()
+        # Latency budget per search; sources answering later are left out of that response
+        self.budget = budget if budget is not None else float(os.environ.get("JOB_SOURCE_BUDGET_SECONDS", "1.5"))
+        self.budget_overruns: Dict[str, int] = {}
+        self.dedup_counters = {"exact": 0, "near": 0}
+        # Provider calls outliving their request (over budget, or stream client went away);
+        # they still finish and fill the search cache
+        self._background: set = set()
+    
+    @property
+    def sources(self) -> List[SourceClient]:
+        return [self.jsearch, self.adzuna]
+    
+    async def startup(self, **client_kwargs):
+        """Create the shared pooled HTTP client (FastAPI startup)"""
+        if self.http_client is None:
+            self.http_client = create_http_client(**client_kwargs)
+            for source in self.sources:
+                source.http_client = self.http_client
+            logger.info(f"Job aggregator HTTP client ready (http2={client_kwargs.get('http2', HAS_HTTP2)})")
+    
+    async def close(self):
+        """Stop cache refreshes and close pooled connections (FastAPI shutdown)"""
+        await self.cache.close()
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        if self.http_client is not None:
+            for source in self.sources:
+                source.http_client = None
+            await self.http_client.aclose()
+            self.http_client = None
+    
+    def _source_fetches(self, query: str, location: str, page: int) -> Dict[str, Awaitable[List[AggregatedJob]]]:
+        """Cached fetch per configured source (upstream errors raise, so they aren't cached)"""
+        fetches = {}
+        
+        # JSearch (LinkedIn/Indeed/Glassdoor)
+        if self.jsearch.api_key:
+            fetches["jsearch"] = self.cache.get_or_fetch(
+                search_cache_key("jsearch", query, location, page),
+                lambda: self.jsearch.search_jobs(query, location, page, raise_errors=True)
+            )
+        
+        # Adzuna (always fetches its first page)
+        if self.adzuna.app_id:
+            fetches["adzuna"] = self.cache.get_or_fetch(
+                search_cache_key("adzuna", query, location, 1),
+                lambda: self.adzuna.search_jobs(query, location, raise_errors=True)
+            )
+        
+        return fetches
+    
+    def _sample_jobs(self, query: str) -> List[AggregatedJob]:
+        """Sample jobs matching the query, or all samples when none match"""
+        query_lower = query.lower()
+        filtered_samples = [
+            job for job in SAMPLE_INDIAN_JOBS
+            if query_lower in job.title.lower() 
+            or query_lower in job.description.lower()
+            or any(query_lower in skill.lower() for skill in job.required_skills)
+        ]
+        
+        # If no matches, return all samples
+        return filtered_samples or SAMPLE_INDIAN_JOBS
+    
+    def _count_duplicates(self, dedup: JobDeduplicator):
+        self.dedup_counters["exact"] += dedup.exact_duplicates
+        self.dedup_counters["near"] += dedup.near_duplicates
+    
+    def _start_fetches(self, query: str, location: str, page: int) -> Dict[asyncio.Task, str]:
+        """Start every source fetch as a task (task -> source name)"""
+        tasks = {}
+        for source, fetch in self._source_fetches(query, location, page).items():
+            task = asyncio.ensure_future(fetch)
+            tasks[task] = source
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return tasks
+    
+    def _record_overrun(self, source: str):
+        self.budget_overruns[source] = self.budget_overruns.get(source, 0) + 1
+        logger.warning(f"Job source {source} exceeded the {self.budget}s budget, dropped from response")
     
     async def search_all_sources(
         self,
@@ -458,58 +984,89 @@ class JobAggregatorService:
     ) -> List[AggregatedJob]:
         """
         Search jobs from all configured sources
-        Returns combined list of jobs
+        Returns combined list of jobs (sources slower than the budget are left out)
         """
         
         all_jobs = []
         
         # Fetch from multiple sources in parallel
-        tasks = []
-        
-        # JSearch (LinkedIn/Indeed/Glassdoor)
-        if self.jsearch.api_key:
-            tasks.append(self.jsearch.search_jobs(query, location, page))
-        
-        # Adzuna
-        if self.adzuna.app_id:
-            tasks.append(self.adzuna.search_jobs(query, location))
+        tasks = self._start_fetches(query, location, page)
         
         # Execute all API calls
         if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for result in results:
-                if isinstance(result, list):
-                    all_jobs.extend(result)
-                elif isinstance(result, Exception):
-                    logger.error(f"Job fetch error: {result}")
+            done, late = await asyncio.wait(tasks, timeout=self.budget)
+            for task, source in tasks.items():
+                if task in late:
+                    self._record_overrun(source)
+                elif task.exception() is not None:
+                    logger.error(f"Job fetch error: {task.exception()}")
+                else:
+                    all_jobs.extend(task.result())
         
         # Add sample jobs if no external results or for demo
         if include_sample or len(all_jobs) == 0:
-            # Filter sample jobs by query
-            query_lower = query.lower()
-            filtered_samples = [
-                job for job in SAMPLE_INDIAN_JOBS
-                if query_lower in job.title.lower() 
-                or query_lower in job.description.lower()
-                or any(query_lower in skill.lower() for skill in job.required_skills)
-            ]
-            
-            # If no matches, return all samples
-            if not filtered_samples:
-                filtered_samples = SAMPLE_INDIAN_JOBS
-            
-            all_jobs.extend(filtered_samples)
+            all_jobs.extend(self._sample_jobs(query))
+        
+        # Remove exact (title + company) and near duplicates, recording merged sources
+        # on copies so cached jobs stay untouched
+        dedup = JobDeduplicator()
+        unique_jobs = dedup.filter(all_jobs)
+        self._count_duplicates(dedup)
+        return [
+            job.model_copy(update={"merged_sources": dedup.merged[job.id]}) if job.id in dedup.merged else job
+            for job in unique_jobs
+        ]
+    
+    async def stream_all_sources(
+        self,
+        query: str,
+        location: str = "India",
+        page: int = 1,
+        include_sample: bool = True
+    ) -> AsyncIterator[Tuple[str, List[AggregatedJob]]]:
+        """
+        Like search_all_sources, but yields (source, new jobs) batches as they arrive:
+        sample jobs first, then each provider as soon as its call completes, within the
+        same budget. Exact and near duplicates of jobs already yielded are dropped. Without
+        include_sample, samples are only yielded at the end when no provider returned anything.
+        Provider calls keep running if the consumer stops early, so their results still
+        land in the search cache.
+        """
+        dedup = JobDeduplicator()
+        external_count = 0
+        
+        if include_sample:
+            yield "internal", dedup.filter(self._sample_jobs(query))
         
-        # Remove duplicates by title + company
-        seen = set()
-        unique_jobs = []
-        for job in all_jobs:
-            key = f"{job.title}_{job.company_name}".lower()
-            if key not in seen:
-                seen.add(key)
-                unique_jobs.append(job)
+        tasks = self._start_fetches(query, location, page)
+        deadline = asyncio.get_running_loop().time() + self.budget
+        pending = set(tasks)
+        while pending:
+            remaining = deadline - asyncio.get_running_loop().time()
+            done, pending = await asyncio.wait(pending, timeout=max(0.0, remaining), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                for task in pending:
+                    self._record_overrun(tasks[task])
+                break
+            for task in done:
+                if task.exception() is not None:
+                    logger.error(f"Job fetch error ({tasks[task]}): {task.exception()}")
+                    yield tasks[task], []
+                    continue
+                jobs = task.result()
+                external_count += len(jobs)
+                yield tasks[task], dedup.filter(jobs)
         
-        return unique_jobs
+        if not include_sample and external_count == 0:
+            yield "internal", dedup.filter(self._sample_jobs(query))
+        self._count_duplicates(dedup)
+    
+    def source_stats(self) -> Dict[str, Any]:
+        """Per-source breaker state, hedging and budget overruns"""
+        return {
+            source.NAME: {**source.stats(), "budget_overruns": self.budget_overruns.get(source.NAME, 0)}
+            for source in self.sources
+        }
     
     async def get_jobs_for_profile(
         self,
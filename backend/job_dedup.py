@@ -0,0 +1,214 @@
+# ============================================
+# JOB DEDUP - Near-duplicate detection across sources
+# MinHash over word shingles + LSH banding
+# ============================================
+
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet
+from collections import OrderedDict
+import random
+import re
+import zlib
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    np = None
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Spelling variants seen across LinkedIn / Indeed / Adzuna copies of one posting
+TOKEN_ALIASES = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "mgr": "manager", "exec": "executive",
+    "eng": "engineer", "engg": "engineering", "dev": "developer", "asst": "assistant",
+    "bangalore": "bengaluru", "bombay": "mumbai", "gurgaon": "gurugram"
+}
+COMPANY_SUFFIXES = {"ltd", "limited", "pvt", "private", "inc", "llp", "llc", "co", "corp", "corporation", "india", "the"}
+
+# Only the start of the description: providers truncate differently (Adzuna sends snippets)
+DESCRIPTION_WORDS = 50
+
+# Largest prime below 2^32: with a, b, x < 2^32, a*x + b stays inside uint64
+HASH_PRIME = 4294967291
+
+def tokens(text: str) -> List[str]:
+    return [TOKEN_ALIASES.get(t, t) for t in TOKEN_RE.findall((text or "").lower())]
+
+def company_key(company: str) -> str:
+    return " ".join(t for t in tokens(company) if t not in COMPANY_SUFFIXES)
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+class JobFingerprint:
+    """MinHash signature of a job plus the fields used to verify LSH candidates"""
+
+    __slots__ = ("signature", "title_tokens", "company")
+
+    def __init__(self, signature: Tuple[int, ...], title_tokens: FrozenSet[str], company: str):
+        self.signature = signature
+        self.title_tokens = title_tokens
+        self.company = company
+
+class MinHasher:
+    """num_perm universal hash permutations (a*x + b) mod p over crc32 shingle ids"""
+
+    def __init__(self, num_perm: int = 60, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.a = [rng.randrange(1, HASH_PRIME) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, HASH_PRIME) for _ in range(num_perm)]
+        if HAS_NUMPY:
+            self._a = np.array(self.a, dtype=np.uint64)[:, None]
+            self._b = np.array(self.b, dtype=np.uint64)[:, None]
+
+    def signature(self, shingles: List[str]) -> Tuple[int, ...]:
+        if not shingles:
+            return (HASH_PRIME,) * self.num_perm
+        ids = [zlib.crc32(s.encode()) for s in shingles]
+        if HAS_NUMPY:
+            x = np.array(ids, dtype=np.uint64)[None, :]
+            return tuple(((self._a * x + self._b) % np.uint64(HASH_PRIME)).min(axis=1).tolist())
+        return tuple(min((a * x + b) % HASH_PRIME for x in ids) for a, b in zip(self.a, self.b))
+
+class NearDuplicateDetector:
+    """
+    Streaming near-duplicate detector for job postings
+    - shingles: word bigrams of normalized title, company, location and the first
+      DESCRIPTION_WORDS description words
+    - LSH: bands x rows signature slices; a candidate shares at least one band bucket
+    - verify: estimated Jaccard >= threshold, same normalized company, and title token
+      Jaccard >= title_threshold (so one employer's boilerplate doesn't merge different roles)
+    O(bands) per job; at most max_items jobs are remembered (oldest forgotten first).
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 60,
+        bands: int = 20,
+        threshold: float = 0.4,
+        title_threshold: float = 0.5,
+        max_items: int = 10000,
+        hasher: Optional[MinHasher] = None
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.hasher = hasher or MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.title_threshold = title_threshold
+        self.max_items = max_items
+
+        self._buckets: List[Dict[Tuple[int, ...], List[str]]] = [{} for _ in range(bands)]
+        self._items: "OrderedDict[str, JobFingerprint]" = OrderedDict()
+        self.stats_counters = {"added": 0, "duplicates": 0, "candidates_checked": 0, "evictions": 0}
+
+    def fingerprint(self, title: str, company: str, location: str = "", description: str = "") -> JobFingerprint:
+        words = tokens(title) + tokens(company) + tokens(location) + tokens(description)[:DESCRIPTION_WORDS]
+        shingles = [f"{a} {b}" for a, b in zip(words, words[1:])] or words
+        return JobFingerprint(self.hasher.signature(shingles), frozenset(tokens(title)), company_key(company))
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+
+    def similarity(self, a: JobFingerprint, b: JobFingerprint) -> float:
+        """Estimated Jaccard similarity of the shingle sets"""
+        return sum(x == y for x, y in zip(a.signature, b.signature)) / len(a.signature)
+
+    def is_duplicate(self, a: JobFingerprint, b: JobFingerprint) -> bool:
+        return (
+            a.company == b.company
+            and jaccard(a.title_tokens, b.title_tokens) >= self.title_threshold
+            and self.similarity(a, b) >= self.threshold
+        )
+
+    def find(self, fingerprint: JobFingerprint, exclude: Optional[str] = None) -> Optional[str]:
+        """Key of a remembered near-duplicate, if any"""
+        checked = {exclude}
+        for band, band_key in enumerate(self._band_keys(fingerprint.signature)):
+            for key in self._buckets[band].get(band_key, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                self.stats_counters["candidates_checked"] += 1
+                if self.is_duplicate(fingerprint, self._items[key]):
+                    return key
+        return None
+
+    def add(self, key: str, fingerprint: JobFingerprint) -> Optional[str]:
+        """
+        Remember a job; returns the key of the near-duplicate it matched instead (the job
+        is then not remembered)
+        """
+        duplicate_of = self.find(fingerprint, exclude=key)
+        if duplicate_of is not None:
+            self.stats_counters["duplicates"] += 1
+            return duplicate_of
+        if key in self._items:
+            self.remove(key)
+        self._items[key] = fingerprint
+        for band, band_key in enumerate(self._band_keys(fingerprint.signature)):
+            self._buckets[band].setdefault(band_key, []).append(key)
+        self.stats_counters["added"] += 1
+        while len(self._items) > self.max_items:
+            self.remove(next(iter(self._items)))
+            self.stats_counters["evictions"] += 1
+        return None
+
+    def remove(self, key: str):
+        fingerprint = self._items.pop(key, None)
+        if fingerprint is None:
+            return
+        for band, band_key in enumerate(self._band_keys(fingerprint.signature)):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._items), "max_items": self.max_items, **self.stats_counters}
+
+class JobDeduplicator:
+    """
+    Per-search dedup of AggregatedJobs. A repeated job id is an exact duplicate; anything
+    else goes through the near-duplicate detector (title + company alone is not a key: one
+    employer posts the same title in several cities). merged maps a kept job id to the
+    sources of the copies folded into it.
+    """
+
+    def __init__(self, detector: Optional[NearDuplicateDetector] = None):
+        self.detector = detector or NearDuplicateDetector(max_items=1000)
+        self.seen: set = set()
+        self.merged: Dict[str, List[str]] = {}
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+
+    def _merge(self, kept_id: str, job):
+        sources = self.merged.setdefault(kept_id, [])
+        if job.source not in sources:
+            sources.append(job.source)
+
+    def filter(self, jobs: List[Any]) -> List[Any]:
+        """Jobs not seen before (exactly or nearly), in order"""
+        unique = []
+        for job in jobs:
+            if job.id in self.seen:
+                self.exact_duplicates += 1
+                continue
+            fingerprint = self.detector.fingerprint(job.title, job.company_name, job.location, job.description)
+            kept_id = self.detector.add(job.id, fingerprint)
+            if kept_id is not None:
+                self.near_duplicates += 1
+                self._merge(kept_id, job)
+                continue
+            self.seen.add(job.id)
+            unique.append(job)
+        return unique
@@ -0,0 +1,352 @@
+# ============================================
+# JOB SKILL INDEX - Candidate pre-filtering
+# Inverted index: normalized skill/keyword -> job ids
+# ============================================
+
+from typing import List, Dict, Any, Set, Iterable, Optional
+from collections import OrderedDict
+import asyncio
+import random
+import re
+import logging
+
+from ai_matcher import ai_matcher, AIJobMatcher, ProfileMatchInput
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+
+# Posting for jobs without required skills: they score 50 on skills for profiles without skills
+NO_REQUIRED_SKILLS = "__no_required_skills__"
+
+# Words too common to narrow anything down
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+    "on", "or", "our", "the", "to", "we", "with", "you", "your", "will", "work", "team", "job"
+}
+
+def tokenize(text: str) -> Set[str]:
+    """Distinct word tokens of already-lowercased text, minus stopwords"""
+    return {t for t in TOKEN_RE.findall(text) if len(t) > 1 and t not in STOPWORDS}
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class JobSkillIndex:
+    """
+    In-memory inverted index used to skip scoring jobs that share nothing with a profile
+
+    A job is a candidate for a profile when they share at least one term:
+    - job terms: words of title/description, required skills (phrase + words) and the
+      matcher's SKILL_KEYWORDS / INTEREST_TO_JOB_TYPE keyword hits
+    - profile terms: skills (phrase + words), indexed required-skill phrases that contain or
+      are contained in a skill (the matcher's direct comparison), keywords of the skill's
+      categories and keywords of interests >= 50
+    - jobs without required skills are also candidates when a profile skill is a substring
+      of their title/description (the matcher's text scan), found via a trigram index
+    Non-candidates are pruned except for a bounded random exploration sample.
+    Feeds from 30 jobs are pruned (the live feed is ~40: 8 samples plus one page per
+    source); min_candidates defaults to the /jobs/match top-k, since below it the top-k
+    would be filled with unrelated jobs ranked on level and salary alone.
+    """
+
+    def __init__(
+        self,
+        matcher: AIJobMatcher = ai_matcher,
+        max_jobs: int = 20000,
+        exploration_sample: int = 10,
+        min_jobs_to_prune: int = 30,
+        min_candidates: int = 20,
+        shadow_rate: float = 0.05
+    ):
+        self.matcher = matcher
+        self.max_jobs = max_jobs
+        self.exploration_sample = exploration_sample
+        self.min_jobs_to_prune = min_jobs_to_prune
+        self.min_candidates = min_candidates
+        self.shadow_rate = shadow_rate
+
+        self._postings: Dict[str, Set[str]] = {}
+        # required-skill phrase -> number of indexed jobs listing it
+        self._skill_phrases: Dict[str, int] = {}
+        # character trigram -> indexed phrases containing it (for "skill in phrase" lookups)
+        self._phrase_grams: Dict[str, Set[str]] = {}
+        # phrase lengths present, to bound the "phrase in skill" substring enumeration
+        self._phrase_lengths: Dict[int, int] = {}
+        # jobs without required skills: id -> job text, and trigram -> ids (for "skill in text")
+        self._text_jobs: Dict[str, str] = {}
+        self._text_grams: Dict[str, Set[str]] = {}
+        # in-flight shadow recall checks (strong references until they finish)
+        self._shadow_tasks: Set[asyncio.Task] = set()
+        # job id -> (content hash, terms, skill phrases); insertion order = eviction order
+        self._jobs: "OrderedDict[str, tuple]" = OrderedDict()
+
+        self.stats_counters = {
+            "jobs_indexed": 0,
+            "jobs_evicted": 0,
+            "queries": 0,
+            "term_lookups": 0,
+            "term_hits": 0,
+            "jobs_considered": 0,
+            "candidates": 0,
+            "explored": 0,
+            "pruned": 0,
+            "shadow_checks": 0,
+            "shadow_recall_sum": 0.0
+        }
+
+    # ---------- Ingestion ----------
+
+    def job_terms(self, job: Dict[str, Any]) -> Set[str]:
+        features = self.matcher.get_job_features(job)
+        terms = tokenize(features.job_text)
+        for skill in features.required_skills_lower:
+            terms.add(skill)
+            terms |= tokenize(skill)
+        if not features.required_skills_lower:
+            terms.add(NO_REQUIRED_SKILLS)
+        terms |= features.keyword_hits.all()
+        return terms
+
+    def add_job(self, job: Dict[str, Any]):
+        """Index a job (re-indexes when its content changed)"""
+        job_id = job.get("id")
+        if not job_id:
+            return
+        content_hash = self.matcher.get_job_features(job).content_hash
+        existing = self._jobs.get(job_id)
+        if existing is not None:
+            if existing[0] == content_hash:
+                self._jobs.move_to_end(job_id)
+                return
+            self.remove_job(job_id)
+
+        terms = self.job_terms(job)
+        for term in terms:
+            self._postings.setdefault(term, set()).add(job_id)
+        phrases = set(self.matcher.get_job_features(job).required_skills_lower)
+        for phrase in phrases:
+            self._add_phrase(phrase)
+        if not phrases:
+            job_text = self.matcher.get_job_features(job).job_text
+            self._text_jobs[job_id] = job_text
+            for gram in trigrams(job_text):
+                self._text_grams.setdefault(gram, set()).add(job_id)
+        self._jobs[job_id] = (content_hash, terms, phrases)
+        self.stats_counters["jobs_indexed"] += 1
+
+        while len(self._jobs) > self.max_jobs:
+            oldest = next(iter(self._jobs))
+            self.remove_job(oldest)
+            self.stats_counters["jobs_evicted"] += 1
+
+    def add_jobs(self, jobs: Iterable[Dict[str, Any]]):
+        for job in jobs:
+            self.add_job(job)
+
+    def remove_job(self, job_id: str):
+        entry = self._jobs.pop(job_id, None)
+        if entry is None:
+            return
+        for term in entry[1]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(job_id)
+                if not postings:
+                    del self._postings[term]
+        for phrase in entry[2]:
+            self._remove_phrase(phrase)
+        job_text = self._text_jobs.pop(job_id, None)
+        if job_text is not None:
+            for gram in trigrams(job_text):
+                ids = self._text_grams[gram]
+                ids.discard(job_id)
+                if not ids:
+                    del self._text_grams[gram]
+
+    def _add_phrase(self, phrase: str):
+        count = self._skill_phrases.get(phrase, 0)
+        self._skill_phrases[phrase] = count + 1
+        if count:
+            return
+        self._phrase_lengths[len(phrase)] = self._phrase_lengths.get(len(phrase), 0) + 1
+        for gram in trigrams(phrase):
+            self._phrase_grams.setdefault(gram, set()).add(phrase)
+
+    def _remove_phrase(self, phrase: str):
+        self._skill_phrases[phrase] -= 1
+        if self._skill_phrases[phrase]:
+            return
+        del self._skill_phrases[phrase]
+        self._phrase_lengths[len(phrase)] -= 1
+        if not self._phrase_lengths[len(phrase)]:
+            del self._phrase_lengths[len(phrase)]
+        for gram in trigrams(phrase):
+            phrases = self._phrase_grams[gram]
+            phrases.discard(phrase)
+            if not phrases:
+                del self._phrase_grams[gram]
+
+    # ---------- Lookup ----------
+
+    def related_phrases(self, skill_lower: str) -> Set[str]:
+        """Indexed required-skill phrases that contain, or are contained in, the skill"""
+        # phrase in skill: look up the skill's substrings of indexed lengths
+        related = {
+            skill_lower[i:i + length]
+            for length in self._phrase_lengths if length <= len(skill_lower)
+            for i in range(len(skill_lower) - length + 1)
+        }
+        related &= self._skill_phrases.keys()
+        # skill in phrase: phrases sharing every trigram of the skill, then verified
+        grams = trigrams(skill_lower)
+        if not grams:  # 1-2 character skills
+            related.update(p for p in self._skill_phrases if skill_lower in p)
+            return related
+        postings = sorted((self._phrase_grams.get(gram, ()) for gram in grams), key=len)
+        if postings[0]:
+            related.update(p for p in set(postings[0]).intersection(*postings[1:]) if skill_lower in p)
+        return related
+
+    def text_matches(self, skill_lower: str) -> Set[str]:
+        """Ids of jobs without required skills whose text contains the skill"""
+        grams = trigrams(skill_lower)
+        if not grams:  # 1-2 character skills
+            return {job_id for job_id, text in self._text_jobs.items() if skill_lower in text}
+        postings = sorted((self._text_grams.get(gram, ()) for gram in grams), key=len)
+        if not postings[0]:
+            return set()
+        return {
+            job_id for job_id in set(postings[0]).intersection(*postings[1:])
+            if skill_lower in self._text_jobs[job_id]
+        }
+
+    def profile_terms(self, profile: ProfileMatchInput) -> Set[str]:
+        terms: Set[str] = set()
+        if not profile.skills:
+            terms.add(NO_REQUIRED_SKILLS)
+        for skill in profile.skills:
+            skill_lower = skill.lower()
+            terms.add(skill_lower)
+            terms |= tokenize(skill_lower)
+            terms |= self.related_phrases(skill_lower)
+            for keywords in self.matcher.skill_categories(skill_lower):
+                terms.update(keywords)
+        for interest, score in profile.career_interests.items():
+            if score >= 50:
+                terms.update(self.matcher.INTEREST_TO_JOB_TYPE.get(interest, []))
+        return terms
+
+    def candidate_ids(self, profile: ProfileMatchInput) -> Set[str]:
+        """Ids of indexed jobs sharing at least one term with the profile"""
+        candidates: Set[str] = set()
+        for term in self.profile_terms(profile):
+            self.stats_counters["term_lookups"] += 1
+            postings = self._postings.get(term)
+            if postings:
+                self.stats_counters["term_hits"] += 1
+                candidates |= postings
+        for skill in profile.skills:
+            candidates |= self.text_matches(skill.lower())
+        return candidates
+
+    def select_candidates(self, profile: ProfileMatchInput, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Subset of jobs worth scoring for the profile (feed order preserved)
+        Jobs are indexed on the way in. Small feeds, profiles with no skills and interests,
+        and profiles matching fewer than min_candidates jobs (nothing to rank by but level and
+        salary) are returned unpruned.
+        """
+        self.add_jobs(jobs)
+        self.stats_counters["queries"] += 1
+        self.stats_counters["jobs_considered"] += len(jobs)
+
+        if len(jobs) < self.min_jobs_to_prune or not (profile.skills or profile.career_interests):
+            self.stats_counters["candidates"] += len(jobs)
+            return jobs
+
+        candidate_ids = self.candidate_ids(profile)
+        rest = [i for i, job in enumerate(jobs) if job.get("id") not in candidate_ids]
+        if len(jobs) - len(rest) < self.min_candidates:
+            self.stats_counters["candidates"] += len(jobs)
+            return jobs
+
+        # Exploration: a few pruned jobs still get scored
+        explore = set(random.sample(rest, min(self.exploration_sample, len(rest))))
+        selected = [job for i, job in enumerate(jobs) if i in explore or job.get("id") in candidate_ids]
+
+        self.stats_counters["candidates"] += len(selected) - len(explore)
+        self.stats_counters["explored"] += len(explore)
+        self.stats_counters["pruned"] += len(jobs) - len(selected)
+        return selected
+
+    def maybe_check_recall(
+        self,
+        profile: ProfileMatchInput,
+        jobs: List[Dict[str, Any]],
+        selected: List[Dict[str, Any]],
+        top_k: int
+    ) -> Optional[asyncio.Task]:
+        """
+        With probability shadow_rate, compare pruned top-k against full scoring in a
+        worker thread, off the request path (call from a running event loop)
+        """
+        if len(selected) == len(jobs) or random.random() >= self.shadow_rate:
+            return None
+        task = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(self.record_recall, profile, jobs, selected, top_k, False)
+        )
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_done)
+        return task
+
+    def _shadow_done(self, task: asyncio.Task):
+        self._shadow_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Job index shadow check failed: {task.exception()}")
+
+    def record_recall(
+        self,
+        profile: ProfileMatchInput,
+        jobs: List[Dict[str, Any]],
+        selected: List[Dict[str, Any]],
+        top_k: int,
+        use_feature_cache: bool = True
+    ) -> float:
+        """
+        Fraction of the full top-k that pruned scoring also finds
+        Compared by score so equally-scored jobs swapping places don't count as misses.
+        use_feature_cache=False builds job features privately (safe in a worker thread).
+        """
+        def scores(batch):
+            if use_feature_cache:
+                return self.matcher.score_jobs_for_profile(profile, batch)
+            return [self.matcher.score_job_to_profile(profile, job, self.matcher.build_job_features(job)) for job in batch]
+
+        full_top = sorted(scores(jobs), reverse=True)[:top_k]
+        if not full_top:
+            return 1.0
+        pruned_top = sorted(scores(selected), reverse=True)[:top_k]
+        found = sum(1 for a, b in zip(full_top, pruned_top) if b >= a)
+        recall = found / len(full_top)
+
+        self.stats_counters["shadow_checks"] += 1
+        self.stats_counters["shadow_recall_sum"] += recall
+        if recall < 1.0:
+            logger.info(f"Job index shadow check: top-{top_k} recall {recall:.2f}")
+        return recall
+
+    def stats(self) -> Dict[str, Any]:
+        c = self.stats_counters
+        return {
+            "indexed_jobs": len(self._jobs),
+            "terms": len(self._postings),
+            "max_jobs": self.max_jobs,
+            **{k: v for k, v in c.items() if k != "shadow_recall_sum"},
+            "term_hit_rate": round(c["term_hits"] / c["term_lookups"], 4) if c["term_lookups"] else 0.0,
+            "pruned_fraction": round(c["pruned"] / c["jobs_considered"], 4) if c["jobs_considered"] else 0.0,
+            "shadow_top_k_recall": round(c["shadow_recall_sum"] / c["shadow_checks"], 4) if c["shadow_checks"] else None
+        }
+
+# Singleton instance
+job_index = JobSkillIndex()
@@ -0,0 +1,324 @@
+# ============================================
+# JOB INGESTION - Background materialization of external jobs
+# Pulls configured searches from JSearch/Adzuna into aggregated_jobs
+# ============================================
+
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timezone, timedelta
+from pymongo import IndexModel, UpdateOne, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+import asyncio
+import logging
+import os
+import re
+import time
+
+from job_aggregator import JobAggregatorService, AggregatedJob, SourceClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INGEST_QUERIES = [
+    "software developer", "data analyst", "sales executive", "marketing",
+    "fashion designer", "nurse", "teacher", "accountant", "delivery driver"
+]
+DEFAULT_INGEST_LOCATIONS = ["India"]
+
+# Free-tier requests per month (JOB_INGEST_QUOTA_<SOURCE> overrides)
+SOURCE_MONTHLY_QUOTAS = {"jsearch": 100, "adzuna": 1000}
+# Share of each quota the worker may spend; the rest stays available for live searches
+DEFAULT_QUOTA_SHARE = 0.5
+MONTH_SECONDS = 30 * 24 * 3600
+
+AGGREGATED_JOB_INDEXES = [
+    IndexModel([("source", 1), ("source_job_id", 1)], unique=True, name="source_job_key"),
+    IndexModel([("expires_at", 1)], expireAfterSeconds=0, name="expires_at_ttl"),
+    IndexModel([("ingested_at", -1)], name="ingested_recent"),
+    IndexModel([("title", TEXT), ("company_name", TEXT)], weights={"title": 10, "company_name": 5}, name="aggregated_jobs_text"),
+]
+
+def env_list(name: str, default: List[str]) -> List[str]:
+    value = os.environ.get(name, "")
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    return items or default
+
+def parse_expiry(expires_date: Optional[str]) -> Optional[datetime]:
+    """Provider expiry timestamp (ISO 8601, 'Z' allowed) as aware UTC datetime"""
+    if not expires_date:
+        return None
+    try:
+        parsed = datetime.fromisoformat(expires_date.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def source_quotas() -> Dict[str, int]:
+    return {
+        name: int(os.environ.get(f"JOB_INGEST_QUOTA_{name.upper()}", quota))
+        for name, quota in SOURCE_MONTHLY_QUOTAS.items()
+    }
+
+async def search_ingested(
+    collection,
+    query: str = "",
+    location: str = "",
+    source: Optional[str] = None,
+    limit: int = 50
+) -> List[Dict[str, Any]]:
+    """
+    Unexpired ingested jobs, newest first; a query goes through the aggregated_jobs_text
+    index (ranked by relevance), falling back to an escaped title regex without it
+    """
+    filters: Dict[str, Any] = {"expires_at": {"$gt": datetime.now(timezone.utc)}}
+    if location:
+        filters["location"] = {"$regex": re.escape(location), "$options": "i"}
+    if source:
+        filters["source"] = source
+    if query:
+        score = {"$meta": "textScore"}
+        try:
+            jobs = await (
+                collection.find({**filters, "$text": {"$search": query}}, {"_id": 0, "score": score})
+                .sort([("score", score), ("ingested_at", DESCENDING)])
+                .limit(limit)
+                .to_list(limit)
+            )
+            for job in jobs:
+                job.pop("score", None)
+            return jobs
+        except OperationFailure as e:
+            if e.code != 27:  # IndexNotFound
+                raise
+            logger.warning("aggregated_jobs_text index missing, falling back to regex search")
+        filters["title"] = {"$regex": re.escape(query), "$options": "i"}
+    return await collection.find(filters, {"_id": 0}).sort("ingested_at", DESCENDING).limit(limit).to_list(limit)
+
+class JobIngestionWorker:
+    """
+    Periodically runs every (query, location) target against each configured source and
+    bulk-upserts the normalized AggregatedJobs into aggregated_jobs
+    - key: (source, source_job_id), so re-ingesting a job updates it in place
+    - expires_at from expires_date (default_ttl_days when the provider gives none);
+      a TTL index removes expired jobs
+    Sources are called directly (not through the search cache or latency budget) but
+    still through their circuit breakers.
+    The scheduled loop wakes every interval seconds and only calls a source once its own
+    source_interval has passed: enough time that targets x runs stays within quota_share
+    of the source's monthly quota (defaults: 9 targets -> JSearch every 5.4 days, Adzuna
+    every 13h, rounded up to the next wake-up). Manual run_once() calls every source.
+    """
+
+    def __init__(
+        self,
+        aggregator: JobAggregatorService,
+        collection=None,
+        queries: Optional[List[str]] = None,
+        locations: Optional[List[str]] = None,
+        interval: float = 6 * 3600,
+        default_ttl_days: int = 30,
+        on_ingested=None,
+        quotas: Optional[Dict[str, int]] = None,
+        quota_share: float = DEFAULT_QUOTA_SHARE
+    ):
+        self.aggregator = aggregator
+        self.collection = collection
+        self.queries = queries or env_list("JOB_INGEST_QUERIES", DEFAULT_INGEST_QUERIES)
+        self.locations = locations or env_list("JOB_INGEST_LOCATIONS", DEFAULT_INGEST_LOCATIONS)
+        self.interval = interval
+        self.default_ttl_days = default_ttl_days
+        # Called with each batch of upserted jobs (e.g. to feed the skill index)
+        self.on_ingested = on_ingested
+        self.quotas = source_quotas() if quotas is None else quotas
+        self.quota_share = quota_share
+        # source name -> epoch seconds of its last ingestion call
+        self.last_source_run: Dict[str, float] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.last_run: Optional[Dict[str, Any]] = None
+        self.stats_counters = {"runs": 0, "fetched": 0, "upserted": 0, "modified": 0, "errors": 0}
+
+    @property
+    def targets(self) -> List[Tuple[str, str]]:
+        return [(query, location) for query in self.queries for location in self.locations]
+
+    async def ensure_indexes(self):
+        await self.collection.create_indexes(AGGREGATED_JOB_INDEXES)
+
+    # ---------- Quota budget ----------
+
+    def source_interval(self, source: SourceClient) -> float:
+        """Seconds between scheduled runs of source, so ingestion stays within its quota share"""
+        quota = self.quotas.get(source.NAME)
+        if not quota:
+            return self.interval
+        return max(self.interval, MONTH_SECONDS * len(self.targets) / (quota * self.quota_share))
+
+    def due_sources(self, now: Optional[float] = None) -> List[SourceClient]:
+        now = time.time() if now is None else now
+        return [
+            source for source in self.aggregator.sources
+            if source.configured and now - self.last_source_run.get(source.NAME, float("-inf")) >= self.source_interval(source)
+        ]
+
+    async def load_last_runs(self):
+        """Last ingestion per source from aggregated_jobs, so restarts don't re-spend quota"""
+        for source in self.aggregator.sources:
+            doc = await self.collection.find_one(
+                {"source": source.NAME}, {"ingested_at": 1}, sort=[("ingested_at", DESCENDING)]
+            )
+            if doc:
+                ingested_at = doc["ingested_at"]
+                if ingested_at.tzinfo is None:
+                    ingested_at = ingested_at.replace(tzinfo=timezone.utc)
+                self.last_source_run.setdefault(source.NAME, ingested_at.timestamp())
+
+    # ---------- Fetch + normalize ----------
+
+    async def _fetch_source(self, source: SourceClient, query: str, location: str) -> List[AggregatedJob]:
+        if not source.configured:
+            return []
+        return await source.search_jobs(query, location)
+
+    def build_upserts(self, jobs: List[AggregatedJob], now: Optional[datetime] = None) -> List[UpdateOne]:
+        """One upsert per (source, source_job_id); later duplicates in the batch win"""
+        now = now or datetime.now(timezone.utc)
+        default_expiry = now + timedelta(days=self.default_ttl_days)
+        by_key: Dict[Tuple[str, str], AggregatedJob] = {}
+        for job in jobs:
+            if job.source_job_id:
+                by_key[(job.source, job.source_job_id)] = job
+
+        operations = []
+        for (source, source_job_id), job in by_key.items():
+            doc = job.model_dump()
+            doc["expires_at"] = parse_expiry(job.expires_date) or default_expiry
+            doc["ingested_at"] = now
+            operations.append(UpdateOne(
+                {"source": source, "source_job_id": source_job_id},
+                {"$set": doc, "$setOnInsert": {"first_seen_at": now}},
+                upsert=True
+            ))
+        return operations
+
+    # ---------- Run ----------
+
+    async def run_once(self, sources: Optional[List[SourceClient]] = None) -> Dict[str, Any]:
+        """Fetch every target from each source (default: all) and upsert; one run at a time"""
+        sources = self.aggregator.sources if sources is None else sources
+        async with self._lock:
+            started = time.perf_counter()
+            run = {
+                "started_at": datetime.now(timezone.utc).isoformat(), "targets": len(self.targets),
+                "sources": [source.NAME for source in sources if source.configured],
+                "fetched": 0, "upserted": 0, "modified": 0, "errors": []
+            }
+            for name in run["sources"]:
+                self.last_source_run[name] = time.time()
+
+            for query, location in self.targets:
+                results = await asyncio.gather(
+                    *(self._fetch_source(source, query, location) for source in sources),
+                    return_exceptions=True
+                )
+                jobs: List[AggregatedJob] = []
+                for source, result in zip(sources, results):
+                    if isinstance(result, Exception):
+                        run["errors"].append(f"{source.NAME} '{query}' in {location}: {result}")
+                    else:
+                        jobs.extend(result)
+                run["fetched"] += len(jobs)
+
+                operations = self.build_upserts(jobs)
+                if not operations:
+                    continue
+                try:
+                    result = await self.collection.bulk_write(operations, ordered=False)
+                    run["upserted"] += result.upserted_count
+                    run["modified"] += result.modified_count
+                except Exception as e:
+                    run["errors"].append(f"bulk_write '{query}' in {location}: {e}")
+                    continue
+                if self.on_ingested is not None:
+                    self.on_ingested(jobs)
+
+            run["duration_ms"] = int((time.perf_counter() - started) * 1000)
+            self.stats_counters["runs"] += 1
+            for key in ("fetched", "upserted", "modified"):
+                self.stats_counters[key] += run[key]
+            self.stats_counters["errors"] += len(run["errors"])
+            for error in run["errors"]:
+                logger.error(f"Job ingestion error: {error}")
+            self.last_run = run
+            logger.info(f"Job ingestion: {run['fetched']} fetched, {run['upserted']} new, {run['modified']} updated in {run['duration_ms']}ms")
+            return run
+
+    async def run_due(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Manual run: only the sources due within their quota budget, or every source with
+        force=True; nothing is called when no source is due
+        """
+        if force:
+            return await self.run_once()
+        due = self.due_sources()
+        if due:
+            return await self.run_once(due)
+        return {
+            "skipped": True,
+            "reason": "no source is due within its quota budget (force=true overrides)",
+            "next_run_at": {
+                source.NAME: datetime.fromtimestamp(
+                    self.last_source_run.get(source.NAME, 0.0) + self.source_interval(source), timezone.utc
+                ).isoformat()
+                for source in self.aggregator.sources if source.configured
+            }
+        }
+
+    async def _loop(self):
+        while True:
+            try:
+                due = self.due_sources()
+                if due:
+                    await self.run_once(due)
+            except Exception as e:
+                self.stats_counters["errors"] += 1
+                logger.error(f"Job ingestion run failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        """Create indexes and schedule runs every interval seconds (FastAPI startup)"""
+        if self._task is not None:
+            return
+        try:
+            await self.ensure_indexes()
+            await self.load_last_runs()
+        except Exception as e:
+            logger.warning(f"aggregated_jobs indexes not created: {e}")
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "queries": self.queries,
+            "locations": self.locations,
+            "sources": {
+                source.NAME: {
+                    "monthly_quota": self.quotas.get(source.NAME),
+                    "interval_seconds": round(self.source_interval(source)),
+                    "calls_per_month": round(len(self.targets) * MONTH_SECONDS / self.source_interval(source), 1),
+                    "last_run_at": (
+                        datetime.fromtimestamp(self.last_source_run[source.NAME], timezone.utc).isoformat()
+                        if source.NAME in self.last_source_run else None
+                    )
+                }
+                for source in self.aggregator.sources
+            },
+            "last_run": self.last_run,
+            **self.stats_counters
+        }
@@ -0,0 +1,125 @@
+# ============================================
+# JOB SEARCH - Indexed queries for GET /api/jobs
+# Text index for free-text search, pincode_prefix + compound indexes for filters
+# ============================================
+
+from typing import Optional, List, Dict, Any
+from pymongo import IndexModel, UpdateOne, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import OperationFailure
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+PINCODE_PREFIX_LENGTH = 3  # first three digits: sorting district
+SEARCH_MODES = ("text", "regex")
+
+# Title matches outrank company matches, which outrank description matches
+JOB_TEXT_WEIGHTS = {"title": 10, "company_name": 5, "description": 1}
+
+JOB_INDEXES = [
+    IndexModel(
+        [("title", TEXT), ("company_name", TEXT), ("description", TEXT)],
+        weights=JOB_TEXT_WEIGHTS, default_language="english", name="jobs_text"
+    ),
+    # Equality fields first, then the sort key, so filtered listings stop after `limit`
+    IndexModel([("is_active", ASCENDING), ("pincode_prefix", ASCENDING), ("created_at", DESCENDING)], name="jobs_active_pincode_recent"),
+    IndexModel([("is_active", ASCENDING), ("created_at", DESCENDING)], name="jobs_active_recent"),
+]
+
+# Internal fields never returned by GET /api/jobs
+JOB_PROJECTION = {"_id": 0, "pincode_prefix": 0}
+
+def pincode_prefix(pincode: Optional[str]) -> str:
+    """Normalized area prefix of a pincode ('560 001' -> '560')"""
+    return re.sub(r"\D", "", pincode or "")[:PINCODE_PREFIX_LENGTH]
+
+def build_jobs_filter(
+    division: Optional[str] = None,
+    level: Optional[str] = None,
+    pincode: Optional[str] = None,
+    search: Optional[str] = None,
+    mode: str = "regex"
+) -> Dict[str, Any]:
+    """
+    Mongo filter for active jobs
+    - regex: case-insensitive substring match on title/description/company (collection scan)
+    - text: $text over the jobs_text index (stemmed whole words, any term matches)
+    Pincodes with fewer than PINCODE_PREFIX_LENGTH digits keep the old prefix regex.
+    """
+    query: Dict[str, Any] = {"is_active": True}
+    if division:
+        query["division"] = division
+    if level:
+        query["level"] = level
+    if pincode:
+        prefix = pincode_prefix(pincode)
+        if len(prefix) == PINCODE_PREFIX_LENGTH:
+            query["pincode_prefix"] = prefix
+        else:
+            query["pincode"] = {"$regex": "^" + re.escape(pincode.strip())}
+    if search:
+        if mode == "text":
+            query["$text"] = {"$search": search}
+        else:
+            pattern = re.escape(search)
+            query["$or"] = [
+                {"title": {"$regex": pattern, "$options": "i"}},
+                {"description": {"$regex": pattern, "$options": "i"}},
+                {"company_name": {"$regex": pattern, "$options": "i"}}
+            ]
+    return query
+
+async def find_jobs(
+    collection,
+    division: Optional[str] = None,
+    level: Optional[str] = None,
+    pincode: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: int = 20,
+    mode: str = "regex"
+) -> List[Dict[str, Any]]:
+    """
+    Active jobs, newest first; text searches (opt-in) are ranked by relevance, then
+    recency, and fall back to regex when the text index is missing.
+    Documents come back without the internal pincode_prefix and textScore fields.
+    """
+    query = build_jobs_filter(division, level, pincode, search, mode)
+    if "$text" not in query:
+        return await collection.find(query, JOB_PROJECTION).sort("created_at", DESCENDING).limit(limit).to_list(limit)
+
+    score = {"$meta": "textScore"}
+    try:
+        jobs = await (
+            collection.find(query, {**JOB_PROJECTION, "score": score})
+            .sort([("score", score), ("created_at", DESCENDING)])
+            .limit(limit)
+            .to_list(limit)
+        )
+        for job in jobs:
+            job.pop("score", None)
+        return jobs
+    except OperationFailure as e:
+        if e.code != 27:  # IndexNotFound
+            raise
+        logger.warning("jobs_text index missing, falling back to regex search")
+        return await find_jobs(collection, division, level, pincode, search, limit, mode="regex")
+
+# ---------- Indexes + migration ----------
+
+async def ensure_job_indexes(collection):
+    await collection.create_indexes(JOB_INDEXES)
+
+async def backfill_pincode_prefix(collection, batch_size: int = 1000) -> int:
+    """Set pincode_prefix on jobs stored before it existed; returns jobs updated"""
+    updated = 0
+    batch: List[UpdateOne] = []
+    cursor = collection.find({"pincode_prefix": {"$exists": False}}, {"_id": 1, "pincode": 1}).batch_size(batch_size)
+    async for doc in cursor:
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"pincode_prefix": pincode_prefix(doc.get("pincode"))}}))
+        if len(batch) >= batch_size:
+            updated += (await collection.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await collection.bulk_write(batch, ordered=False)).modified_count
+    return updated
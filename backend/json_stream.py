@@ -0,0 +1,104 @@
+# ============================================
+# JSON STREAM - Incremental parser for a streamed JSON object
+# Emits each top-level field the moment its value closes, so a client can act on
+# early fields (e.g. speak spokenText) while the model is still generating
+# ============================================
+
+from typing import Any, List, Tuple
+import json
+
+WHITESPACE = " \t\r\n"
+
+class JSONFieldStream:
+    """
+    feed(chunk) -> [(name, value), ...] for top-level fields completed by this chunk.
+    Text before the first '{' (e.g. a ```json fence) and after the closing '}' is
+    ignored. String values are decoded as soon as their closing quote arrives; other
+    values (numbers, literals, nested objects/arrays) when the following ',' or '}' does.
+    """
+
+    def __init__(self):
+        self.state = "start"  # start, key_or_end, key, colon, value, string, raw, comma_or_end, done
+        self.key = ""
+        self.buffer: List[str] = []
+        self.escaped = False
+        self.depth = 0          # nesting inside a raw value
+        self.raw_in_string = False
+        self.fields: dict = {}
+
+    @property
+    def done(self) -> bool:
+        return self.state == "done"
+
+    def _string_char(self, char: str) -> bool:
+        """Add char to the current string; True when it was the closing quote"""
+        if self.escaped:
+            self.escaped = False
+        elif char == "\\":
+            self.escaped = True
+        elif char == '"':
+            return True
+        self.buffer.append(char)
+        return False
+
+    def _emit(self, value: Any, completed: List[Tuple[str, Any]]):
+        self.fields[self.key] = value
+        completed.append((self.key, value))
+        self.buffer = []
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        completed: List[Tuple[str, Any]] = []
+        for char in chunk:
+            state = self.state
+            if state == "start":
+                if char == "{":
+                    self.state = "key_or_end"
+            elif state in ("key_or_end", "comma_or_end"):
+                if char == "}":
+                    self.state = "done"
+                elif char == '"' and state == "key_or_end":
+                    self.state = "key"
+                elif char == "," and state == "comma_or_end":
+                    self.state = "key_or_end"
+                elif char not in WHITESPACE:
+                    raise ValueError(f"Unexpected {char!r} in JSON object")
+            elif state == "key":
+                if self._string_char(char):
+                    self.key = json.loads('"' + "".join(self.buffer) + '"')
+                    self.buffer = []
+                    self.state = "colon"
+            elif state == "colon":
+                if char == ":":
+                    self.state = "value"
+                elif char not in WHITESPACE:
+                    raise ValueError(f"Expected ':' after {self.key!r}")
+            elif state == "value":
+                if char == '"':
+                    self.state = "string"
+                elif char not in WHITESPACE:
+                    self.state = "raw"
+                    self.depth = 1 if char in "{[" else 0
+                    self.buffer = [char]
+            elif state == "string":
+                if self._string_char(char):
+                    self._emit(json.loads('"' + "".join(self.buffer) + '"'), completed)
+                    self.state = "comma_or_end"
+            elif state == "raw":
+                if self.raw_in_string:
+                    self.raw_in_string = not self._string_char(char)
+                    if not self.raw_in_string:
+                        self.buffer.append(char)
+                    continue
+                if self.depth == 0 and char in ",}":
+                    self._emit(json.loads("".join(self.buffer)), completed)
+                    self.state = "key_or_end" if char == "," else "done"
+                    continue
+                if char == '"':
+                    self.raw_in_string = True
+                elif char in "{[":
+                    self.depth += 1
+                elif char in "}]":
+                    self.depth -= 1
+                self.buffer.append(char)
+            # done: ignore trailing text
+        return completed
@@ -0,0 +1,181 @@
+# ============================================
+# RESPONSE CACHE - Semantic cache for LLM replies
+# Exact tier on the normalized prompt, opt-in MinHash similarity tier; keyed by
+# system-prompt version and language. TTL + LRU, per-endpoint hit rates
+# ============================================
+
+from typing import Optional, Dict, Any, List, Tuple, FrozenSet, Hashable
+from collections import OrderedDict
+import hashlib
+import os
+import time
+import unicodedata
+
+from job_dedup import MinHasher, jaccard
+
+SHINGLE_SIZE = 3
+
+def normalize_prompt(text: str) -> str:
+    """NFKC, casefolded, single spaces, trailing ?!. dropped; symbols such as + # % ₹ $ are kept"""
+    text = " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+    return text.rstrip("?!.। ")
+
+def prompt_version(*parts: Any) -> str:
+    """Short hash of a system prompt (+ config): changing the prompt starts a fresh cache"""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:10]
+
+def shingles(normalized: str) -> FrozenSet[str]:
+    """Character 3-grams (short questions have too few words for word shingles)"""
+    padded = f" {normalized} "
+    return frozenset(padded[i:i + SHINGLE_SIZE] for i in range(max(1, len(padded) - SHINGLE_SIZE + 1)))
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "shingles", "band_keys")
+
+    def __init__(self, value, expires_at, shingles, band_keys):
+        self.value = value
+        self.expires_at = expires_at
+        self.shingles = shingles
+        self.band_keys = band_keys
+
+class ResponseCache:
+    """
+    get(endpoint, prompt, language, version) / set(endpoint, prompt, value, language, version).
+    Entries are shared by endpoints using the same version (see prompt_version); the
+    endpoint name only labels the hit-rate metrics.
+    similarity_threshold: minimum character-trigram Jaccard for a similar-prompt hit
+    (None, the default = exact tier only). Candidates come from MinHash LSH buckets, so
+    a lookup costs O(bands), not O(entries). Off by default: negations and numbers barely
+    move trigram overlap ("not interested in sales" vs "interested in sales" is 0.82).
+    """
+
+    def __init__(
+        self,
+        ttl: float = 6 * 3600,
+        maxsize: int = 5000,
+        similarity_threshold: Optional[float] = None,
+        num_perm: int = 64,
+        bands: int = 16,
+        clock=time.monotonic
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.similarity_threshold = similarity_threshold
+        self.clock = clock
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple, set] = {}
+        self.endpoint_counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, endpoint: str, counter: str):
+        counters = self.endpoint_counters.setdefault(
+            endpoint, {"exact_hits": 0, "similar_hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+        )
+        counters[counter] += 1
+
+    def _band_keys(self, namespace: Tuple, prompt_shingles: FrozenSet[str]) -> List[Tuple]:
+        signature = self.hasher.signature(sorted(prompt_shingles))
+        return [(namespace, band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def _remove(self, key: Tuple):
+        entry = self._entries.pop(key)
+        for band_key in entry.band_keys:
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _live(self, key: Tuple) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.clock() >= entry.expires_at:
+            self._remove(key)
+            return None
+        return entry
+
+    def get(self, endpoint: str, prompt: str, language: str = "en", version: Hashable = "") -> Optional[Any]:
+        namespace = (version, language)
+        normalized = normalize_prompt(prompt)
+        key = (namespace, normalized)
+        entry = self._live(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._count(endpoint, "exact_hits")
+            return entry.value
+
+        if self.similarity_threshold is not None and normalized:
+            prompt_shingles = shingles(normalized)
+            best, best_score = None, self.similarity_threshold
+            seen = set()
+            for band_key in self._band_keys(namespace, prompt_shingles):
+                for candidate in list(self._buckets.get(band_key, ())):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    entry = self._live(candidate)
+                    if entry is None:
+                        continue
+                    score = jaccard(prompt_shingles, entry.shingles)
+                    if score >= best_score:
+                        best, best_score = candidate, score
+            if best is not None:
+                self._entries.move_to_end(best)
+                self._count(endpoint, "similar_hits")
+                return self._entries[best].value
+
+        self._count(endpoint, "misses")
+        return None
+
+    def set(self, endpoint: str, prompt: str, value: Any, language: str = "en", version: Hashable = ""):
+        namespace = (version, language)
+        normalized = normalize_prompt(prompt)
+        key = (namespace, normalized)
+        if key in self._entries:
+            self._remove(key)
+        prompt_shingles = shingles(normalized)
+        band_keys = self._band_keys(namespace, prompt_shingles) if self.similarity_threshold is not None else []
+        self._entries[key] = _Entry(value, self.clock() + self.ttl, prompt_shingles, band_keys)
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+        self._count(endpoint, "stores")
+
+    def bypass(self, endpoint: str):
+        """Record a request that must not be cached (personalized prompt)"""
+        self._count(endpoint, "bypassed")
+
+    def clear(self):
+        self._entries.clear()
+        self._buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint, counters in self.endpoint_counters.items():
+            hits = counters["exact_hits"] + counters["similar_hits"]
+            lookups = hits + counters["misses"]
+            endpoints[endpoint] = {**counters, "hit_rate": round(hits / lookups, 3) if lookups else None}
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "similarity_threshold": self.similarity_threshold,
+            "endpoints": endpoints
+        }
+
+def _threshold_from_env() -> Optional[float]:
+    value = os.environ.get("LLM_CACHE_SIMILARITY", "off").lower()
+    return None if value in ("", "off", "none", "0") else float(value)
+
+# Singleton instance
+llm_response_cache = ResponseCache(
+    ttl=float(os.environ.get("LLM_CACHE_TTL_SECONDS", str(6 * 3600))),
+    maxsize=int(os.environ.get("LLM_CACHE_MAXSIZE", "5000")),
+    similarity_threshold=_threshold_from_env()
+)
@@ -1,26 +1,26 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 import base64
+import json
+import re
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
 from datetime import datetime, timezone
 from enum import Enum
 import random
 import asyncio
+import time
 # Google Generative AI for AIMEE chat
-try:
-    import google.generativeai as genai
-    HAS_GEMINI = True
-except ImportError:
-    HAS_GEMINI = False
-    genai = None
+from gemini_service import gemini_chat, genai, HAS_GEMINI
+from json_stream import JSONFieldStream
+from response_cache import llm_response_cache, prompt_version
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -265,6 +265,9 @@ async def update_user(user_id: str, updates: Dict[str, Any]):
     return updated_user
 
 # Job Routes
+from db_loader import RequestLoaders
+from job_search import find_jobs, pincode_prefix, SEARCH_MODES
+
 @api_router.post("/jobs", response_model=Job)
 async def create_job(job_data: JobCreate):
     job = Job(
@@ -281,6 +284,7 @@ async def create_job(job_data: JobCreate):
         employer_id=job_data.employer_id
     )
     doc = job.model_dump()
+    doc["pincode_prefix"] = pincode_prefix(job.pincode)
     await db.jobs.insert_one(doc)
     return job
 
@@ -290,25 +294,16 @@ async def get_jobs(
     level: Optional[str] = None,
     pincode: Optional[str] = None,
     search: Optional[str] = None,
-    limit: int = 20
+    limit: int = 20,
+    search_mode: str = "regex"
 ):
-    query = {"is_active": True}
-    
-    if division:
-        query["division"] = division
-    if level:
-        query["level"] = level
-    if pincode:
-        query["pincode"] = {"$regex": f"^{pincode[:3]}", "$options": "i"}
-    if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}},
-            {"company_name": {"$regex": search, "$options": "i"}}
-        ]
-    
-    jobs = await db.jobs.find(query, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
-    return jobs
+    """
+    Active jobs, newest first. search_mode=regex (default) matches substrings;
+    search_mode=text opts into the jobs_text index (stemmed words, relevance ranked)
+    """
+    if search_mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail="search_mode must be text or regex")
+    return await find_jobs(db.jobs, division, level, pincode, search, limit, mode=search_mode)
 
 @api_router.get("/jobs/employer/{employer_id}", response_model=List[Job])
 async def get_employer_jobs(employer_id: str):
@@ -352,13 +347,70 @@ async def search_aggregated_jobs(
             "error": "External APIs unavailable, showing sample jobs"
         }
 
+@api_router.get("/jobs/aggregated/stream")
+async def stream_aggregated_jobs(
+    query: str = "jobs",
+    location: str = "India",
+    page: int = 1,
+    include_sample: bool = True,
+    format: str = "ndjson"
+):
+    """
+    Stream jobs per source as they arrive (NDJSON, or server-sent events with format=sse)
+    Sample jobs come first, then one "batch" event per provider (deduplicated against
+    everything already sent), then a "done" event.
+    """
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be ndjson or sse")
+    
+    def encode(event: Dict[str, Any]) -> str:
+        payload = json.dumps(event, default=str)
+        return f"event: {event['type']}\ndata: {payload}\n\n" if format == "sse" else payload + "\n"
+    
+    async def events():
+        started = datetime.now(timezone.utc)
+        total, sources = 0, []
+        try:
+            async for source, jobs in job_aggregator.stream_all_sources(query, location, page, include_sample):
+                total += len(jobs)
+                sources.append(source)
+                yield encode({
+                    "type": "batch",
+                    "source": source,
+                    "jobs": [job.model_dump() for job in jobs],
+                    "count": len(jobs),
+                    "elapsed_ms": int((datetime.now(timezone.utc) - started).total_seconds() * 1000)
+                })
+        except Exception as e:
+            logger.error(f"Job stream error: {e}")
+            yield encode({"type": "error", "error": "External APIs unavailable"})
+        yield encode({
+            "type": "done",
+            "total": total,
+            "query": query,
+            "location": location,
+            "sources": sources,
+            "elapsed_ms": int((datetime.now(timezone.utc) - started).total_seconds() * 1000)
+        })
+    
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@api_router.get("/jobs/aggregated/cache-stats")
+async def get_job_search_cache_stats():
+    """Search cache counters: hits, misses, stale-served, coalesced"""
+    return job_aggregator.cache.stats()
+
 @api_router.get("/jobs/sources")
 async def get_job_sources():
-    """Get list of job sources and their status"""
+    """Get list of job sources and their status (with circuit breaker state and budget overruns)"""
+    health = job_aggregator.source_stats()
     return {
+        "budget_seconds": job_aggregator.budget,
+        "duplicates_merged": job_aggregator.dedup_counters,
         "sources": [
-            {"name": "JSearch", "description": "LinkedIn, Indeed, Glassdoor aggregator", "status": "configured" if os.environ.get("RAPIDAPI_KEY") else "needs_api_key"},
-            {"name": "Adzuna", "description": "Official job board aggregator (16 countries)", "status": "configured" if os.environ.get("ADZUNA_APP_ID") else "needs_api_key"},
+            {"name": "JSearch", "description": "LinkedIn, Indeed, Glassdoor aggregator", "status": "configured" if os.environ.get("RAPIDAPI_KEY") else "needs_api_key", "health": health["jsearch"]},
+            {"name": "Adzuna", "description": "Official job board aggregator (16 countries)", "status": "configured" if os.environ.get("ADZUNA_APP_ID") else "needs_api_key", "health": health["adzuna"]},
             {"name": "Naukri", "description": "India's #1 job portal", "status": "coming_soon"},
             {"name": "Mercor", "description": "AI-powered job matching", "status": "coming_soon"},
             {"name": "Quikr", "description": "Local jobs and gigs", "status": "coming_soon"},
@@ -371,6 +423,7 @@ async def get_job_sources():
 # ============================================
 
 from ai_matcher import ai_matcher, ProfileMatchInput, JobMatchResult
+from job_index import job_index
 
 class MatchJobsRequest(BaseModel):
     # Profile data
@@ -391,6 +444,9 @@ class MatchJobsRequest(BaseModel):
 async def match_jobs_to_profile(request: MatchJobsRequest):
     """
     AI-powered job matching based on DoersScore™ and profile data
+    Jobs sharing no skill/interest keyword with the profile are pruned before scoring
+    (see job_index): total_jobs is the whole feed, scored_jobs/pruned_jobs the split, and
+    perfect_matches, good_matches, stretch_roles and avg_match_score count scored jobs only.
     """
     try:
         # Create profile input
@@ -414,22 +470,27 @@ async def match_jobs_to_profile(request: MatchJobsRequest):
         # Convert to dict for matcher
         jobs_dict = [job.model_dump() for job in jobs]
         
-        # Rank jobs by match score
-        matched_jobs = ai_matcher.rank_jobs_for_profile(profile, jobs_dict)
+        # Skip jobs sharing no skill/interest keyword with the profile (plus an exploration sample)
+        candidates = job_index.select_candidates(profile, jobs_dict)
+        job_index.maybe_check_recall(profile, jobs_dict, candidates, top_k=20)
+        
+        # Score candidates (plain numbers), build match details for the top 20 only
+        scores = ai_matcher.score_jobs_for_profile(profile, candidates)
+        matched_jobs = ai_matcher.rank_jobs_for_profile(profile, candidates, top_k=20, scores=scores)
         
         # Separate by recommendation
-        perfect_matches = [j for j in matched_jobs if j["recommendation"] == "perfect_match"]
-        good_matches = [j for j in matched_jobs if j["recommendation"] == "good_match"]
-        stretch_roles = [j for j in matched_jobs if j["recommendation"] == "stretch_role"]
+        recommendations = [ai_matcher.recommendation_for_score(score) for score in scores]
         
         return {
-            "matched_jobs": matched_jobs[:20],  # Top 20
+            "matched_jobs": matched_jobs,  # Top 20
             "summary": {
-                "total_jobs": len(matched_jobs),
-                "perfect_matches": len(perfect_matches),
-                "good_matches": len(good_matches),
-                "stretch_roles": len(stretch_roles),
-                "avg_match_score": sum(j["match_score"] for j in matched_jobs) // max(1, len(matched_jobs))
+                "total_jobs": len(jobs_dict),
+                "scored_jobs": len(scores),
+                "pruned_jobs": len(jobs_dict) - len(scores),
+                "perfect_matches": recommendations.count("perfect_match"),
+                "good_matches": recommendations.count("good_match"),
+                "stretch_roles": recommendations.count("stretch_role"),
+                "avg_match_score": sum(scores) // max(1, len(scores))
             },
             "profile_summary": {
                 "doers_score": request.doers_score,
@@ -477,15 +538,58 @@ async def get_anushree_job_matches():
     jobs_dict = [job.model_dump() for job in jobs]
     
     # Match and rank
-    matched_jobs = ai_matcher.rank_jobs_for_profile(profile, jobs_dict)
+    matched_jobs = ai_matcher.rank_jobs_for_profile(profile, jobs_dict, top_k=10)
     
     return {
         "profile_name": "Anushree R. Hosalli",
         "doers_score": 820,
-        "matched_jobs": matched_jobs[:10],
+        "matched_jobs": matched_jobs,
         "recommendation": "Based on your DoersScore™ of 820 and expertise in sustainable fashion, you're qualified for senior roles in circular economy and ESG consulting."
     }
 
+@api_router.get("/jobs/match/index-stats")
+async def get_job_index_stats():
+    """
+    Candidate pre-filter stats: term hit rate, pruned fraction, shadow top-k recall
+    """
+    return job_index.stats()
+
+# ============================================
+# JOB INGESTION APIs (materialized external jobs)
+# ============================================
+
+from job_ingestion import JobIngestionWorker, search_ingested
+
+job_ingestion = JobIngestionWorker(
+    job_aggregator,
+    db.aggregated_jobs,
+    interval=float(os.environ.get("JOB_INGEST_INTERVAL_SECONDS", 6 * 3600)),
+    on_ingested=lambda jobs: job_index.add_jobs(job.model_dump() for job in jobs)
+)
+
+@api_router.get("/jobs/ingested")
+async def get_ingested_jobs(
+    query: str = "",
+    location: str = "",
+    source: Optional[str] = None,
+    limit: int = 50
+):
+    """
+    Search jobs materialized by the ingestion worker (local, no upstream calls)
+    """
+    jobs = await search_ingested(db.aggregated_jobs, query, location, source, min(max(limit, 1), 200))
+    return {"jobs": jobs, "total": len(jobs), "query": query, "location": location}
+
+@api_router.get("/jobs/ingest/status")
+async def get_job_ingestion_status():
+    """Ingestion worker schedule, targets and last run"""
+    return job_ingestion.status()
+
+@api_router.post("/jobs/ingest/run")
+async def run_job_ingestion(force: bool = False):
+    """Run one ingestion pass now for the sources due within their quota budget (force: all sources)"""
+    return await job_ingestion.run_due(force=force)
+
 # Dynamic job ID route must be AFTER specific routes
 @api_router.get("/jobs/{job_id}", response_model=Job)
 async def get_job(job_id: str):
@@ -508,24 +612,28 @@ async def apply_for_job(job_id: str, doer_id: str):
     
     return {"message": "Application submitted successfully", "application_id": application.id}
 
+def request_loaders() -> RequestLoaders:
+    """Fresh batched loaders per request (memoized lookups never outlive it)"""
+    return RequestLoaders(db)
+
 @api_router.get("/applications/doer/{doer_id}")
-async def get_doer_applications(doer_id: str):
+async def get_doer_applications(doer_id: str, loaders: RequestLoaders = Depends(request_loaders)):
     applications = await db.applications.find({"doer_id": doer_id}, {"_id": 0}).to_list(100)
     
-    # Enrich with job details
-    for app in applications:
-        job = await db.jobs.find_one({"id": app["job_id"]}, {"_id": 0})
+    # Enrich with job details (one $in query for all applications)
+    jobs = await loaders.jobs.load_many([app["job_id"] for app in applications])
+    for app, job in zip(applications, jobs):
         app["job"] = job
     
     return applications
 
 @api_router.get("/applications/job/{job_id}")
-async def get_job_applications(job_id: str):
+async def get_job_applications(job_id: str, loaders: RequestLoaders = Depends(request_loaders)):
     applications = await db.applications.find({"job_id": job_id}, {"_id": 0}).to_list(100)
     
-    # Enrich with doer details
-    for app in applications:
-        doer = await db.users.find_one({"id": app["doer_id"]}, {"_id": 0})
+    # Enrich with doer details (one $in query for all applications)
+    doers = await loaders.users.load_many([app["doer_id"] for app in applications])
+    for app, doer in zip(applications, doers):
         app["doer"] = doer
     
     return applications
@@ -584,15 +692,10 @@ Guidelines:
                 recommended_jobs=None
             )
         
-        # Initialize Gemini model
-        model = genai.GenerativeModel(
-            model_name='gemini-2.5-flash',
-            system_instruction=system_message
-        )
-        
-        chat = model.start_chat(history=[])
-        response = chat.send_message(chat_msg.message)
-        response_text = response.text
+        # Cached model, async call: the event loop keeps serving other requests.
+        # The prompt carries this user's profile, so the response cache is skipped.
+        llm_response_cache.bypass("aimee_chat")
+        response_text = await gemini_chat.send(chat_msg.message, system_instruction=system_message)
         
         # Find recommended jobs based on user query
         recommended = []
@@ -614,31 +717,50 @@ Guidelines:
         )
 
 # Admin Dashboard Stats
-@api_router.get("/admin/stats")
-async def get_admin_stats():
-    total_doers = await db.users.count_documents({"role": "doer"})
-    total_employers = await db.users.count_documents({"role": "employer"})
-    total_jobs = await db.jobs.count_documents({"is_active": True})
-    total_applications = await db.applications.count_documents({})
-    
-    # Division distribution
-    division_stats = []
-    for div in DoersDivision:
-        count = await db.users.count_documents({"division": div.value})
-        division_stats.append({"division": div.value, "count": count})
-    
-    # Recent activity
-    recent_jobs = await db.jobs.find({}, {"_id": 0}).sort("created_at", -1).limit(5).to_list(5)
+from ttl_cache import TTLCache
+
+# Dashboards poll every few seconds; they see numbers at most this old
+admin_stats_cache = TTLCache(ttl=float(os.environ.get("ADMIN_STATS_TTL_SECONDS", "5")), maxsize=1)
+
+# One pass over users for role and division counts (was 2 + one per division)
+USER_STATS_PIPELINE = [
+    {"$project": {"_id": 0, "role": 1, "division": 1}},
+    {"$facet": {
+        "roles": [
+            {"$match": {"role": {"$in": ["doer", "employer"]}}},
+            {"$group": {"_id": "$role", "count": {"$sum": 1}}}
+        ],
+        "divisions": [
+            {"$match": {"division": {"$in": [div.value for div in DoersDivision]}}},
+            {"$group": {"_id": "$division", "count": {"$sum": 1}}}
+        ]
+    }}
+]
+
+async def compute_admin_stats():
+    """Admin numbers from four concurrent queries: the users $facet, active jobs, applications and recent jobs"""
+    (user_stats,), total_jobs, total_applications, recent_jobs = await asyncio.gather(
+        db.users.aggregate(USER_STATS_PIPELINE).to_list(1),
+        db.jobs.count_documents({"is_active": True}),
+        db.applications.count_documents({}),
+        db.jobs.find({}, {"_id": 0}).sort("created_at", -1).limit(5).to_list(5)
+    )
+    roles = {row["_id"]: row["count"] for row in user_stats["roles"]}
+    divisions = {row["_id"]: row["count"] for row in user_stats["divisions"]}
     
     return {
-        "total_doers": total_doers,
-        "total_employers": total_employers,
+        "total_doers": roles.get("doer", 0),
+        "total_employers": roles.get("employer", 0),
         "total_jobs": total_jobs,
         "total_applications": total_applications,
-        "division_stats": division_stats,
+        "division_stats": [{"division": div.value, "count": divisions.get(div.value, 0)} for div in DoersDivision],
         "recent_jobs": recent_jobs
     }
 
+@api_router.get("/admin/stats")
+async def get_admin_stats():
+    return await admin_stats_cache.get_or_compute("admin_stats", compute_admin_stats)
+
 # Seed Data
 @api_router.post("/seed")
 async def seed_data():
@@ -686,7 +808,7 @@ async def seed_data():
             requirements=job_data["requirements"],
             employer_id=job_data["employer_id"]
         )
-        await db.jobs.insert_one(job.model_dump())
+        await db.jobs.insert_one({**job.model_dump(), "pincode_prefix": pincode_prefix(job.pincode)})
     
     return {"message": "Seed data created successfully", "jobs_created": len(sample_jobs)}
 
@@ -1042,111 +1164,220 @@ class AIMEEChatSimpleRequest(BaseModel):
     context: List[Dict[str, str]] = Field(default_factory=list)
     is_voice: bool = False  # Flag for voice requests
 
-@api_router.post("/aimee/chat-simple")
-async def aimee_chat_simple(request: AIMEEChatSimpleRequest):
-    """
-    Simple chat with AIMEE AI Assistant - Voice-optimized
-    Returns both displayText (for UI) and spokenText (for TTS)
-    """
-    try:
-        # Check if Gemini is available
-        if not HAS_GEMINI or not GOOGLE_API_KEY:
-            logger.warning("[AIMEE] Gemini not available - using fallback response")
-            return {
-                "response": "I'm AIMEE! Check out Jobs4Me or your DoersProfile.",
-                "displayText": "I'm AIMEE! Explore Jobs4Me for opportunities or complete your DoersProfile.",
-                "spokenText": "I'm AIMEE! How can I help you today?",
-                "followUp": "What would you like to explore?"
-            }
-        
-        # Voice-optimized system prompt for concise responses
-        system_prompt = """You are AIMEE, a friendly AI career assistant.
+# Voice-optimized system prompt for concise responses. spokenText comes first so
+# the streaming endpoint can hand it to TTS before the rest is generated.
+AIMEE_VOICE_PROMPT = """You are AIMEE, a friendly AI career assistant.
 
 RESPOND IN THIS EXACT JSON FORMAT (no markdown, no backticks):
-{"displayText": "your 2-3 sentence answer", "spokenText": "1 short sentence version", "followUp": "follow-up question"}
+{"spokenText": "1 short sentence version", "displayText": "your 2-3 sentence answer", "followUp": "follow-up question"}
 
 Rules:
-- displayText: 2-3 short sentences. Be helpful and specific.
 - spokenText: 1 sentence ONLY. Natural speech, no emojis/markdown.
+- displayText: 2-3 short sentences. Be helpful and specific.
 - followUp: One short question to continue conversation.
 
 Example:
-{"displayText": "Python, Machine Learning, and Data Science are top AI skills. Start with Python basics.", "spokenText": "Python and Machine Learning are the top AI skills to learn.", "followUp": "Want me to suggest some free courses?"}
+{"spokenText": "Python and Machine Learning are the top AI skills to learn.", "displayText": "Python, Machine Learning, and Data Science are top AI skills. Start with Python basics.", "followUp": "Want me to suggest some free courses?"}
 
 Your expertise: Careers, jobs, skills, DoersProfile, Jobs4Me platform."""
 
-        # Build conversation history for context
-        history = []
-        for msg in request.context[-4:]:  # Last 4 messages only for speed
-            role = "user" if msg.get("role") == "user" else "model"
-            history.append({"role": role, "parts": [msg.get("content", "")]})
+AIMEE_VOICE_CONFIG = {
+    "temperature": 0.7,
+    "max_output_tokens": 350,  # Enough for complete JSON
+}
+
+# Response cache key part: a prompt or config change starts a fresh cache
+AIMEE_VOICE_VERSION = prompt_version(AIMEE_VOICE_PROMPT, AIMEE_VOICE_CONFIG)
+
+# Reply fields in the order the prompt asks for them
+VOICE_FIELDS = ("spokenText", "displayText", "followUp")
+
+AIMEE_VOICE_FALLBACK = {
+    "response": "I'm AIMEE! Check out Jobs4Me or your DoersProfile.",
+    "displayText": "I'm AIMEE! Explore Jobs4Me for opportunities or complete your DoersProfile.",
+    "spokenText": "I'm AIMEE! How can I help you today?",
+    "followUp": "What would you like to explore?"
+}
+
+AIMEE_VOICE_ERROR = {
+    "response": "Let me try that again. Ask me anything about careers!",
+    "displayText": "I had a brief hiccup. Try asking again!",
+    "spokenText": "Sorry, let me try that again.",
+    "followUp": "What would you like to know?"
+}
+
+EMOJI_PATTERN = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F700-\U0001F77F\U0001F780-\U0001F7FF\U0001F800-\U0001F8FF\U0001F900-\U0001F9FF\U0001FA00-\U0001FA6F\U0001FA70-\U0001FAFF\U00002702-\U000027B0\U000024C2-\U0001F251]+')
+
+def clean_spoken_text(text: str) -> str:
+    """Remove markdown and emojis before TTS"""
+    text = re.sub(r'[*_#`]', '', text)
+    return EMOJI_PATTERN.sub('', text).strip()
+
+def voice_history(context: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Gemini chat history from the last 4 context messages (kept short for speed)"""
+    return [
+        {"role": "user" if msg.get("role") == "user" else "model", "parts": [msg.get("content", "")]}
+        for msg in context[-4:]
+    ]
+
+def parse_voice_reply(response_text: str) -> Tuple[Dict[str, str], bool]:
+    """chat-simple response body from the model's JSON reply (or its raw text), and whether the JSON parsed"""
+    response_text = response_text.strip()
+    try:
+        # Clean up response if needed
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        response_text = response_text.strip()
         
-        # Initialize Gemini model and chat
-        model = genai.GenerativeModel(
-            model_name='gemini-2.5-flash',
-            system_instruction=system_prompt,
-            generation_config={
-                "temperature": 0.7,
-                "max_output_tokens": 350,  # Enough for complete JSON
-            }
-        )
+        parsed = json.loads(response_text)
         
-        chat = model.start_chat(history=history)
+        display_text = parsed.get("displayText", response_text)
+        spoken_text = parsed.get("spokenText", display_text[:100])
+        follow_up = parsed.get("followUp", "What else would you like to know?")
         
-        # Send message and get response
-        response = chat.send_message(request.message)
-        response_text = response.text.strip()
+        return {
+            "response": display_text,  # Backward compatible
+            "displayText": display_text,
+            "spokenText": clean_spoken_text(spoken_text),
+            "followUp": follow_up
+        }, True
         
-        # Try to parse JSON response
-        try:
-            # Clean up response if needed
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-            
-            import json
-            parsed = json.loads(response_text)
-            
-            display_text = parsed.get("displayText", response_text)
-            spoken_text = parsed.get("spokenText", display_text[:100])
-            follow_up = parsed.get("followUp", "What else would you like to know?")
-            
-            # Clean spoken text - remove emojis and markdown
-            import re
-            spoken_text = re.sub(r'[*_#`]', '', spoken_text)  # Remove markdown
-            spoken_text = re.sub(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F700-\U0001F77F\U0001F780-\U0001F7FF\U0001F800-\U0001F8FF\U0001F900-\U0001F9FF\U0001FA00-\U0001FA6F\U0001FA70-\U0001FAFF\U00002702-\U000027B0\U000024C2-\U0001F251]+', '', spoken_text)
-            
-            logger.info(f"[AIMEE] Voice response for: {request.message[:30]}...")
-            return {
-                "response": display_text,  # Backward compatible
-                "displayText": display_text,
-                "spokenText": spoken_text.strip(),
-                "followUp": follow_up
-            }
-            
-        except json.JSONDecodeError:
-            # Fallback if JSON parsing fails
-            logger.warning(f"[AIMEE] JSON parse failed, using raw response")
-            short_response = response_text[:200] if len(response_text) > 200 else response_text
-            return {
-                "response": short_response,
-                "displayText": short_response,
-                "spokenText": short_response[:80] + "..." if len(short_response) > 80 else short_response,
-                "followUp": "Anything else you'd like to know?"
-            }
+    except (json.JSONDecodeError, AttributeError):
+        # Fallback if JSON parsing fails
+        logger.warning(f"[AIMEE] JSON parse failed, using raw response")
+        short_response = response_text[:200] if len(response_text) > 200 else response_text
+        return {
+            "response": short_response,
+            "displayText": short_response,
+            "spokenText": short_response[:80] + "..." if len(short_response) > 80 else short_response,
+            "followUp": "Anything else you'd like to know?"
+        }, False
+
+@api_router.post("/aimee/chat-simple")
+async def aimee_chat_simple(request: AIMEEChatSimpleRequest):
+    """
+    Simple chat with AIMEE AI Assistant - Voice-optimized
+    Returns both displayText (for UI) and spokenText (for TTS)
+    """
+    try:
+        # Check if Gemini is available
+        if not HAS_GEMINI or not GOOGLE_API_KEY:
+            logger.warning("[AIMEE] Gemini not available - using fallback response")
+            return dict(AIMEE_VOICE_FALLBACK)
+        
+        # Same question without conversation context: answer from the response cache
+        cacheable = not request.context
+        if cacheable:
+            cached = llm_response_cache.get("aimee_chat_simple", request.message, version=AIMEE_VOICE_VERSION)
+            if cached is not None:
+                return dict(cached)
+        else:
+            llm_response_cache.bypass("aimee_chat_simple")
+        
+        # Send message and get response (cached model, async call)
+        response_text = await gemini_chat.send(
+            request.message,
+            system_instruction=AIMEE_VOICE_PROMPT,
+            history=voice_history(request.context),
+            generation_config=AIMEE_VOICE_CONFIG
+        )
+        logger.info(f"[AIMEE] Voice response for: {request.message[:30]}...")
+        reply, parsed = parse_voice_reply(response_text)
+        if cacheable and parsed:
+            llm_response_cache.set("aimee_chat_simple", request.message, reply, version=AIMEE_VOICE_VERSION)
+        return reply
         
     except Exception as e:
         logger.error(f"[AIMEE] Chat error: {e}")
-        return {
-            "response": "Let me try that again. Ask me anything about careers!",
-            "displayText": "I had a brief hiccup. Try asking again!",
-            "spokenText": "Sorry, let me try that again.",
-            "followUp": "What would you like to know?"
-        }
+        return dict(AIMEE_VOICE_ERROR)
+
+@api_router.post("/aimee/chat-stream")
+async def aimee_chat_stream(request: AIMEEChatSimpleRequest):
+    """
+    Streaming AIMEE chat over server-sent events:
+    "token" events carry text as Gemini generates it, a "field" event fires as each of
+    spokenText/displayText/followUp closes (spokenText first, so TTS can start early),
+    then "done" carries the same body /aimee/chat-simple returns.
+    """
+    
+    def encode(event: Dict[str, Any]) -> str:
+        return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+    
+    async def events():
+        started = time.perf_counter()
+        sent = set()
+        reply = AIMEE_VOICE_FALLBACK
+        
+        cacheable = not request.context
+        cached = None
+        if cacheable:
+            cached = llm_response_cache.get("aimee_chat_stream", request.message, version=AIMEE_VOICE_VERSION)
+        else:
+            llm_response_cache.bypass("aimee_chat_stream")
+        
+        if cached is not None:
+            reply = cached
+        elif not HAS_GEMINI or not GOOGLE_API_KEY:
+            logger.warning("[AIMEE] Gemini not available - using fallback response")
+        else:
+            parser = JSONFieldStream()
+            parse_failed = False
+            text = []
+            try:
+                async for chunk in gemini_chat.stream(
+                    request.message,
+                    system_instruction=AIMEE_VOICE_PROMPT,
+                    history=voice_history(request.context),
+                    generation_config=AIMEE_VOICE_CONFIG
+                ):
+                    text.append(chunk)
+                    yield encode({"type": "token", "text": chunk})
+                    if parse_failed:
+                        continue
+                    try:
+                        completed = parser.feed(chunk)
+                    except ValueError:
+                        parse_failed = True  # not JSON after all: "done" carries the raw text
+                        continue
+                    for name, value in completed:
+                        if name in VOICE_FIELDS and name not in sent and isinstance(value, str):
+                            sent.add(name)
+                            yield encode({
+                                "type": "field",
+                                "name": name,
+                                "value": clean_spoken_text(value) if name == "spokenText" else value,
+                                "elapsed_ms": int((time.perf_counter() - started) * 1000)
+                            })
+                reply, parsed = parse_voice_reply("".join(text))
+                if cacheable and parsed:
+                    llm_response_cache.set("aimee_chat_stream", request.message, reply, version=AIMEE_VOICE_VERSION)
+                logger.info(f"[AIMEE] Streamed voice response for: {request.message[:30]}...")
+            except Exception as e:
+                logger.error(f"[AIMEE] Chat stream error: {e}")
+                yield encode({"type": "error", "error": "AI temporarily unavailable"})
+                reply = AIMEE_VOICE_ERROR
+        
+        # Fields the parser didn't deliver (cache hit, fallback, raw-text reply or error)
+        for name in VOICE_FIELDS:
+            if name not in sent:
+                yield encode({"type": "field", "name": name, "value": reply[name]})
+        yield encode({"type": "done", **reply, "cached": cached is not None, "elapsed_ms": int((time.perf_counter() - started) * 1000)})
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@api_router.get("/aimee/llm/stats")
+async def aimee_llm_stats():
+    """Gemini concurrency: in flight, queue depth, rejections, cached models"""
+    return gemini_chat.stats()
+
+@api_router.get("/llm/response-cache/stats")
+async def llm_response_cache_stats():
+    """Response cache size and per-endpoint exact/similar hit rates"""
+    return llm_response_cache.stats()
 
 # ============================================
 # AIMEE TEXT-TO-SPEECH APIs 
@@ -1329,6 +1560,7 @@ from crm_service import (
     BusinessVertical, LeadSource, LeadStage, DoerDivision, UrgencyLevel,
     GTMMetrics, CURRENT_ORDERS
 )
+from crm_counters import insert_lead, update_lead_counted, pipeline_summary, rebuild_pipeline_counters
 
 # --- LEADS ---
 
@@ -1358,9 +1590,10 @@ async def create_lead(data: LeadCreate):
         tags=data.tags
     )
     
-    # Save to database
-    lead_dict = lead.model_dump()
-    await db.crm_leads.insert_one(lead_dict)
+    # Save to database (and count it in the pipeline counters)
+    lead_dict = lead.model_dump(mode="json")
+    await insert_lead(db, lead_dict)
+    crm_verticals_cache.invalidate()
     
     return {"success": True, "lead": lead_dict}
 
@@ -1388,9 +1621,9 @@ async def get_lead(lead_id: str):
 async def update_lead(lead_id: str, updates: Dict[str, Any]):
     """Update a lead"""
     updates["updated_at"] = utc_now()
-    result = await db.crm_leads.update_one({"id": lead_id}, {"$set": updates})
-    if result.modified_count == 0:
+    if not await update_lead_counted(db, lead_id, updates):
         raise HTTPException(status_code=404, detail="Lead not found")
+    crm_verticals_cache.invalidate()
     return {"success": True, "message": "Lead updated"}
 
 # --- BUSINESS ORDERS (Your 3 current projects) ---
@@ -1407,6 +1640,7 @@ async def get_orders():
             order_dict = order.model_dump()
             await db.crm_orders.insert_one(order_dict)
         db_orders = [o.model_dump() for o in CURRENT_ORDERS]
+        crm_verticals_cache.invalidate()
     
     return {"orders": db_orders, "total": len(db_orders)}
 
@@ -1425,6 +1659,7 @@ async def update_order(order_id: str, updates: Dict[str, Any]):
     result = await db.crm_orders.update_one({"id": order_id}, {"$set": updates})
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Order not found")
+    crm_verticals_cache.invalidate()
     return {"success": True, "message": "Order updated"}
 
 @api_router.post("/crm/orders")
@@ -1438,6 +1673,7 @@ async def create_order(data: Dict[str, Any]):
     data["progress"] = data.get("progress", 0)
     
     await db.crm_orders.insert_one(data)
+    crm_verticals_cache.invalidate()
     return {"success": True, "order_id": order_id}
 
 # --- GTM METRICS (10K Users by Dubai) ---
@@ -1496,48 +1732,48 @@ async def update_gtm_metrics(updates: Dict[str, Any]):
 
 @api_router.get("/crm/pipeline")
 async def get_pipeline():
-    """Get GTM pipeline summary - New Path stages"""
-    leads = await db.crm_leads.find({}, {"_id": 0}).to_list(1000)
-    deals = await db.crm_deals.find({}, {"_id": 0}).to_list(1000)
-    
-    pipeline = {
-        "stages": {
-            "audience": len([l for l in leads if l.get("stage") == "audience"]),
-            "vibed": len([l for l in leads if l.get("stage") == "vibed"]),
-            "engaged": len([l for l in leads if l.get("stage") == "engaged"]),
-            "launched": len([l for l in leads if l.get("stage") == "launched"]),
-            "community_plus": len([l for l in leads if l.get("stage") == "community_plus"]),
-            "ai_automated": len([l for l in leads if l.get("stage") == "ai_automated"]),
-            "repeat": len([l for l in leads if l.get("stage") == "repeat"]),
-        },
-        "total_leads": len(leads),
-        "total_deals": len(deals),
-        "total_value": sum(d.get("value", 0) for d in deals),
-        "avg_vibe_score": sum(l.get("vibe_score", 0) for l in leads) / max(1, len(leads))
-    }
-    
-    return pipeline
+    """Get GTM pipeline summary - New Path stages (from maintained counters, O(1) in leads)"""
+    return await pipeline_summary(db)
+
+@api_router.post("/crm/pipeline/rebuild")
+async def rebuild_pipeline():
+    """Recount the pipeline counters from crm_leads"""
+    return {"success": True, "counters": await rebuild_pipeline_counters(db)}
 
 # --- VERTICALS ---
 
-@api_router.get("/crm/verticals")
-async def get_verticals():
-    """Get all business verticals and their status"""
+# Lead/order counts per vertical; lead and order writes below invalidate it
+crm_verticals_cache = TTLCache(ttl=float(os.environ.get("CRM_VERTICALS_TTL_SECONDS", "60")), maxsize=1)
+
+VERTICAL_COUNT_PIPELINE = [{"$group": {"_id": "$vertical", "count": {"$sum": 1}}}]
+
+async def compute_verticals():
+    """One $group per collection, run concurrently (was two count_documents per vertical)"""
+    lead_rows, order_rows = await asyncio.gather(
+        db.crm_leads.aggregate(VERTICAL_COUNT_PIPELINE).to_list(None),
+        db.crm_orders.aggregate(VERTICAL_COUNT_PIPELINE).to_list(None)
+    )
+    lead_counts = {row["_id"]: row["count"] for row in lead_rows}
+    order_counts = {row["_id"]: row["count"] for row in order_rows}
+    
     verticals = []
     for v in BusinessVertical:
-        leads = await db.crm_leads.count_documents({"vertical": v.value})
-        orders = await db.crm_orders.count_documents({"vertical": v.value})
-        
+        orders = order_counts.get(v.value, 0)
         verticals.append({
             "id": v.value,
             "name": v.value.replace("_", " ").title(),
-            "leads": leads,
+            "leads": lead_counts.get(v.value, 0),
             "orders": orders,
             "active": orders > 0
         })
     
     return {"verticals": verticals}
 
+@api_router.get("/crm/verticals")
+async def get_verticals():
+    """Get all business verticals and their status"""
+    return await crm_verticals_cache.get_or_compute("verticals", compute_verticals)
+
 # --- DASHBOARD ---
 
 @api_router.get("/crm/dashboard")
@@ -1563,6 +1799,7 @@ async def get_crm_dashboard():
                 order_dict = order.model_dump()
                 await db.crm_orders.insert_one(order_dict)
             active_orders = [o.model_dump() for o in CURRENT_ORDERS]
+            crm_verticals_cache.invalidate()
         else:
             active_orders = all_orders
     
@@ -1856,6 +2093,11 @@ async def gemma_career_data(language: str = "en", category: str = "lig_workers")
     data = gemma_service.get_career_data(category, language)
     return data
 
+@api_router.get("/gemma/cache-stats")
+async def gemma_cache_stats():
+    """Online answer cache: size, memory use, evictions, hit rate"""
+    return gemma_service.answers.stats()
+
 @api_router.get("/gemma/offline-cache")
 async def gemma_offline_cache():
     """Get all offline cached data for PWA sync"""
@@ -2219,6 +2461,26 @@ async def send_welcome_notification(name: str, phone: str, role: str):
     result = await whatsapp_service.send_welcome_notification(name, phone, role)
     return {"success": True, "message_id": result.id, "status": result.status}
 
+# ============================================
+# DATABASE INDEXES
+# ============================================
+
+from db_indexes import ensure_database, apply_indexes, index_report
+
+@api_router.get("/db/indexes")
+async def get_db_indexes():
+    """Registered indexes per collection with $indexStats usage, missing and unused ones"""
+    task = db_setup["task"]
+    return {
+        **await index_report(db),
+        "startup": {"running": task is not None and not task.done(), "result": db_setup["result"]}
+    }
+
+@api_router.post("/db/indexes/apply")
+async def apply_db_indexes():
+    """Create any missing registry indexes now"""
+    return await apply_indexes(db)
+
 import hashlib  # Add at top if not already there
 
 # Include routers
@@ -2239,6 +2501,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_http_clients():
+    await job_aggregator.startup()
+    if os.environ.get("JOB_SEARCH_CACHE_PERSIST", "true").lower() == "true":
+        await job_aggregator.cache.attach_collection(db.job_search_cache)
+    if os.environ.get("GEMMA_CACHE_PERSIST", "true").lower() == "true":
+        await gemma_service.answers.attach_collection(db.gemma_answer_cache)
+    if os.environ.get("JOB_INGEST_ENABLED", "false").lower() == "true":
+        await job_ingestion.start()
+
+# Index builds and migrations can take minutes on large collections, so they run in
+# the background instead of holding up startup
+db_setup: Dict[str, Any] = {"task": None, "result": None}
+
+async def run_database_setup():
+    try:
+        result = await ensure_database(db)
+        db_setup["result"] = result
+        logger.info(f"DB indexes: {result['ensured']} ensured, migrations run: {result['migrations'] or 'none'}")
+    except Exception as e:
+        db_setup["result"] = {"error": str(e)}
+        logger.warning(f"DB indexes/migrations not applied: {e}")
+
+@app.on_event("startup")
+async def startup_db_indexes():
+    if os.environ.get("DB_ENSURE_INDEXES", "true").lower() != "true":
+        return
+    db_setup["task"] = asyncio.create_task(run_database_setup())
+
+@app.on_event("startup")
+async def startup_mission_board_live():
+    captain_command.start_live_relay()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if db_setup["task"] is not None and not db_setup["task"].done():
+        db_setup["task"].cancel()
+        await asyncio.gather(db_setup["task"], return_exceptions=True)
+    await captain_command.stop_live_relay()
+    await job_ingestion.stop()
+    await job_aggregator.close()
+    await gemma_service.answers.close()
+    gemini_chat.close()
     client.close()
@@ -0,0 +1,85 @@
+# ============================================
+# TTL CACHE - Short-lived cache for computed dashboard results
+# Concurrent misses share one computation; failures are not cached
+# ============================================
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import time
+
+class TTLCache:
+    """
+    In-process cache of async computations, keyed by any hashable
+    - entries live ttl seconds; at most maxsize are kept (least recently used evicted)
+    - concurrent get_or_compute calls for a missing key await one computation
+    - invalidate(key) on writes that change the result; invalidate() clears everything
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self.stats_counters = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if self.clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            self.stats_counters["hits"] += 1
+            return value
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats_counters["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        self.stats_counters["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved: waiters re-raise it, nobody else needs to
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        # A write invalidated the cache while we computed: serve, but don't store
+        if generation == self._generation and self.ttl > 0:
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        self.stats_counters["invalidations"] += 1
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._entries), "ttl_seconds": self.ttl, **self.stats_counters}
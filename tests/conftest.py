@@ -0,0 +1,50 @@
+"""
+Shared fixtures for the in-process tests
+"""
+
+import os
+import uuid
+
+import pytest
+
+TEST_MONGO_URL = os.environ.get("TEST_MONGO_URL", "mongodb://localhost:27017")
+
+
+class FakeClock:
+    """Injectable clock for TTL/expiry tests; advance it with clock.now += seconds"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def mongo_url():
+    """URL of a reachable local mongod (tests using it are skipped without one)"""
+    pymongo = pytest.importorskip("pymongo")
+    client = pymongo.MongoClient(TEST_MONGO_URL, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except Exception:
+        pytest.skip(f"No mongod at {TEST_MONGO_URL}")
+    finally:
+        client.close()
+    return TEST_MONGO_URL
+
+
+@pytest.fixture
+def mongo_db_name(mongo_url):
+    """Throwaway database name, dropped after the test"""
+    import pymongo
+    name = f"rightdoers_test_{uuid.uuid4().hex[:8]}"
+    yield name
+    client = pymongo.MongoClient(mongo_url)
+    client.drop_database(name)
+    client.close()
@@ -0,0 +1,197 @@
+"""
+Activity Feed Tests
+k-way merge, opaque cursors and paging (Mongo test needs a local mongod)
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from activity_feed import ActivityFeed, FeedSource, decode_cursor, encode_cursor, merge_newest_first  # noqa: E402
+
+
+def matches(doc, query):
+    """The subset of Mongo query operators FeedSource.query produces"""
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(matches(doc, q) for q in condition):
+                return False
+        elif field == "$or":
+            if not any(matches(doc, q) for q in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(field)
+            if "$lt" in condition and not (value is not None and value < condition["$lt"]):
+                return False
+            if "$ne" in condition and value == condition["$ne"]:
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class ListCursor:
+    def __init__(self, docs, collection):
+        self.docs = docs
+        self.collection = collection
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            self.collection.read += 1
+            yield dict(doc)
+
+
+class ListCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.read = 0
+
+    def find(self, query, projection=None):
+        return ListCursor([doc for doc in self.docs if matches(doc, query)], self)
+
+
+def sample_db(n=200, seed=7):
+    rng = random.Random(seed)
+
+    def stamp(i):
+        return f"2025-12-{1 + i % 28:02d}T{rng.randrange(24):02d}:{rng.randrange(60):02d}:00+00:00"
+
+    return {
+        "leaders": ListCollection([
+            {"id": f"L{i:04d}", "at": stamp(i), "status": "active" if i % 4 else "replaced"} for i in range(n)
+        ]),
+        "sessions": ListCollection([
+            {"id": f"S{i:04d}", "started": stamp(i), "status": "kata_1" if i % 5 else "not_started"} for i in range(n)
+        ]),
+        "milestones": ListCollection([{"id": f"M{i:04d}", "ts": stamp(i)} for i in range(n)]),
+    }
+
+
+def sample_feed():
+    def entry(field, kind):
+        return lambda doc: {"id": doc["id"], "timestamp": doc[field], "type": kind}
+
+    return ActivityFeed([
+        FeedSource("leaders", "at", entry("at", "leader"), filter={"status": "active"}),
+        FeedSource("sessions", "started", entry("started", "session"), filter={"status": {"$ne": "not_started"}}),
+        FeedSource("milestones", "ts", entry("ts", "milestone")),
+    ])
+
+
+def expected_order(db):
+    entries = [(doc["at"], doc["id"]) for doc in db["leaders"].docs if doc["status"] == "active"]
+    entries += [(doc["started"], doc["id"]) for doc in db["sessions"].docs if doc["status"] != "not_started"]
+    entries += [(doc["ts"], doc["id"]) for doc in db["milestones"].docs]
+    return [entry_id for _, entry_id in sorted(entries, reverse=True)]
+
+
+class TestCursor:
+    """Test cursor encoding"""
+
+    def test_round_trip_and_rejects_garbage(self):
+        cursor = encode_cursor({"timestamp": "2025-12-01T00:00:00+00:00", "id": "L1"})
+        assert decode_cursor(cursor) == ("2025-12-01T00:00:00+00:00", "L1")
+        assert "=" not in cursor
+        for bad in ("", "not-a-cursor", encode_cursor({"timestamp": 1, "id": "x"})):
+            with pytest.raises(ValueError):
+                decode_cursor(bad)
+
+
+class TestMerge:
+    """Test the k-way merge"""
+
+    def test_merges_sorted_streams(self):
+        async def stream(keys):
+            for key in keys:
+                yield {"timestamp": key, "id": key}
+
+        async def scenario():
+            merged = merge_newest_first([stream(["9", "5", "1"]), stream([]), stream(["8", "7", "2"]), stream(["6"])])
+            return [entry["id"] async for entry in merged]
+
+        assert asyncio.run(scenario()) == ["9", "8", "7", "6", "5", "2", "1"]
+
+
+class TestActivityFeed:
+    """Test paging over several collections"""
+
+    def test_pages_cover_feed_in_order(self):
+        db = sample_db()
+
+        async def scenario():
+            feed = sample_feed()
+            pages = [await feed.page(db, limit=25)]
+            while pages[-1]["has_more"]:
+                pages.append(await feed.page(db, limit=25, before=pages[-1]["next_cursor"]))
+            return pages
+
+        pages = asyncio.run(scenario())
+        ids = [entry["id"] for page in pages for entry in page["activities"]]
+        assert ids == expected_order(db)
+        assert all(len(page["activities"]) == 25 for page in pages[:-1])
+        assert pages[-1]["next_cursor"] is None
+        print(f"✓ {len(pages)} pages, {len(ids)} entries in newest-first order with no gaps or repeats")
+
+    def test_page_reads_are_bounded(self):
+        db = sample_db(n=2000)
+        asyncio.run(sample_feed().page(db, limit=15))
+        assert sum(collection.read for collection in db.values()) <= 3 * 16
+
+    def test_ties_on_timestamp_break_by_id(self):
+        db = {
+            "leaders": ListCollection([{"id": f"L{i}", "at": "2025-12-01", "status": "active"} for i in range(5)]),
+            "sessions": ListCollection([{"id": f"S{i}", "started": "2025-12-01", "status": "kata_1"} for i in range(5)]),
+            "milestones": ListCollection([]),
+        }
+
+        async def scenario():
+            feed = sample_feed()
+            first = await feed.page(db, limit=4)
+            second = await feed.page(db, limit=4, before=first["next_cursor"])
+            third = await feed.page(db, limit=4, before=second["next_cursor"])
+            return first, second, third
+
+        pages = asyncio.run(scenario())
+        ids = [entry["id"] for page in pages for entry in page["activities"]]
+        assert ids == ["S4", "S3", "S2", "S1", "S0", "L4", "L3", "L2", "L1", "L0"]
+        assert pages[2]["has_more"] is False
+
+
+class TestActivityFeedMongo:
+    """Paging against a real mongod"""
+
+    def test_pages_match_full_sort(self, mongo_url, mongo_db_name):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        db_docs = sample_db(n=500)
+
+        async def scenario():
+            client = AsyncIOMotorClient(mongo_url)
+            db = client[mongo_db_name]
+            for name, collection in db_docs.items():
+                await db[name].insert_many([dict(doc) for doc in collection.docs])
+            feed = sample_feed()
+            pages = [await feed.page(db, limit=40)]
+            while pages[-1]["has_more"]:
+                pages.append(await feed.page(db, limit=40, before=pages[-1]["next_cursor"]))
+            client.close()
+            return pages
+
+        pages = asyncio.run(scenario())
+        assert [entry["id"] for page in pages for entry in page["activities"]] == expected_order(db_docs)
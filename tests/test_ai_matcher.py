@@ -0,0 +1,221 @@
+"""
+AI Job Matcher Tests
+In-process tests for DoersScore™ job matching (no server required)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from ai_matcher import AIJobMatcher, JobFeatureCache, KeywordMatcher, ProfileMatchInput  # noqa: E402
+
+
+@pytest.fixture
+def matcher():
+    return AIJobMatcher()
+
+
+class TestKeywordMatcher:
+    """Test shared keyword scanning"""
+    
+    def test_find_matches_substring_semantics(self):
+        """Every keyword contained in the text is returned, including overlapping ones"""
+        km = KeywordMatcher(["design", "designer", "hr", "social", "social media", "data", "analyst"])
+        text = "senior designer for social media through data-analyst teams"
+        
+        assert km.find(text) == {kw for kw in km.keywords if kw in text}
+        assert km.find(text) == {"design", "designer", "hr", "social", "social media", "data", "analyst"}
+        print("✓ KeywordMatcher finds overlapping keywords")
+    
+    def test_hits_are_memoized(self):
+        """any_of() agrees with any(kw in text) and all() returns every hit"""
+        km = KeywordMatcher(["sales", "manager", "nursing"])
+        hits = km.scan("regional sales manager")
+        
+        assert hits.any_of(["nursing", "sales"]) is True
+        assert hits.any_of(["nursing"]) is False
+        assert hits.all() == {"sales", "manager"}
+        print("✓ KeywordHits memoizes lookups")
+
+
+class TestSkillInterestScores:
+    """Scores must be identical to the original per-keyword scans"""
+    
+    def test_skill_match_via_category_keywords(self, matcher):
+        """A skill not in the text matches through its SKILL_KEYWORDS category"""
+        score, reasons = matcher.calculate_skill_match(
+            ["Data Analysis", "Fashion Design"], [], "Business Analyst", "Build sql dashboards"
+        )
+        assert score == 50
+        assert reasons == ["Matched skill: Data Analysis"]
+
+    def test_skill_categories_memoized_per_instance(self, matcher):
+        """Matchers with different keyword tables don't share memoized categories"""
+        class NarrowMatcher(AIJobMatcher):
+            SKILL_KEYWORDS = {"Data Analysis": ["sql"]}
+
+        assert len(matcher.skill_categories("sql")) == 1
+        assert matcher.skill_categories("sql") is matcher.skill_categories("sql")
+        assert NarrowMatcher().skill_categories("sql") == (["sql"],)
+
+    def test_interest_match(self, matcher):
+        """Only interests >= 50 whose keywords appear in the job text count"""
+        score, reasons = matcher.calculate_interest_match(
+            {"Artistic": 73, "Enterprising": 64, "Social": 40},
+            "Creative Lead", "Own the sales pitch deck"
+        )
+        assert score == int((73 + 64) / 2)
+        assert reasons == ["Aligns with Artistic interest (73%)", "Aligns with Enterprising interest (64%)"]
+    
+    def test_match_job_to_profile(self, matcher):
+        """Full match for a job without structured skills"""
+        profile = ProfileMatchInput(
+            doers_score=820,
+            adaptive_level="PROFESSIONAL",
+            career_interests={"Artistic": 73},
+            skills=["Fashion Design", "Sustainability"],
+            salary_expectation_min=1200000
+        )
+        job = {
+            "id": "job_1", "title": "Apparel Designer", "company_name": "FabIndia",
+            "description": "Create sustainability-first textile collections",
+            "required_experience_years": 8, "salary_min": 1500000, "salary_max": 2000000
+        }
+        result = matcher.match_job_to_profile(profile, job)
+        
+        assert result.skill_match_score == 100
+        assert result.interest_match_score == 73
+        assert result.level_match_score == 100
+        assert result.salary_match_score == 100
+        assert result.overall_match_score == 100
+        assert result.recommendation == "perfect_match"
+
+
+class TestJobFeatureCache:
+    """Test per-job feature reuse across profiles"""
+    
+    def test_features_reused_across_profiles(self, matcher):
+        """Ranking the same feed for two profiles parses each job once"""
+        jobs = [
+            {"id": "a", "title": "Data Analyst", "description": "sql dashboards"},
+            {"id": "b", "title": "Sales Executive", "description": "client meetings"}
+        ]
+        matcher.rank_jobs_for_profile(ProfileMatchInput(skills=["SQL"]), jobs)
+        matcher.rank_jobs_for_profile(ProfileMatchInput(skills=["Sales"]), jobs)
+        
+        stats = matcher.feature_cache.stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 2
+        print("✓ JobFeatures reused across profiles")
+    
+    def test_content_change_invalidates(self, matcher):
+        """Same job id with edited content is re-parsed"""
+        job = {"id": "a", "title": "Data Analyst", "description": "sql"}
+        first = matcher.get_job_features(job)
+        assert matcher.get_job_features(dict(job)) is first
+        
+        edited = matcher.get_job_features({**job, "description": "excel"})
+        assert edited is not first
+        assert edited.job_text == "data analyst excel"
+    
+    def test_lru_eviction(self, matcher):
+        """Least recently used entries are evicted past maxsize"""
+        cache = JobFeatureCache(maxsize=2)
+        for job_id in ["a", "b", "a", "c"]:
+            job = {"id": job_id, "title": job_id, "description": ""}
+            features = cache.get(job_id, 0)
+            if features is None:
+                cache.put(job_id, matcher.build_job_features(job, 0))
+        
+        assert len(cache) == 2
+        assert cache.get("b", 0) is None
+        assert cache.get("a", 0) is not None
+        assert cache.stats()["evictions"] == 1
+    
+    def test_salary_midpoint_and_bits(self, matcher):
+        """Salary midpoint and keyword bitset are precomputed per job"""
+        features = matcher.build_job_features(
+            {"title": "Sales Manager", "description": "", "salary_min": 600000, "salary_max": 1000000}
+        )
+        assert features.salary_mid == 800000
+        
+        km = matcher.keyword_matcher
+        bits = features.keyword_bits(km)
+        assert {kw for kw in km.keywords if bits >> km.index[kw] & 1} == {"sales", "manager"}
+
+
+def _random_profiles_and_jobs(seed: int, n: int = 25, m: int = 60):
+    import random
+    rng = random.Random(seed)
+    skills = ["Python", "SQL", "Fashion Design", "Sales", "Marketing", "Team Lead", "Nursing",
+              "Excel", "React.js", "Textile", "python", "Data Analysis", "Coding", "HR"]
+    interests = ["Artistic", "Enterprising", "Social", "Realistic", "Investigative", "Conventional", "Unknown"]
+    words = ("engineer data analyst sales manager nurse hospital teacher designer creative apparel "
+             "sql excel python client account social media hr through coordinator driver").split()
+    profiles = [
+        ProfileMatchInput(
+            doers_score=rng.choice([500, 650, 700, 750, 900]),
+            adaptive_level=rng.choice(["PARA", "ASSOCIATE", "MANAGER", "PROFESSIONAL", "EXPERT", "OTHER"]),
+            skills=[rng.choice(skills) for _ in range(rng.randint(0, 6))],
+            career_interests={i: rng.randint(20, 95) for i in rng.sample(interests, rng.randint(0, 4))},
+            salary_expectation_min=rng.choice([None, 0, 300000, 900000]),
+            salary_expectation_max=rng.choice([None, 1500000])
+        )
+        for _ in range(n)
+    ]
+    jobs = [
+        {
+            "id": f"job_{j}",
+            "title": " ".join(rng.sample(words, 2)),
+            "description": " ".join(rng.choice(words) for _ in range(rng.randint(0, 30))),
+            "required_skills": [rng.choice(skills) for _ in range(rng.choice([0, 0, 1, 3]))],
+            "required_experience_years": rng.choice([None, 0, 1, 2, 4, 7, 12]),
+            "salary_min": rng.choice([None, 0, 250000, 800000]),
+            "salary_max": rng.choice([None, 1200000, 2500000])
+        }
+        for j in range(m)
+    ]
+    return profiles, jobs
+
+
+class TestScoreMatrix:
+    """Vectorized N x M scorer must match the scalar scorer exactly"""
+    
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_matches_scalar_scores(self, matcher, seed):
+        profiles, jobs = _random_profiles_and_jobs(seed)
+        result = matcher.score_matrix(profiles, jobs, top_k=10)
+        
+        for i, profile in enumerate(profiles):
+            for j, job in enumerate(jobs):
+                scalar = matcher.match_job_to_profile(profile, job)
+                assert result["overall"][i, j] == scalar.overall_match_score
+                assert result["skill"][i, j] == scalar.skill_match_score
+                assert result["interest"][i, j] == scalar.interest_match_score
+                assert result["level"][i, j] == scalar.level_match_score
+                assert result["salary"][i, j] == scalar.salary_match_score
+    
+    def test_top_k_matches_ranking(self, matcher):
+        """top_k indices follow rank_jobs_for_profile order (stable on ties)"""
+        profiles, jobs = _random_profiles_and_jobs(7, n=5)
+        result = matcher.score_matrix(profiles, jobs, top_k=15)
+        
+        assert result["top_k"].shape == (5, 15)
+        for i, profile in enumerate(profiles):
+            ranked = matcher.rank_jobs_for_profile(profile, jobs)[:15]
+            assert [jobs[j]["id"] for j in result["top_k"][i]] == [r["id"] for r in ranked]
+        print("✓ score_matrix matches scalar ranking")
+    
+    def test_rank_top_k_matches_full_ranking(self, matcher):
+        """rank_jobs_for_profile(top_k=k) returns the first k of the full ranking"""
+        profiles, jobs = _random_profiles_and_jobs(9, n=4)
+        for profile in profiles:
+            full = matcher.rank_jobs_for_profile(profile, jobs)
+            scores = matcher.score_jobs_for_profile(profile, jobs)
+            
+            assert matcher.rank_jobs_for_profile(profile, jobs, top_k=10) == full[:10]
+            assert matcher.rank_jobs_for_profile(profile, jobs, top_k=10, scores=scores) == full[:10]
+            assert sorted(scores, reverse=True) == [j["match_score"] for j in full]
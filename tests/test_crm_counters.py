@@ -0,0 +1,92 @@
+"""
+CRM Pipeline Counter Tests
+Counter deltas and funnel; maintained counters vs $group rebuild against a local mongod
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from crm_counters import (  # noqa: E402
+    lead_counter_delta, funnel, insert_lead, update_lead_counted,
+    rebuild_pipeline_counters, pipeline_summary, PIPELINE_COUNTERS_ID
+)
+
+
+class TestCounterDeltas:
+    """Test the $inc documents for lead writes"""
+
+    def test_create(self):
+        assert lead_counter_delta(None, {"stage": "audience", "vibe_score": 70}) == {
+            "total_leads": 1, "vibe_score_sum": 70, "stages.audience": 1
+        }
+
+    def test_stage_change_moves_one_lead(self):
+        before = {"stage": "audience", "vibe_score": 70}
+        assert lead_counter_delta(before, {"stage": "vibed", "vibe_score": 80}) == {
+            "vibe_score_sum": 10, "stages.audience": -1, "stages.vibed": 1
+        }
+        assert lead_counter_delta(before, dict(before)) == {}
+        print("✓ Stage change is -1/+1, unchanged lead is a no-op")
+
+    def test_model_dump_stage_enum(self):
+        """A Lead dumped without mode="json" still counts under the stage value"""
+        from crm_service import Lead, LeadStage
+        lead = Lead(name="Asha", vertical="edtech", stage=LeadStage.VIBED, vibe_score=65)
+        expected = {"total_leads": 1, "vibe_score_sum": 65, "stages.vibed": 1}
+
+        assert lead_counter_delta(None, lead.model_dump()) == expected
+        assert lead_counter_delta(None, lead.model_dump(mode="json")) == expected
+
+    def test_non_numeric_vibe_counts_as_zero(self):
+        assert lead_counter_delta({"stage": "vibed", "vibe_score": 60}, {"stage": "vibed", "vibe_score": "high"}) == {"vibe_score_sum": -60}
+
+    def test_funnel_reached_and_conversion(self):
+        rows = funnel({"audience": 50, "vibed": 30, "engaged": 20, "qualified": 99})
+        assert [(row["stage"], row["count"], row["reached"]) for row in rows[:3]] == [
+            ("audience", 50, 100), ("vibed", 30, 50), ("engaged", 20, 20)
+        ]
+        assert rows[0]["conversion"] is None and rows[1]["conversion"] == 0.5 and rows[3]["conversion"] == 0.0
+        assert rows[4]["conversion"] is None
+
+
+class TestCountersMongo:
+    """Maintained counters match a full recount"""
+
+    def test_counters_match_rebuild(self, mongo_url, mongo_db_name):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        stages = ["audience", "vibed", "engaged", "launched"]
+
+        async def scenario():
+            client = AsyncIOMotorClient(mongo_url)
+            db = client[mongo_db_name]
+            await db.crm_leads.insert_one({"id": "OLD-1", "stage": "audience", "vibe_score": 40})  # before counters existed
+            first = await pipeline_summary(db)
+
+            await asyncio.gather(*(
+                insert_lead(db, {"id": f"LEAD-{i}", "stage": "audience", "vibe_score": i % 100})
+                for i in range(1500)
+            ))
+            # Concurrent stage moves, several per lead
+            await asyncio.gather(*(
+                update_lead_counted(db, f"LEAD-{i % 300}", {"stage": stages[i % len(stages)], "vibe_score": i % 7})
+                for i in range(1200)
+            ))
+            missing = await update_lead_counted(db, "NOPE", {"stage": "vibed"})
+
+            maintained = await db.crm_pipeline_counters.find_one({"_id": PIPELINE_COUNTERS_ID})
+            summary = await pipeline_summary(db)
+            rebuilt = await rebuild_pipeline_counters(db)
+            client.close()
+            return first, maintained, summary, rebuilt, missing
+
+        first, maintained, summary, rebuilt, missing = asyncio.run(scenario())
+        assert first["total_leads"] == 1 and first["stages"]["audience"] == 1
+        assert missing is False
+        assert maintained["total_leads"] == rebuilt["total_leads"] == 1501
+        assert {k: v for k, v in maintained["stages"].items() if v} == rebuilt["stages"]
+        assert maintained["vibe_score_sum"] == rebuilt["vibe_score_sum"]
+        assert summary["total_leads"] == 1501 and summary["total_deals"] == 0
+        print("✓ Counters after 1500 inserts + 1200 concurrent updates equal a $group recount")
@@ -0,0 +1,142 @@
+"""
+CRM Verticals Tests
+Per-vertical lead/order counts, caching and invalidation on CRM writes (no server required)
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "rightdoers_test")
+
+import server  # noqa: E402
+from crm_service import BusinessVertical  # noqa: E402
+
+
+class RowsCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def to_list(self, length):
+        return self.rows
+
+
+class UpdateResult:
+    def __init__(self, modified_count):
+        self.modified_count = modified_count
+
+
+class DocsCollection:
+    """In-memory stand-in for the Motor calls the CRM endpoints make; runs the $group stage"""
+
+    def __init__(self, docs=()):
+        self.docs = [dict(doc) for doc in docs]
+        self.aggregations = 0
+
+    def _matches(self, query):
+        return [doc for doc in self.docs if all(doc.get(field) == value for field, value in query.items())]
+
+    def aggregate(self, pipeline):
+        self.aggregations += 1
+        (stage,) = pipeline
+        field = stage["$group"]["_id"].lstrip("$")
+        counts = {}
+        for doc in self.docs:
+            counts[doc.get(field)] = counts.get(doc.get(field), 0) + 1
+        return RowsCursor([{"_id": key, "count": count} for key, count in counts.items()])
+
+    async def insert_one(self, doc):
+        self.docs.append(doc)
+
+    async def update_one(self, query, update, upsert=False):
+        matched = self._matches(query)[:1]
+        for doc in matched:
+            doc.update(update.get("$set", {}))
+        return UpdateResult(len(matched))
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=None):
+        for doc in self._matches(query)[:1]:
+            before = {field: doc.get(field) for field in ("stage", "vibe_score")}
+            doc.update(update["$set"])
+            return before
+        return None
+
+
+class CrmDB:
+    def __init__(self, leads, orders):
+        self.crm_leads = DocsCollection(leads)
+        self.crm_orders = DocsCollection(orders)
+        self.crm_pipeline_counters = DocsCollection()
+
+
+@pytest.fixture
+def crm_db(monkeypatch):
+    fake = CrmDB(
+        leads=[
+            {"id": "L1", "vertical": "edtech", "stage": "audience", "vibe_score": 50},
+            {"id": "L2", "vertical": "edtech", "stage": "vibed", "vibe_score": 70},
+            {"id": "L3", "vertical": "fintech", "stage": "audience", "vibe_score": 40},
+            {"id": "L4", "vertical": "retired_vertical", "stage": "audience", "vibe_score": 10},
+        ],
+        orders=[{"id": "O1", "vertical": "edtech", "status": "active"}]
+    )
+    monkeypatch.setattr(server, "db", fake)
+    server.crm_verticals_cache.invalidate()
+    yield fake
+    server.crm_verticals_cache.invalidate()
+
+
+def _by_id(result):
+    return {row["id"]: row for row in result["verticals"]}
+
+
+class TestVerticalCounts:
+    """Test the merged $group counts"""
+
+    def test_every_vertical_listed_with_merged_counts(self, crm_db):
+        verticals = _by_id(asyncio.run(server.get_verticals()))
+
+        assert list(verticals) == [v.value for v in BusinessVertical]
+        assert verticals["edtech"] == {"id": "edtech", "name": "Edtech", "leads": 2, "orders": 1, "active": True}
+        assert (verticals["fintech"]["leads"], verticals["fintech"]["orders"], verticals["fintech"]["active"]) == (1, 0, False)
+        assert (verticals["hrtech"]["leads"], verticals["hrtech"]["orders"]) == (0, 0)
+        assert "retired_vertical" not in verticals
+        print("✓ Zero-count verticals listed, leads and orders merged")
+
+    def test_one_group_per_collection(self, crm_db):
+        async def scenario():
+            await server.get_verticals()
+            await server.get_verticals()
+
+        asyncio.run(scenario())
+        assert (crm_db.crm_leads.aggregations, crm_db.crm_orders.aggregations) == (1, 1)
+
+
+class TestVerticalInvalidation:
+    """CRM writes drop the cached counts"""
+
+    def test_lead_and_order_writes_invalidate(self, crm_db):
+        async def scenario():
+            counts = [_by_id(await server.get_verticals())]
+            await server.create_lead(server.LeadCreate(name="Meera", vertical="hrtech"))
+            counts.append(_by_id(await server.get_verticals()))
+            order = await server.create_order({"vertical": "hrtech"})
+            counts.append(_by_id(await server.get_verticals()))
+            await server.update_order(order["order_id"], {"vertical": "fintech"})
+            counts.append(_by_id(await server.get_verticals()))
+            await server.update_lead("L3", {"vertical": "edtech"})
+            counts.append(_by_id(await server.get_verticals()))
+            return counts
+
+        initial, after_lead, after_order, after_order_update, after_lead_update = asyncio.run(scenario())
+        assert initial["hrtech"]["leads"] == 0 and after_lead["hrtech"]["leads"] == 1
+        assert after_order["hrtech"]["orders"] == 1 and after_order["hrtech"]["active"]
+        assert after_order_update["hrtech"]["orders"] == 0 and after_order_update["fintech"]["orders"] == 1
+        assert (after_lead_update["fintech"]["leads"], after_lead_update["edtech"]["leads"]) == (0, 3)
+        assert crm_db.crm_leads.aggregations == 5
+        print("✓ Lead and order writes invalidate the verticals cache")
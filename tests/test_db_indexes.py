@@ -0,0 +1,141 @@
+"""
+DB Index Registry Tests
+Registry sanity checks; apply/migrate/report against a local mongod
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from pymongo import IndexModel  # noqa: E402
+from pymongo.errors import OperationFailure  # noqa: E402
+
+from db_indexes import INDEX_REGISTRY, MIGRATIONS, apply_indexes, ensure_database, index_report, run_migrations  # noqa: E402
+
+
+class TestRegistry:
+    """Test the declarative registry itself"""
+
+    def test_names_unique_and_keys_distinct(self):
+        for collection, models in INDEX_REGISTRY.items():
+            names = [model.document["name"] for model in models]
+            keys = [tuple(model.document["key"].items()) for model in models]
+            assert len(set(names)) == len(names), collection
+            assert len(set(keys)) == len(keys), collection
+        print(f"✓ {sum(map(len, INDEX_REGISTRY.values()))} indexes over {len(INDEX_REGISTRY)} collections")
+
+    def test_hot_paths_covered(self):
+        def has_prefix(collection, *fields):
+            return any(tuple(model.document["key"])[:len(fields)] == fields for model in INDEX_REGISTRY[collection])
+
+        assert has_prefix("users", "id") and has_prefix("users", "phone")
+        assert has_prefix("jobs", "id") and has_prefix("jobs", "is_active", "created_at")
+        assert has_prefix("applications", "job_id", "doer_id") and has_prefix("applications", "doer_id")
+        assert has_prefix("profiles", "user_id")
+        assert has_prefix("crm_leads", "vertical", "stage", "created_at")
+        assert has_prefix("whatsapp_signings", "id")
+        assert has_prefix("vertical_leaders", "vertical", "status")
+        assert has_prefix("notifications", "timestamp")
+
+    def test_migration_ids_ordered_and_unique(self):
+        ids = [migration_id for migration_id, _ in MIGRATIONS]
+        assert ids == sorted(set(ids))
+
+
+class FailingUniqueCollection:
+    """create_indexes stand-in: unique indexes fail with a duplicate-key error (11000)"""
+
+    def __init__(self):
+        self.created = []
+
+    async def create_indexes(self, models):
+        if any(model.document.get("unique") for model in models):
+            raise OperationFailure("E11000 duplicate key error", code=11000)
+        self.created.extend(model.document["name"] for model in models)
+
+
+class TestApplyIndexes:
+    """Test per-index fallback without a mongod"""
+
+    def test_failed_unique_index_keeps_the_others(self):
+        collection = FailingUniqueCollection()
+        registry = {"users": [
+            IndexModel([("id", 1)], unique=True, name="users_id"),
+            IndexModel([("phone", 1)], name="users_phone"),
+            IndexModel([("role", 1)], name="users_role"),
+        ]}
+
+        result = asyncio.run(apply_indexes({"users": collection}, registry))
+        assert collection.created == ["users_phone", "users_role"]
+        assert result["ensured"] == 2 and result["conflicts"] == []
+        assert len(result["errors"]) == 1 and result["errors"][0].startswith("users.users_id:")
+        print("✓ A duplicate-key failure only skips the unique index")
+
+
+class TestRegistryMongo:
+    """Apply, migrate and report against a real mongod"""
+
+    def test_apply_idempotent_and_report(self, mongo_url, mongo_db_name):
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def scenario():
+            client = AsyncIOMotorClient(mongo_url)
+            db = client[mongo_db_name]
+            await db.jobs.insert_one({"id": "j1", "pincode": "560 001", "is_active": True, "created_at": "2025-01-01"})
+            # Pre-existing index on the same keys under another name: reported, not fatal
+            await db.users.create_index("phone", name="phone_legacy")
+
+            first = await ensure_database(db)
+            second = await ensure_database(db)
+            await db.jobs.find_one({"id": "j1"})
+            await db.jobs.find_one({"id": "j1"})
+            report = await index_report(db)
+            job = await db.jobs.find_one({"id": "j1"})
+            users_indexes = await db.users.index_information()
+            client.close()
+            return first, second, report, job, users_indexes
+
+        first, second, report, job, users_indexes = asyncio.run(scenario())
+        assert first["migrations"] == ["0001_jobs_pincode_prefix", "0002_crm_pipeline_counters"] and second["migrations"] == []
+        assert job["pincode_prefix"] == "560"
+        assert not first["errors"] and not second["errors"]
+        assert [conflict.split(":")[0] for conflict in first["conflicts"]] == ["users.users_phone"]
+        assert "users_id" in users_indexes and "users_role" in users_indexes
+
+        jobs = report["collections"]["jobs"]
+        by_name = {entry["name"]: entry for entry in jobs["indexes"]}
+        assert by_name["jobs_id"]["ops"] >= 2 and by_name["jobs_id"]["registered"]
+        assert "jobs_employer" in jobs["unused"]
+        assert report["collections"]["users"]["missing"] == ["users_phone"]
+        assert {entry["name"]: entry["registered"] for entry in report["collections"]["users"]["indexes"]}["phone_legacy"] is False
+        print("✓ Registry applied twice without changes, conflicts reported, usage counted")
+
+    def test_failed_migration_retried_next_start(self, mongo_url, mongo_db_name):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        calls = []
+
+        async def flaky(db):
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise RuntimeError("interrupted")
+            return "ok"
+
+        async def scenario():
+            client = AsyncIOMotorClient(mongo_url)
+            db = client[mongo_db_name]
+            migrations = [("0001_flaky", flaky)]
+            try:
+                await run_migrations(db, migrations)
+            except RuntimeError:
+                pass
+            applied = await run_migrations(db, migrations)
+            again = await run_migrations(db, migrations)
+            report = await apply_indexes(db, {"scratch": [IndexModel([("a", 1)], name="scratch_a")]})
+            client.close()
+            return applied, again, report
+
+        applied, again, report = asyncio.run(scenario())
+        assert applied == ["0001_flaky"] and again == [] and calls == [0, 1]
+        assert report == {"ensured": 1, "conflicts": [], "errors": []}
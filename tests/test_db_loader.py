@@ -0,0 +1,135 @@
+"""
+DB Loader Tests
+Batched $in lookups replacing per-item find_one (Mongo test needs a local mongod)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from db_loader import DocumentLoader, RequestLoaders  # noqa: E402
+
+
+class ListCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class ListCollection:
+    """Minimal in-memory stand-in for Motor's find(...).to_list(); records each query"""
+
+    def __init__(self, docs, fail=False):
+        self.docs = docs
+        self.queries = []
+        self.fail = fail
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        if self.fail:
+            raise RuntimeError("connection reset")
+        (field, condition), = query.items()
+        return ListCursor([dict(doc) for doc in self.docs if doc.get(field) in condition["$in"]])
+
+
+class TestDocumentLoader:
+    """Test batching, memoization and error handling"""
+
+    def test_concurrent_loads_share_one_query(self):
+        collection = ListCollection([{"id": f"job-{i}", "title": f"Job {i}"} for i in range(10)])
+        loader = DocumentLoader(collection)
+
+        async def scenario():
+            return await loader.load_many(["job-3", "job-1", "job-3", "missing", "job-7"])
+
+        docs = asyncio.run(scenario())
+        assert [doc and doc["id"] for doc in docs] == ["job-3", "job-1", "job-3", None, "job-7"]
+        assert collection.queries == [{"id": {"$in": ["job-3", "job-1", "missing", "job-7"]}}]
+        print("✓ 5 loads, 4 distinct keys, 1 query")
+
+    def test_separate_tasks_batched_and_memoized(self):
+        collection = ListCollection([{"id": "u1"}, {"id": "u2"}])
+        loader = DocumentLoader(collection)
+
+        async def scenario():
+            first = await asyncio.gather(loader.load("u1"), loader.load("u2"))
+            again = await loader.load("u1")
+            return first, again
+
+        first, again = asyncio.run(scenario())
+        assert [doc["id"] for doc in first] == ["u1", "u2"] and again["id"] == "u1"
+        assert len(collection.queries) == 1
+        assert loader.stats_counters == {"loads": 3, "queries": 1, "memo_hits": 1}
+
+    def test_large_batches_chunked(self):
+        collection = ListCollection([{"id": i} for i in range(25)])
+        loader = DocumentLoader(collection, max_batch=10)
+
+        docs = asyncio.run(loader.load_many(list(range(25))))
+        assert [doc["id"] for doc in docs] == list(range(25))
+        assert len(collection.queries) == 3
+
+    def test_failure_propagates_and_is_not_memoized(self):
+        collection = ListCollection([{"id": "u1"}], fail=True)
+        loader = DocumentLoader(collection)
+
+        async def scenario():
+            with pytest.raises(RuntimeError):
+                await loader.load_many(["u1", "u2"])
+            collection.fail = False
+            return await loader.load("u1")
+
+        assert asyncio.run(scenario())["id"] == "u1"
+        assert len(collection.queries) == 2
+
+    def test_unexpected_dispatch_error_reaches_waiters(self):
+        """A failure outside the query itself still fails (not hangs) the pending loads"""
+        collection = ListCollection([])
+        collection.find = lambda query, projection=None: ListCursor(["not a document"])
+        loader = DocumentLoader(collection)
+
+        async def scenario():
+            future = loader.load("u1")
+            await asyncio.sleep(0)  # dispatch scheduled, task running
+            assert len(loader._dispatches) == 1
+            with pytest.raises(AttributeError):
+                await asyncio.wait_for(future, 1)
+            await asyncio.sleep(0)
+            return loader
+
+        loader = asyncio.run(scenario())
+        assert not loader._dispatches and "u1" not in loader._memo
+        print("✓ Dispatch task is referenced and its errors surface")
+
+    def test_request_loaders_reuse_per_collection(self):
+        loaders = RequestLoaders({"jobs": ListCollection([]), "users": ListCollection([])})
+        assert loaders.jobs is loaders.get("jobs") and loaders.users is not loaders.jobs
+        assert loaders.get("users", "phone") is not loaders.users
+
+
+class TestDocumentLoaderMongo:
+    """Applications enrichment against a real mongod"""
+
+    def test_enrich_applications(self, mongo_url, mongo_db_name):
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def scenario():
+            client = AsyncIOMotorClient(mongo_url)
+            db = client[mongo_db_name]
+            await db.jobs.insert_many([{"id": f"job-{i}", "title": f"Job {i}"} for i in range(50)])
+            applications = [{"id": f"app-{i}", "job_id": f"job-{i % 20}"} for i in range(100)]
+            loaders = RequestLoaders(db)
+            jobs = await loaders.jobs.load_many([app["job_id"] for app in applications])
+            client.close()
+            return applications, jobs, loaders.stats()
+
+        applications, jobs, stats = asyncio.run(scenario())
+        assert all(job["id"] == app["job_id"] and "_id" not in job for app, job in zip(applications, jobs))
+        assert stats["jobs.id"]["queries"] == 1
+        print("✓ 100 applications enriched with 1 query")
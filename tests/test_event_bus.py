@@ -0,0 +1,182 @@
+"""
+Event Bus + Live Mission Board Tests
+Fan-out, per-subscriber backpressure, readiness deltas and the SSE frame stream
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import captain_command  # noqa: E402
+from event_bus import EventBus  # noqa: E402
+
+
+class RowsCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def to_list(self, length):
+        return list(self.rows)
+
+
+class RowsCollection:
+    """Minimal stand-in for Motor aggregate(); rows can be changed between calls"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def aggregate(self, pipeline):
+        return RowsCursor(self.rows)
+
+
+class RowsDB:
+    def __init__(self):
+        self.vertical_leaders = RowsCollection([])
+        self.onboarding_sessions = RowsCollection([])
+
+
+@pytest.fixture
+def live_board():
+    fake = RowsDB()
+    previous = captain_command.db
+    captain_command.set_database(fake)
+    captain_command.invalidate_mission_board()
+    captain_command.live_relay["published_board"] = None
+    yield fake
+    captain_command.set_database(previous)
+    captain_command.invalidate_mission_board()
+    captain_command.live_relay["published_board"] = None
+
+
+def parse_frame(frame):
+    fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+class TestEventBus:
+    """Test fan-out and backpressure"""
+
+    def test_fan_out_by_topic(self):
+        async def scenario():
+            bus = EventBus()
+            everything = bus.subscribe()
+            readiness = bus.subscribe(["readiness"])
+            delivered = [bus.publish("readiness", {"n": 1}), bus.publish("activity", {"n": 2})]
+            got_all = [await everything.get(0.1), await everything.get(0.1)]
+            got_readiness = [await readiness.get(0.1), await readiness.get(0.01)]
+            return delivered, got_all, got_readiness, bus.stats()
+
+        delivered, got_all, got_readiness, stats = asyncio.run(scenario())
+        assert delivered == [2, 1]
+        assert [e["topic"] for e in got_all] == ["readiness", "activity"]
+        assert got_all[0]["id"] < got_all[1]["id"]
+        assert got_readiness[0]["data"] == {"n": 1} and got_readiness[1] is None
+        assert stats["subscribers"] == 2 and stats["published"] == 2 and stats["delivered"] == 3
+        print("✓ Topic filtering and ordered fan-out")
+
+    def test_slow_subscriber_drops_oldest_without_blocking(self):
+        async def scenario():
+            bus = EventBus(max_queue=5)
+            slow = bus.subscribe()
+            fast = bus.subscribe()
+            received = []
+
+            async def consume():
+                while len(received) < 50:
+                    received.append(await fast.get(1))
+
+            consumer = asyncio.create_task(consume())
+            for i in range(50):
+                bus.publish("activity", i)
+                await asyncio.sleep(0)
+            await consumer
+            backlog = [(await slow.get(0.01))["data"] for _ in range(5)]
+            lagged = slow.lagged
+            slow.resynced()
+            stats = bus.stats()
+            slow.close()
+            return received, backlog, lagged, slow.lagged, stats, bus.stats()
+
+        received, backlog, lagged, after_resync, stats, closed_stats = asyncio.run(scenario())
+        assert [e["data"] for e in received] == list(range(50))
+        assert backlog == [45, 46, 47, 48, 49]
+        assert lagged and not after_resync
+        assert stats["dropped"] == 45 and stats["lagged_subscribers"] == 0
+        assert closed_stats["subscribers"] == 1 and closed_stats["dropped"] == 45
+        print("✓ Slow subscriber keeps the newest 5 events; fast one gets all 50")
+
+
+class TestReadinessDelta:
+    """Test the per-vertical diff pushed after writes"""
+
+    def test_only_changed_verticals(self):
+        def board(*readiness):
+            return {
+                "verticals_progress": [{"code": code, "readiness_percent": r} for code, r in zip("ABC", readiness)],
+                "launch_readiness_percent": sum(readiness) // 3
+            }
+
+        first = captain_command.readiness_delta(None, board(0, 0, 0))
+        assert len(first["verticals"]) == 3 and first["mission_status"] == "MOBILIZING"
+        delta = captain_command.readiness_delta(board(0, 0, 0), board(0, 90, 0))
+        assert [v["code"] for v in delta["verticals"]] == ["B"]
+        assert delta["launch_readiness_percent"] == 30 and delta["mission_status"] == "ACCELERATE"
+        assert delta["verticals_ready"] == 1
+        assert captain_command.readiness_delta(board(0, 90, 0), board(0, 90, 0)) is None
+
+
+class TestLiveMissionBoard:
+    """Test the SSE stream a dashboard subscribes to"""
+
+    def test_snapshot_then_pushed_events(self, live_board):
+        async def scenario():
+            subscription = captain_command.event_bus.subscribe(captain_command.MISSION_BOARD_TOPICS)
+            frames = captain_command.mission_board_events(subscription, heartbeat=0.05)
+            snapshot = parse_frame(await frames.__anext__())
+            await captain_command.publish_board_changes()  # baseline push
+            baseline = parse_frame(await frames.__anext__())
+
+            live_board.vertical_leaders.rows = [{"_id": "B2G", "leader": {"leader_name": "Asha", "team_size": 0}}]
+            started = time.perf_counter()
+            await captain_command.mission_board_changed(activity={"id": "a1", "type": "leader_assigned"})
+            activity = parse_frame(await frames.__anext__())
+            readiness = parse_frame(await frames.__anext__())
+            latency = time.perf_counter() - started
+            heartbeat = await frames.__anext__()
+            await frames.aclose()
+            subscription.close()
+            return snapshot, baseline, activity, readiness, latency, heartbeat
+
+        snapshot, baseline, activity, readiness, latency, heartbeat = asyncio.run(scenario())
+        assert snapshot[0] == "snapshot" and len(snapshot[1]["verticals_progress"]) == 7
+        assert baseline[0] == "readiness" and len(baseline[1]["verticals"]) == 7
+        assert activity == ("activity", {"id": "a1", "type": "leader_assigned"})
+        assert readiness[0] == "readiness"
+        assert [(v["code"], v["status"], v["readiness_percent"]) for v in readiness[1]["verticals"]] == [("B2G", "assigned", 35)]
+        assert readiness[1]["launch_readiness_percent"] == 5
+        assert latency < 1.0
+        assert heartbeat == ": heartbeat\n\n"
+        print(f"✓ Leader assignment reached the stream in {latency * 1000:.1f}ms as a one-vertical delta")
+
+    def test_lagging_client_gets_full_board(self, live_board):
+        async def scenario():
+            subscription = captain_command.event_bus.subscribe(captain_command.MISSION_BOARD_TOPICS, max_queue=3)
+            frames = captain_command.mission_board_events(subscription, heartbeat=0.05)
+            await frames.__anext__()
+            for i in range(10):
+                captain_command.event_bus.publish("activity", {"id": i})
+            resync = parse_frame(await frames.__anext__())
+            heartbeat = await frames.__anext__()
+            await frames.aclose()
+            subscription.close()
+            return resync, heartbeat
+
+        resync, heartbeat = asyncio.run(scenario())
+        assert resync[0] == "snapshot" and resync[1]["verticals_total"] == 7
+        assert heartbeat == ": heartbeat\n\n"  # missed deltas discarded, not replayed
@@ -0,0 +1,239 @@
+"""
+Gemini Chat Service Tests
+Model caching, concurrency limit, queue rejection and event-loop responsiveness
+with fake models (no API key needed)
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from gemini_service import GeminiChatService, LLMBusyError  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """GenerativeModel stand-in; async_api=False mimics a client with only send_message"""
+
+    def __init__(self, tracker, delay, async_api, **kwargs):
+        self.tracker = tracker
+        self.delay = delay
+        self.async_api = async_api
+        self.kwargs = kwargs
+
+    def start_chat(self, history):
+        return AsyncChat(self) if self.async_api else SyncChat(self)
+
+
+class AsyncChat:
+    def __init__(self, model):
+        self.model = model
+
+    async def send_message_async(self, message, stream=False):
+        if stream:
+            return FakeStream(self.model, message)
+        tracker = self.model.tracker
+        tracker["active"] += 1
+        tracker["peak"] = max(tracker["peak"], tracker["active"])
+        try:
+            await asyncio.sleep(self.model.delay)
+            if message == "boom":
+                raise RuntimeError("upstream error")
+            return FakeResponse(f"reply to {message}")
+        finally:
+            tracker["active"] -= 1
+
+
+class FakeStream:
+    """Async iterator of response chunks, like the SDK's streamed response"""
+
+    def __init__(self, model, message):
+        self.model = model
+        self.words = f"reply to {message}".split(" ")
+
+    async def __aiter__(self):
+        for i, word in enumerate(self.words):
+            await asyncio.sleep(self.model.delay)
+            if word == "boom":
+                raise RuntimeError("upstream error")
+            yield FakeResponse(word if i == 0 else " " + word)
+
+
+class SyncChat:
+    def __init__(self, model):
+        self.model = model
+
+    def send_message(self, message, stream=False):
+        if stream:
+            return self._chunks(message)
+        time.sleep(self.model.delay)  # blocks its thread, like the sync SDK call
+        return FakeResponse(f"reply to {message}")
+
+    def _chunks(self, message):
+        for i, word in enumerate(f"reply to {message}".split(" ")):
+            time.sleep(self.model.delay)
+            yield FakeResponse(word if i == 0 else " " + word)
+
+
+def make_service(delay=0.05, async_api=True, **options):
+    tracker = {"active": 0, "peak": 0, "built": 0}
+
+    def factory(**kwargs):
+        tracker["built"] += 1
+        return FakeModel(tracker, delay, async_api, **kwargs)
+
+    return GeminiChatService(model_factory=factory, **options), tracker
+
+
+async def loop_lag_during(work, interval=0.01):
+    """Largest delay of a 10ms ticker while `work` runs (what other requests would wait)"""
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - started - interval)
+
+    task = asyncio.create_task(ticker())
+    result = await work
+    done.set()
+    await task
+    return result, max(lags)
+
+
+class TestGeminiChatService:
+    """Test the non-blocking Gemini wrapper"""
+
+    def test_models_cached_per_prompt_and_config(self):
+        service, tracker = make_service(delay=0)
+
+        async def scenario():
+            for _ in range(3):
+                await service.send("hi", system_instruction="A")
+                await service.send("hi", system_instruction="A", generation_config={"temperature": 0.7})
+            return await service.send("hi", system_instruction="B")
+
+        assert asyncio.run(scenario()) == "reply to hi"
+        assert tracker["built"] == 3 and service.stats()["models_cached"] == 3
+
+    def test_lru_bound(self):
+        service, tracker = make_service(delay=0, cache_size=2)
+
+        async def scenario():
+            for prompt in ["A", "B", "A", "C", "A", "B"]:
+                await service.send("hi", system_instruction=prompt)
+
+        asyncio.run(scenario())
+        assert tracker["built"] == 4  # B was evicted by C, A stayed hot
+        assert service.stats()["models_cached"] == 2
+
+    def test_concurrency_limited_and_queue_depth_reported(self):
+        service, tracker = make_service(delay=0.05, max_concurrency=3)
+
+        async def scenario():
+            sends = asyncio.gather(*(service.send(f"m{i}", system_instruction="A") for i in range(12)))
+            await asyncio.sleep(0.01)
+            mid = service.stats()
+            return await sends, mid
+
+        replies, mid = asyncio.run(scenario())
+        assert replies == [f"reply to m{i}" for i in range(12)]
+        assert tracker["peak"] == 3
+        assert mid["in_flight"] == 3 and mid["queue_depth"] == 9
+        stats = service.stats()
+        assert stats["completed"] == 12 and stats["peak_waiting"] == 9 and stats["queue_depth"] == 0
+        print("✓ 12 chats through 3 slots, queue depth 9 at peak")
+
+    def test_rejects_when_queue_full(self):
+        service, _ = make_service(delay=0.05, max_concurrency=1, max_waiting=2)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(service.send(f"m{i}", system_instruction="A") for i in range(5)),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+        assert sum(isinstance(r, LLMBusyError) for r in results) == 2
+        assert service.stats()["rejected"] == 2 and service.stats()["completed"] == 3
+
+    def test_failures_and_timeouts_release_slots(self):
+        service, _ = make_service(delay=0.2, max_concurrency=1, timeout=0.05)
+
+        async def scenario():
+            with pytest.raises(asyncio.TimeoutError):
+                await service.send("slow", system_instruction="A")
+            service.timeout = 1.0
+            with pytest.raises(RuntimeError):
+                await service.send("boom", system_instruction="A")
+            return await service.send("ok", system_instruction="A")
+
+        assert asyncio.run(scenario()) == "reply to ok"
+        stats = service.stats()
+        assert (stats["timeouts"], stats["failed"], stats["completed"], stats["in_flight"]) == (1, 1, 1, 0)
+
+    def test_sync_client_runs_off_the_event_loop(self):
+        service, _ = make_service(delay=0.2, async_api=False, max_concurrency=4)
+
+        async def scenario():
+            burst = asyncio.gather(*(service.send(f"m{i}", system_instruction="A") for i in range(8)))
+            return await loop_lag_during(burst)
+
+        started = time.perf_counter()
+        replies, lag = asyncio.run(scenario())
+        elapsed = time.perf_counter() - started
+        service.close()
+        assert len(replies) == 8
+        assert lag < 0.1  # inline send_message would stall the loop 0.2s per call
+        assert elapsed < 1.2  # 8 calls x 0.2s over 4 threads ~ 0.4s, not 1.6s serialized
+        print(f"✓ Sync client in thread pool: max loop lag {lag * 1000:.1f}ms during an 8-chat burst")
+
+
+class TestGeminiStreaming:
+    """Test streamed chat turns"""
+
+    @pytest.mark.parametrize("async_api", [True, False])
+    def test_chunks_arrive_incrementally(self, async_api):
+        service, _ = make_service(delay=0.05, async_api=async_api)
+
+        async def scenario():
+            started = time.perf_counter()
+            arrivals = []
+            async for chunk in service.stream("the mission", system_instruction="A"):
+                arrivals.append((chunk, time.perf_counter() - started))
+            return arrivals
+
+        arrivals = asyncio.run(scenario())
+        service.close()
+        assert "".join(chunk for chunk, _ in arrivals) == "reply to the mission"
+        assert arrivals[0][1] < 0.15 and arrivals[-1][1] >= 0.2  # first word long before the last
+        stats = service.stats()
+        assert stats["completed"] == 1 and stats["in_flight"] == 0
+
+    def test_stream_holds_slot_and_releases_on_early_close(self):
+        service, _ = make_service(delay=0.02, max_concurrency=1)
+
+        async def scenario():
+            stream = service.stream("a b c d", system_instruction="A")
+            first = await stream.__anext__()
+            during = service.stats()["in_flight"]
+            await stream.aclose()
+            with pytest.raises(RuntimeError):
+                async for _ in service.stream("boom", system_instruction="A"):
+                    pass
+            return first, during, await service.send("ok", system_instruction="A")
+
+        first, during, reply = asyncio.run(scenario())
+        assert (first, during, reply) == ("reply", 1, "reply to ok")
+        assert service.stats()["in_flight"] == 0 and service.stats()["failed"] == 1
@@ -0,0 +1,190 @@
+"""
+Gemma Online Answer Cache Tests
+Bounds, LFU/LRU eviction, expiry, hit accounting, the Mongo tier and repeat-query serving
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from gemma_offline import GemmaOfflineService, GemmaQuery, OnlineAnswerCache  # noqa: E402
+
+
+class DictCollection:
+    """Minimal in-memory stand-in for the Motor collection methods the cache uses"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def create_index(self, *args, **kwargs):
+        return "expires_at_1"
+
+    async def find_one(self, query):
+        doc = self.docs.get(query["_id"])
+        return dict(doc) if doc else None
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = {"_id": query["_id"], **doc}
+
+    async def update_one(self, query, update):
+        doc = self.docs.get(query["_id"])
+        if doc:
+            for field, amount in update["$inc"].items():
+                doc[field] = doc.get(field, 0) + amount
+
+
+class TestOnlineAnswerCache:
+    """Test limits, eviction, expiry and the second tier"""
+
+    def test_lfu_evicts_least_used(self, clock):
+        cache = OnlineAnswerCache(max_entries=2, clock=clock)
+
+        async def scenario():
+            await cache.set("a", "q a", "answer a", "en")
+            await cache.set("b", "q b", "answer b", "en")
+            await cache.get("a")
+            await cache.get("a")
+            await cache.get("b")
+            await cache.set("c", "q c", "answer c", "en")
+            return await cache.get("a"), await cache.get("b"), await cache.get("c")
+
+        a, b, c = asyncio.run(scenario())
+        assert a.access_count == 3 and b is None and c.response == "answer c"
+        assert cache.stats()["evictions"] == 1
+        print("✓ LFU keeps the most requested answer")
+
+    def test_lru_policy(self, clock):
+        cache = OnlineAnswerCache(max_entries=2, policy="lru", clock=clock)
+
+        async def scenario():
+            await cache.set("a", "q a", "answer a", "en")
+            await cache.get("a")
+            await cache.get("a")
+            await cache.set("b", "q b", "answer b", "en")
+            await cache.get("b")
+            await cache.set("c", "q c", "answer c", "en")
+            return await cache.get("a")
+
+        assert asyncio.run(scenario()) is None
+
+    def test_byte_limit(self, clock):
+        cache = OnlineAnswerCache(max_bytes=30, clock=clock)
+
+        async def scenario():
+            await cache.set("a", "q", "ఆదాయం", "te")  # 15 bytes in UTF-8
+            await cache.set("b", "q", "x" * 16, "en")
+            await cache.set("c", "q", "x" * 31, "en")
+
+        asyncio.run(scenario())
+        stats = cache.stats()
+        assert stats["size"] == 1 and stats["bytes_used"] == 16
+        assert stats["evictions"] == 1 and stats["rejected_too_large"] == 1
+
+    def test_expires_at_honored(self, clock):
+        cache = OnlineAnswerCache(ttl=60, clock=clock)
+
+        async def scenario():
+            entry = await cache.set("a", "q", "answer", "en")
+            clock.now += 59
+            fresh = await cache.get("a")
+            clock.now += 1
+            return entry, fresh, await cache.get("a")
+
+        entry, fresh, expired = asyncio.run(scenario())
+        assert datetime.fromisoformat(entry.expires_at) == datetime.fromtimestamp(1_000_060, timezone.utc)
+        assert fresh is not None and expired is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expired"], stats["hit_rate"]) == (1, 1, 1, 0.5)
+
+    def test_second_tier_survives_restart(self, clock):
+        collection = DictCollection()
+
+        async def scenario():
+            first = OnlineAnswerCache(ttl=60, clock=clock)
+            await first.attach_collection(collection)
+            await first.set("a", "q", "answer", "kn")
+
+            restarted = OnlineAnswerCache(ttl=60, collection=collection, clock=clock)
+            served = await restarted.get("a")
+            assert collection.docs["a"]["access_count"] == 0  # counted in memory, not awaited
+            await restarted.close()
+            clock.now += 61
+            restarted.clear()
+            return restarted, served, await restarted.get("a")
+
+        restarted, served, expired = asyncio.run(scenario())
+        assert served.response == "answer" and served.language == "kn"
+        assert collection.docs["a"]["access_count"] == 1
+        assert expired is None
+        assert restarted.stats()["mongo_hits"] == 1
+        print("✓ Mongo tier serves after restart until expires_at")
+
+    def test_access_counts_flushed_in_background(self, clock):
+        """Hits reach Mongo after flush_interval and when their entry is evicted"""
+        collection = DictCollection()
+
+        async def scenario():
+            cache = OnlineAnswerCache(max_entries=2, flush_interval=30, collection=collection, clock=clock)
+            await cache.set("a", "q a", "answer a", "en")
+            await cache.set("b", "q b", "answer b", "en")
+            for _ in range(3):
+                await cache.get("a")
+            await cache.get("b")
+            pending = cache.stats()["pending_access_writes"]
+
+            clock.now += 30
+            await cache.get("a")  # interval elapsed: schedules a flush of every key
+            await asyncio.gather(*cache._flush_tasks)
+            flushed = (collection.docs["a"]["access_count"], collection.docs["b"]["access_count"])
+
+            await cache.get("b")
+            await cache.set("c", "q c", "answer c", "en")  # evicts b
+            await asyncio.gather(*cache._flush_tasks)
+            return pending, flushed, cache.stats()["pending_access_writes"]
+
+        pending, flushed, after_eviction = asyncio.run(scenario())
+        assert pending == 4
+        assert flushed == (4, 1)
+        assert collection.docs["b"]["access_count"] == 2 and after_eviction == 0
+        print("✓ Access counts written off the request path")
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            OnlineAnswerCache(policy="fifo")
+
+
+class TestRepeatQueries:
+    """Stored online answers are served again, online and offline"""
+
+    def test_cache_key_includes_prompt_version(self, monkeypatch):
+        import gemma_offline
+        service = GemmaOfflineService()
+        query = GemmaQuery(query="How do I learn C++?", language="en")
+        key = service._generate_cache_key(query)
+
+        assert service._generate_cache_key(query.model_copy(update={"query": "How do I learn C#?"})) != key
+        monkeypatch.setattr(gemma_offline, "GEMMA_PROMPT_VERSION", "changed")
+        assert service._generate_cache_key(query) != key
+
+    def test_repeat_query_served_from_cache(self, clock):
+        service = GemmaOfflineService()
+        service.answers = OnlineAnswerCache(clock=clock)
+        query = GemmaQuery(query="How do I become an electrician?", language="en", education_level="10th_pass")
+
+        async def scenario():
+            await service.answers.set(service._generate_cache_key(query), query.query, "Join an ITI course", "en")
+            repeat = await service.get_online_response(query.model_copy(update={"query": "how do I become an ELECTRICIAN"}))
+            offline = await service.get_offline_response(query.model_copy(update={"is_offline": True}))
+            other_level = await service.get_offline_response(query.model_copy(update={"education_level": "graduate"}))
+            return repeat, offline, other_level
+
+        repeat, offline, other_level = asyncio.run(scenario())
+        assert repeat.response == "Join an ITI course" and repeat.is_cached
+        assert offline.response == "Join an ITI course"
+        assert other_level.response != "Join an ITI course"  # prompt differs by education level
+        assert service.answers.stats()["hits"] == 2
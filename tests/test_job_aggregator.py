@@ -0,0 +1,384 @@
+"""
+Job Aggregator Tests
+In-process tests against the local JSearch/Adzuna stub server (no API keys required)
+"""
+
+import asyncio
+import time
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND))
+sys.path.insert(0, str(BACKEND / "benchmarks"))
+
+from job_aggregator import (  # noqa: E402
+    JobAggregatorService, JSearchClient, AdzunaClient, SearchResultCache, SAMPLE_INDIAN_JOBS, search_cache_key,
+    CircuitBreaker
+)
+from stub_job_sources import StubJobSourceServer  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    with StubJobSourceServer() as server:
+        yield server
+
+
+@pytest.fixture
+def service(stub):
+    service = JobAggregatorService()
+    service.jsearch = JSearchClient(api_key="stub", base_url=f"{stub.url}/jsearch")
+    service.adzuna = AdzunaClient(app_id="stub", app_key="stub", base_url=f"{stub.url}/adzuna")
+    return service
+
+
+class TestSharedHTTPClient:
+    """Test pooled client lifecycle and connection reuse"""
+
+    def test_pooled_client_reuses_connections(self, stub, service):
+        """Sequential searches reuse keep-alive connections (one per concurrently fetched source)"""
+        async def scenario():
+            await service.startup()
+            assert service.jsearch.http_client is service.adzuna.http_client is service.http_client
+            for i in range(5):
+                jobs = await service.search_all_sources(f"designer {i}", "India", include_sample=False)
+                assert {job.source for job in jobs} == {"jsearch", "adzuna"}
+                assert len(jobs) == 20
+            await service.close()
+
+        asyncio.run(scenario())
+        assert stub.requests == 10
+        assert stub.connections == 2
+        assert service.http_client is None and service.jsearch.http_client is None
+        print("✓ 10 requests over 2 TCP connections")
+
+    def test_without_startup_falls_back_to_per_call_clients(self, stub, service):
+        jobs = asyncio.run(service.search_all_sources("designer", "India", include_sample=False))
+
+        assert len(jobs) == 20
+        assert stub.connections == 2
+        asyncio.run(service.search_all_sources("nurse", "India", include_sample=False))
+        assert stub.connections == 4
+        print("✓ Per-call client fallback still works")
+
+    def test_error_status_returns_empty(self, stub, service):
+        stub.status = 503
+
+        async def scenario():
+            await service.startup()
+            try:
+                return await service.jsearch.search_jobs("designer")
+            finally:
+                await service.close()
+
+        assert asyncio.run(scenario()) == []
+        print("✓ Non-200 responses yield no jobs")
+
+    def test_base_url_env_override(self, monkeypatch):
+        monkeypatch.setenv("ADZUNA_BASE_URL", "http://127.0.0.1:9/adzuna")
+        monkeypatch.delenv("JSEARCH_BASE_URL", raising=False)
+
+        assert AdzunaClient().base_url == "http://127.0.0.1:9/adzuna"
+        assert JSearchClient().base_url == JSearchClient.BASE_URL
+        print("✓ Base URL overridable for local stubs")
+
+
+class CountingFetch:
+    """Upstream stand-in: counts calls, optionally waits on an event before answering"""
+
+    def __init__(self, jobs=None, gate=None):
+        self.calls = 0
+        self.jobs = SAMPLE_INDIAN_JOBS[:2] if jobs is None else jobs
+        self.gate = gate
+
+    async def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return list(self.jobs)
+
+
+class DictCollection:
+    """Minimal in-memory stand-in for the Motor collection methods the cache uses"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def create_index(self, *args, **kwargs):
+        return "expires_at_1"
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = {"_id": query["_id"], **doc}
+
+
+class TestSearchResultCache:
+    """Test TTL, stale-while-revalidate, coalescing and the Mongo tier"""
+
+    def test_key_is_normalized(self):
+        assert search_cache_key("jsearch", "  Fashion   DESIGN ", "India", 1) == ("jsearch", "fashion design", "india", 1)
+
+    def test_fresh_hit_then_stale_with_single_refresh(self, clock):
+        cache = SearchResultCache(ttl=60, stale_ttl=600, clock=clock)
+        fetch = CountingFetch()
+        key = search_cache_key("jsearch", "designer", "India", 1)
+
+        async def scenario():
+            assert len(await cache.get_or_fetch(key, fetch)) == 2
+            await cache.get_or_fetch(key, fetch)
+            assert fetch.calls == 1
+
+            clock.now += 120  # stale: served immediately, one refresh in the background
+            await asyncio.gather(*(cache.get_or_fetch(key, fetch) for _ in range(5)))
+            await asyncio.sleep(0)
+            await asyncio.gather(*cache._refreshing.values())
+            assert fetch.calls == 2
+
+            await cache.get_or_fetch(key, fetch)  # refreshed entry is fresh again
+            clock.now += 10_000  # past stale window: blocking miss
+            await cache.get_or_fetch(key, fetch)
+            assert fetch.calls == 3
+
+        asyncio.run(scenario())
+        stats = cache.stats()
+        assert (stats["hits"], stats["stale_served"], stats["misses"], stats["refreshes"]) == (2, 5, 2, 1)
+        print("✓ Fresh hits, stale-while-revalidate, expiry")
+
+    def test_concurrent_misses_are_coalesced(self):
+        cache = SearchResultCache()
+        key = search_cache_key("adzuna", "nurse", "India", 1)
+
+        async def scenario():
+            fetch = CountingFetch(gate=asyncio.Event())
+            waiters = [asyncio.create_task(cache.get_or_fetch(key, fetch)) for _ in range(10)]
+            await asyncio.sleep(0)
+            fetch.gate.set()
+            results = await asyncio.gather(*waiters)
+            return fetch.calls, results
+
+        calls, results = asyncio.run(scenario())
+        assert calls == 1
+        assert all(len(r) == 2 for r in results)
+        assert cache.stats()["coalesced"] == 9
+        print("✓ 10 concurrent searches, 1 upstream call")
+
+    def test_failures_are_shared_and_not_cached(self):
+        cache = SearchResultCache()
+        key = search_cache_key("jsearch", "x", "India", 1)
+
+        async def failing():
+            raise RuntimeError("quota exceeded")
+
+        async def scenario():
+            with pytest.raises(RuntimeError):
+                await cache.get_or_fetch(key, failing)
+            return await cache.get_or_fetch(key, CountingFetch())
+
+        assert len(asyncio.run(scenario())) == 2
+        print("✓ Errors not cached")
+
+    def test_empty_results_expire_quickly(self, clock):
+        cache = SearchResultCache(ttl=600, empty_ttl=30, clock=clock)
+        fetch = CountingFetch(jobs=[])
+        key = search_cache_key("jsearch", "x", "India", 1)
+
+        async def scenario():
+            await cache.get_or_fetch(key, fetch)
+            clock.now += 31
+            await cache.get_or_fetch(key, fetch)
+
+        asyncio.run(scenario())
+        assert fetch.calls == 2
+
+    def test_mongo_tier_survives_restart(self):
+        collection = DictCollection()
+        key = search_cache_key("jsearch", "designer", "India", 1)
+
+        async def scenario():
+            first = SearchResultCache()
+            await first.attach_collection(collection)
+            await first.get_or_fetch(key, CountingFetch())
+
+            restarted = SearchResultCache(collection=collection)
+            fetch = CountingFetch()
+            jobs = await restarted.get_or_fetch(key, fetch)
+            return restarted, fetch, jobs
+
+        restarted, fetch, jobs = asyncio.run(scenario())
+        assert fetch.calls == 0
+        assert [job.id for job in jobs] == [job.id for job in SAMPLE_INDIAN_JOBS[:2]]
+        assert restarted.stats()["mongo_hits"] == 1
+        print("✓ Second tier serves after restart")
+
+    def test_failed_refresh_keeps_stale_entry(self, clock, stub, service):
+        """A provider outage during a background refresh doesn't wipe the stale results"""
+        service.cache = SearchResultCache(ttl=60, stale_ttl=600, clock=clock)
+
+        async def scenario():
+            first = await service.search_all_sources("designer", "India", include_sample=False)
+            stub.status = 503
+            clock.now += 120
+            stale = await service.search_all_sources("designer", "India", include_sample=False)
+            await asyncio.gather(*service.cache._refreshing.values())
+            after = await service.search_all_sources("designer", "India", include_sample=False)
+            await asyncio.gather(*service.cache._refreshing.values())
+            return first, stale, after
+
+        first, stale, after = asyncio.run(scenario())
+        assert len(first) == len(stale) == len(after) > 0
+        stats = service.cache.stats()
+        assert stats["refreshes"] == 4 and stats["refresh_errors"] == 4
+        print("✓ Stale entry survives a failed refresh")
+
+    def test_service_caches_per_source(self, stub, service):
+        async def scenario():
+            await service.startup()
+            for query in ["Designer", "designer ", "DESIGNER"]:
+                await service.search_all_sources(query, "India", include_sample=False)
+            await service.close()
+
+        asyncio.run(scenario())
+        assert stub.requests == 2
+        assert service.cache.stats()["hits"] == 4
+        print("✓ Repeat searches served from cache")
+
+
+class TestStreamAllSources:
+    """Test per-source streaming of search results"""
+
+    def test_batches_arrive_as_sources_complete(self, stub, service):
+        """Samples first, fast provider before the slow one, nothing repeated"""
+        stub.delays["adzuna"] = 0.5
+
+        async def scenario():
+            await service.startup()
+            started = time.perf_counter()
+            batches = []
+            async for source, jobs in service.stream_all_sources("designer", "India"):
+                batches.append((source, jobs, time.perf_counter() - started))
+            await service.close()
+            return batches
+
+        batches = asyncio.run(scenario())
+        assert [source for source, _, _ in batches] == ["internal", "jsearch", "adzuna"]
+        assert batches[0][2] < 0.1 and batches[1][2] < 0.4 and batches[2][2] >= 0.5
+        ids = [job.id for _, jobs, _ in batches for job in jobs]
+        assert len(ids) == len(set(ids))
+        print("✓ Time to first result independent of the slowest provider")
+
+    def test_stream_matches_search_all_sources(self, stub, service):
+        async def scenario():
+            streamed = [job async for _, jobs in service.stream_all_sources("designer", "India") for job in jobs]
+            searched = await service.search_all_sources("designer", "India")
+            return streamed, searched
+
+        streamed, searched = asyncio.run(scenario())
+        assert sorted(job.id for job in streamed) == sorted(job.id for job in searched)
+
+    def test_duplicates_across_batches_dropped(self, service):
+        dup = SAMPLE_INDIAN_JOBS[0]
+        fresh = dup.model_copy(update={"id": "jsearch_x", "title": "Textile Buyer"})
+        fetch = CountingFetch(jobs=[dup, fresh])
+        service.jsearch.search_jobs = lambda *args, **kwargs: fetch()
+        service.adzuna.app_id = ""
+
+        async def scenario():
+            return [batch async for batch in service.stream_all_sources(dup.title, "India")]
+
+        batches = asyncio.run(scenario())
+        assert dup in batches[0][1]
+        assert batches[1] == ("jsearch", [fresh])
+        print("✓ Incremental dedup against already-sent jobs")
+
+    def test_samples_only_as_fallback_without_include_sample(self, stub, service):
+        stub.status = 500
+
+        async def scenario():
+            return [source async for source, _ in service.stream_all_sources("designer", "India", include_sample=False)]
+
+        sources = asyncio.run(scenario())
+        assert set(sources[:2]) == {"jsearch", "adzuna"}
+        assert sources[2:] == ["internal"]
+
+
+class TestCircuitBreaker:
+    """Test breaker transitions and their effect on source clients"""
+
+    def test_open_half_open_close(self, clock):
+        breaker = CircuitBreaker("jsearch", failure_threshold=3, reset_timeout=30, clock=clock)
+
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure(rate_limited=True)
+        assert breaker.state == "open" and not breaker.allow()
+
+        clock.now += 30
+        assert breaker.allow() and breaker.state == "half_open"
+        assert not breaker.allow()  # one trial at a time
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now += 30
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
+        snapshot = breaker.snapshot()
+        assert (snapshot["opened"], snapshot["rate_limited"], snapshot["rejected"]) == (2, 3, 2)
+        print("✓ closed -> open -> half_open -> closed")
+
+    def test_rate_limited_source_stops_being_called(self, stub, service):
+        stub.status = 429
+        service.jsearch.breaker.failure_threshold = 2
+
+        async def scenario():
+            for i in range(5):
+                assert await service.jsearch.search_jobs(f"q{i}") == []
+
+        asyncio.run(scenario())
+        assert stub.requests == 2
+        assert service.source_stats()["jsearch"]["breaker"]["state"] == "open"
+        print("✓ Open circuit short-circuits calls")
+
+
+class TestBudgetAndHedging:
+    """Test per-search deadline and hedged requests"""
+
+    def test_late_source_dropped_but_cached(self, stub, service):
+        stub.delays["adzuna"] = 0.8
+        service.budget = 0.3
+
+        async def scenario():
+            first = await service.search_all_sources("designer", "India", include_sample=False)
+            await asyncio.sleep(0.9)
+            second = await service.search_all_sources("designer", "India", include_sample=False)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert {job.source for job in first} == {"jsearch"}
+        assert {job.source for job in second} == {"jsearch", "adzuna"}
+        assert service.budget_overruns == {"adzuna": 1}
+        assert service.source_stats()["adzuna"]["budget_overruns"] == 1
+        print("✓ Over-budget source dropped, result still cached for next search")
+
+    def test_hedged_request_wins_when_first_is_slow(self):
+        class SlowFirstClient(JSearchClient):
+            async def _request(self, url, **kwargs):
+                self.stats_counters["requests"] += 1
+                await asyncio.sleep(1.0 if self.stats_counters["requests"] == 1 else 0.01)
+                return url
+
+        client = SlowFirstClient(api_key="k", hedge_after=0.05)
+
+        async def scenario():
+            started = time.perf_counter()
+            await client._send("http://stub/search")
+            return time.perf_counter() - started
+
+        assert asyncio.run(scenario()) < 0.5
+        assert (client.stats_counters["hedges_sent"], client.stats_counters["hedge_wins"]) == (1, 1)
+        print("✓ Hedged duplicate answers first")
@@ -0,0 +1,215 @@
+"""
+Job Dedup Tests
+Near-duplicate detection precision/recall on a synthetic multi-source corpus
+"""
+
+import asyncio
+import random
+import sys
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from job_aggregator import AggregatedJob, JobAggregatorService, JSearchClient, AdzunaClient, SAMPLE_INDIAN_JOBS  # noqa: E402
+from job_dedup import MinHasher, NearDuplicateDetector, JobDeduplicator, company_key, HAS_NUMPY  # noqa: E402
+
+TITLES = [
+    "Software Engineer", "Data Analyst", "Marketing Manager", "Fashion Designer", "Sales Executive",
+    "Staff Nurse", "Math Teacher", "Accountant", "Delivery Driver", "Content Writer",
+    "Research Scientist", "Office Assistant", "Product Manager", "HR Executive", "Backend Developer"
+]
+SENIORITY = ["", "Senior ", "Junior ", "Lead "]
+VOCAB = (
+    "design build maintain scalable services customers stakeholders reports analysis growth team "
+    "collaborate deliver quality deadlines training excellent communication skills experience "
+    "required preferred degree tools platform operations clients portfolio campaigns patients "
+    "students curriculum ledger audit routes vehicles articles research experiments documents"
+).split()
+CITIES = ["Bengaluru", "Mumbai", "Pune", "Hyderabad", "Chennai", "Delhi", "Gurugram"]
+COMPANIES = [
+    f"{name} {kind}"
+    for name in ["Acme", "Zenith", "Orbit", "Nimbus", "Vertex", "Lotus", "Indus", "Kaveri", "Saffron", "Peacock"]
+    for kind in ["Technologies", "Retail", "Health", "Labs"]
+]
+SOURCES = ["jsearch", "adzuna", "internal"]
+
+
+def variant_title(title, rng):
+    title = title.replace("Senior", rng.choice(["Sr.", "Senior", "Sr"])).replace("Junior", rng.choice(["Jr.", "Junior"]))
+    return title + rng.choice(["", "", " - Remote", " (Full Time)", " II"])
+
+
+def make_corpus(postings=500, seed=3):
+    """
+    (job, posting id) pairs: each posting appears 1-3 times, re-listed by other sources with
+    abbreviated titles, company suffixes, other location formats and edited/truncated
+    descriptions. All of a company's postings share its boilerplate text.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for posting in range(postings):
+        company = rng.choice(COMPANIES)
+        title = rng.choice(SENIORITY) + rng.choice(TITLES)
+        city = rng.choice(CITIES)
+        boilerplate = random.Random(zlib.crc32(company.encode())).sample(VOCAB, 12)
+        description = boilerplate + [rng.choice(VOCAB) for _ in range(rng.randint(40, 120))]
+        for copy in range(rng.choice([1, 1, 2, 3])):
+            fields = {"title": title, "company_name": company, "location": f"{city}, India", "description": " ".join(description)}
+            if copy:
+                words = list(description)
+                for _ in range(rng.randint(0, 4)):
+                    words[rng.randrange(len(words))] = rng.choice(VOCAB)
+                if rng.random() < 0.5:
+                    words = words[:rng.randint(30, len(words))]
+                fields = {
+                    "title": variant_title(title, rng),
+                    "company_name": company + rng.choice(["", " Pvt Ltd", " Private Limited", " Ltd"]),
+                    "location": rng.choice([city, f"{city}, India", f"{city}, KA"]),
+                    "description": " ".join(words)
+                }
+            job = AggregatedJob(
+                id=f"{SOURCES[copy]}-{posting}", source=SOURCES[copy], source_job_id=str(posting),
+                apply_url="https://example.com", **fields
+            )
+            corpus.append((job, posting))
+    rng.shuffle(corpus)
+    return corpus
+
+
+def precision_recall(kept_ids, corpus):
+    """Precision: dropped jobs that really were copies; recall: copies that were dropped"""
+    posting_of = {job.id: posting for job, posting in corpus}
+    kept_postings = {}
+    for job_id in kept_ids:
+        kept_postings.setdefault(posting_of[job_id], []).append(job_id)
+    copies = len(corpus) - len({posting for _, posting in corpus})
+    dropped = len(corpus) - len(kept_ids)
+    wrongly_dropped = len({posting for _, posting in corpus}) - len(kept_postings)
+    missed = sum(len(ids) - 1 for ids in kept_postings.values())
+    precision = (dropped - wrongly_dropped) / dropped if dropped else 1.0
+    recall = (copies - missed) / copies if copies else 1.0
+    return precision, recall
+
+
+class TestMinHash:
+    """Test signatures and normalization"""
+
+    def test_signature_estimates_jaccard(self):
+        hasher = MinHasher(num_perm=256)
+        a = [f"w{i}" for i in range(100)]
+        b = [f"w{i}" for i in range(50, 150)]  # true Jaccard 1/3
+        matches = sum(x == y for x, y in zip(hasher.signature(a), hasher.signature(b)))
+        assert abs(matches / 256 - 1 / 3) < 0.1
+        assert hasher.signature(a) == hasher.signature(list(reversed(a)))
+        print("✓ MinHash agreement estimates Jaccard")
+
+    def test_numpy_and_python_paths_agree(self):
+        if not HAS_NUMPY:
+            return
+        import job_dedup
+        hasher = MinHasher()
+        shingles = ["senior engineer", "engineer acme", "acme bengaluru"]
+        with_numpy = hasher.signature(shingles)
+        job_dedup.HAS_NUMPY = False
+        try:
+            assert hasher.signature(shingles) == with_numpy
+        finally:
+            job_dedup.HAS_NUMPY = True
+
+    def test_company_key_drops_legal_suffixes(self):
+        assert company_key("Acme Technologies Pvt. Ltd.") == company_key("ACME Technologies") == "acme technologies"
+        assert company_key("Infosys India Private Limited") == "infosys"
+
+
+class TestNearDuplicateDetector:
+    """Test LSH lookup, verification and bounded memory"""
+
+    def test_reposted_variant_is_duplicate(self):
+        detector = NearDuplicateDetector()
+        original = detector.fingerprint("Senior Software Engineer", "Acme Technologies", "Bengaluru, India", "Build scalable services with Python and AWS for our customers")
+        repost = detector.fingerprint("Sr. Software Engineer", "Acme Technologies Pvt Ltd", "Bangalore", "Build scalable services with Python and AWS for customers")
+        other_role = detector.fingerprint("Sales Executive", "Acme Technologies", "Bengaluru, India", "Build scalable services with Python and AWS for our customers")
+
+        assert detector.add("a", original) is None
+        assert detector.add("b", repost) == "a"
+        assert detector.add("c", other_role) is None
+        assert len(detector) == 2
+        print("✓ Repost merged, different role at same employer kept")
+
+    def test_memory_bounded(self):
+        detector = NearDuplicateDetector(max_items=100)
+        for i in range(500):
+            detector.add(str(i), detector.fingerprint(f"Role {i}", f"Company {i}", "Pune", f"unique text {i}"))
+
+        assert len(detector) == 100
+        assert detector.stats()["evictions"] == 400
+        assert sum(len(keys) for buckets in detector._buckets for keys in buckets.values()) == 100 * detector.bands
+        # Forgotten jobs no longer match; remembered ones still do
+        assert detector.find(detector.fingerprint("Role 0", "Company 0", "Pune", "unique text 0")) is None
+        assert detector.find(detector.fingerprint("Role 499", "Company 499", "Pune", "unique text 499")) == "499"
+        print("✓ Oldest jobs evicted, buckets cleaned up")
+
+
+class TestJobDeduplicator:
+    """Precision/recall against exact title + company keys"""
+
+    def test_precision_recall_on_synthetic_corpus(self):
+        corpus = make_corpus()
+        jobs = [job for job, _ in corpus]
+
+        exact_keys = set()
+        exact_kept = []
+        for job in jobs:
+            key = f"{job.title}_{job.company_name}".lower()
+            if key not in exact_keys:
+                exact_keys.add(key)
+                exact_kept.append(job.id)
+        _, exact_recall = precision_recall(exact_kept, corpus)
+
+        dedup = JobDeduplicator()
+        kept = dedup.filter(jobs)
+        precision, recall = precision_recall([job.id for job in kept], corpus)
+
+        assert precision >= 0.99
+        assert recall >= 0.95
+        assert recall > exact_recall + 0.3
+        assert dedup.detector.stats()["candidates_checked"] < 5 * len(jobs)
+        print(f"✓ Near-dup precision {precision:.3f}, recall {recall:.3f} (exact keys: recall {exact_recall:.3f})")
+
+    def test_streaming_batches_and_merged_sources(self):
+        corpus = make_corpus(postings=200, seed=7)
+        jobs = [job for job, _ in corpus]
+        dedup = JobDeduplicator()
+        kept = []
+        for start in range(0, len(jobs), 25):
+            kept.extend(dedup.filter(jobs[start:start + 25]))
+
+        assert [job.id for job in kept] == [job.id for job in JobDeduplicator().filter(jobs)]
+        assert dedup.near_duplicates + dedup.exact_duplicates == len(jobs) - len(kept)
+        assert dedup.filter(kept) == []
+        posting_of = {job.id: posting for job, posting in corpus}
+        for kept_id, sources in dedup.merged.items():
+            assert all(any(posting_of[job.id] == posting_of[kept_id] and job.source == source for job in jobs) for source in sources)
+
+    def test_search_all_sources_records_merged_sources(self):
+        repost = SAMPLE_INDIAN_JOBS[0].model_copy(update={
+            "id": "adzuna-repost", "source": "adzuna", "title": "Fashion Designer - Remote",
+            "company_name": "FabIndia Pvt Ltd", "location": "Bangalore"
+        })
+
+        class RepostingService(JobAggregatorService):
+            def _sample_jobs(self, query):
+                return SAMPLE_INDIAN_JOBS + [repost]
+
+        service = RepostingService()
+        service.jsearch = JSearchClient(api_key="")
+        service.adzuna = AdzunaClient(app_id="", app_key="")
+
+        jobs = asyncio.run(service.search_all_sources("fashion"))
+        kept = next(job for job in jobs if job.id == SAMPLE_INDIAN_JOBS[0].id)
+        assert "adzuna-repost" not in {job.id for job in jobs}
+        assert kept.merged_sources == ["adzuna"]
+        assert service.dedup_counters["near"] == 1
+        assert SAMPLE_INDIAN_JOBS[0].merged_sources == []
+        print("✓ Cross-source repost folded into one job with merged_sources")
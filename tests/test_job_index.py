@@ -0,0 +1,150 @@
+"""
+Job Skill Index Tests
+In-process tests for candidate pre-filtering before match scoring (no server required)
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ai_matcher import AIJobMatcher, ProfileMatchInput  # noqa: E402
+from job_index import JobSkillIndex  # noqa: E402
+from test_ai_matcher import _random_profiles_and_jobs  # noqa: E402
+
+
+def _job(job_id, title, description="", skills=None):
+    return {"id": job_id, "title": title, "description": description, "required_skills": skills or []}
+
+
+@pytest.fixture
+def index():
+    return JobSkillIndex(matcher=AIJobMatcher(), exploration_sample=0, min_jobs_to_prune=0, min_candidates=0)
+
+
+class TestJobSkillIndex:
+    """Test inverted index maintenance and candidate selection"""
+
+    def test_candidates_share_a_term(self, index):
+        """Only jobs sharing a skill or interest keyword are candidates"""
+        jobs = [
+            _job("j1", "Python Developer", "backend services"),
+            _job("j2", "Staff Nurse", "hospital ward"),
+            _job("j3", "Analyst", skills=["Advanced SQL"]),
+        ]
+        profile = ProfileMatchInput(skills=["SQL", "Python"])
+
+        assert [j["id"] for j in index.select_candidates(profile, jobs)] == ["j1", "j3"]
+        stats = index.stats()
+        assert stats["pruned"] == 1
+        assert stats["pruned_fraction"] == pytest.approx(1 / 3, abs=1e-3)
+        print("✓ Non-overlapping jobs are pruned")
+
+    def test_reindex_and_remove(self, index):
+        """Changed content replaces old postings; removal clears them"""
+        index.add_job(_job("j1", "Python Developer"))
+        index.add_job(_job("j1", "Staff Nurse", "hospital ward"))
+
+        assert index.candidate_ids(ProfileMatchInput(skills=["Python"])) == set()
+        assert index.candidate_ids(ProfileMatchInput(skills=["Nursing"])) == {"j1"}
+
+        index.remove_job("j1")
+        assert index.stats()["indexed_jobs"] == 0
+        assert index.stats()["terms"] == 0
+        print("✓ Postings follow job content")
+
+    def test_max_jobs_evicts_oldest(self):
+        index = JobSkillIndex(matcher=AIJobMatcher(), max_jobs=2)
+        index.add_jobs([_job(f"j{i}", "Python Developer") for i in range(3)])
+
+        assert index.candidate_ids(ProfileMatchInput(skills=["Python"])) == {"j1", "j2"}
+        assert index.stats()["jobs_evicted"] == 1
+        print("✓ Index is bounded")
+
+    def test_small_feeds_and_weak_profiles_not_pruned(self):
+        index = JobSkillIndex(matcher=AIJobMatcher(), min_jobs_to_prune=10, min_candidates=2)
+        jobs = [_job("j1", "Python Developer"), _job("j2", "Staff Nurse")]
+
+        assert index.select_candidates(ProfileMatchInput(skills=["Python"]), jobs) == jobs
+        assert index.select_candidates(ProfileMatchInput(), jobs * 5) == jobs * 5
+        print("✓ Small feeds are scored in full")
+
+    def test_exploration_sample_is_bounded(self):
+        index = JobSkillIndex(matcher=AIJobMatcher(), exploration_sample=3, min_jobs_to_prune=0, min_candidates=0)
+        jobs = [_job("py", "Python Developer")] + [_job(f"n{i}", "Staff Nurse") for i in range(10)]
+
+        selected = index.select_candidates(ProfileMatchInput(skills=["Python"]), jobs)
+        assert len(selected) == 4 and selected[0]["id"] == "py"
+        assert index.stats()["explored"] == 3
+        print("✓ Exploration sample added")
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_top_k_recall(self, seed):
+        """Pruned scoring finds the same top-k scores as full scoring"""
+        profiles, jobs = _random_profiles_and_jobs(seed, m=300)
+        index = JobSkillIndex(matcher=AIJobMatcher(), exploration_sample=0)
+
+        for profile in profiles:
+            selected = index.select_candidates(profile, jobs)
+            assert index.record_recall(profile, jobs, selected, top_k=20) == 1.0
+        assert index.stats()["shadow_top_k_recall"] == 1.0
+        print(f"✓ Top-k recall 1.0 (seed {seed})")
+
+    def test_related_phrases_match_linear_scan(self, index):
+        """The trigram/length lookup returns exactly the phrases the linear scan did"""
+        rng = random.Random(5)
+        vocab = ["sql", "advanced sql", "python", "py", "ms excel", "excel", "fashion design", "design", "c#", "r"]
+        for i in range(60):
+            index.add_job(_job(f"j{i}", "Role", skills=rng.sample(vocab, 3)))
+        index.remove_job("j0")
+
+        for skill in ["SQL", "Advanced SQL Server", "Py", "R", "C#", "Design", "Excel Macros", "go"]:
+            skill_lower = skill.lower()
+            expected = {p for p in index._skill_phrases if p in skill_lower or skill_lower in p}
+            assert index.related_phrases(skill_lower) == expected, skill
+
+    def test_skill_substring_of_job_text(self):
+        """A skill outside the keyword vocabulary still reaches jobs whose text contains it"""
+        index = JobSkillIndex(matcher=AIJobMatcher(), exploration_sample=0)
+        jobs = [_job(f"j{i}", "Backend Engineer", skills=["Java", "Spring", "Kafka", "AWS"]) for i in range(25)]
+        jobs += [_job(f"js{i}", "Javascript developer") for i in range(10)]
+        profile = ProfileMatchInput(skills=["Java"])
+
+        selected = index.select_candidates(profile, jobs)
+        assert {j["id"] for j in selected} >= {f"js{i}" for i in range(10)}
+        assert index.record_recall(profile, jobs, selected, top_k=20) == 1.0
+
+        index.remove_job("js0")
+        assert "js0" not in index.text_matches("java")
+        index.add_job(_job("go1", "Go developer"))
+        assert index.text_matches("go") == {"go1"}  # skills too short for trigrams
+
+    def test_default_thresholds_prune_live_sized_feed(self):
+        """~40 jobs (samples plus one page per source) are pruned with the defaults"""
+        index = JobSkillIndex(matcher=AIJobMatcher())
+        jobs = [_job(f"py{i}", "Python Developer") for i in range(20)] + [_job(f"n{i}", "Staff Nurse") for i in range(18)]
+
+        selected = index.select_candidates(ProfileMatchInput(skills=["Python"]), jobs)
+        assert len(selected) == 20 + index.exploration_sample
+        assert index.stats()["pruned"] == 18 - index.exploration_sample
+
+    def test_shadow_check_runs_off_request_path(self):
+        """maybe_check_recall returns immediately; the comparison finishes in a worker thread"""
+        index = JobSkillIndex(matcher=AIJobMatcher(), exploration_sample=0, min_jobs_to_prune=0,
+                              min_candidates=0, shadow_rate=1.0)
+        jobs = [_job("py", "Python Developer")] + [_job(f"n{i}", "Staff Nurse") for i in range(5)]
+        profile = ProfileMatchInput(skills=["Python"])
+
+        async def scenario():
+            selected = index.select_candidates(profile, jobs)
+            task = index.maybe_check_recall(profile, jobs, selected, top_k=1)
+            assert index.stats()["shadow_checks"] == 0
+            return await task
+
+        assert asyncio.run(scenario()) == 1.0
+        assert index.stats()["shadow_checks"] == 1 and not index._shadow_tasks
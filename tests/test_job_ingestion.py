@@ -0,0 +1,145 @@
+"""
+Job Ingestion Tests
+Ingestion worker against the local JSearch/Adzuna stub (Mongo tests need a local mongod)
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND))
+sys.path.insert(0, str(BACKEND / "benchmarks"))
+
+from job_aggregator import JobAggregatorService, JSearchClient, AdzunaClient, SAMPLE_INDIAN_JOBS  # noqa: E402
+from job_ingestion import JobIngestionWorker, parse_expiry  # noqa: E402
+from stub_job_sources import StubJobSourceServer  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    with StubJobSourceServer() as server:
+        yield server
+
+
+@pytest.fixture
+def aggregator(stub):
+    service = JobAggregatorService()
+    service.jsearch = JSearchClient(api_key="stub", base_url=f"{stub.url}/jsearch")
+    service.adzuna = AdzunaClient(app_id="stub", app_key="stub", base_url=f"{stub.url}/adzuna")
+    return service
+
+
+class TestNormalization:
+    """Test expiry parsing and upsert construction"""
+
+    def test_parse_expiry(self):
+        assert parse_expiry("2025-03-01T10:00:00.000Z") == datetime(2025, 3, 1, 10, tzinfo=timezone.utc)
+        assert parse_expiry("2025-03-01T10:00:00") == datetime(2025, 3, 1, 10, tzinfo=timezone.utc)
+        assert parse_expiry("not a date") is None
+        assert parse_expiry(None) is None
+
+    def test_build_upserts(self):
+        worker = JobIngestionWorker(JobAggregatorService(), default_ttl_days=10)
+        now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        expiring = SAMPLE_INDIAN_JOBS[0].model_copy(update={"expires_date": "2025-02-01T00:00:00Z"})
+        updated = SAMPLE_INDIAN_JOBS[1].model_copy(update={"title": "Updated Title"})
+
+        ops = worker.build_upserts([expiring, SAMPLE_INDIAN_JOBS[1], updated], now=now)
+
+        assert len(ops) == 2
+        by_key = {op._filter["source_job_id"]: op._doc for op in ops}
+        assert by_key["SAMPLE-001"]["$set"]["expires_at"] == datetime(2025, 2, 1, tzinfo=timezone.utc)
+        assert by_key["SAMPLE-002"]["$set"]["expires_at"] == now + timedelta(days=10)
+        assert by_key["SAMPLE-002"]["$set"]["title"] == "Updated Title"
+        assert by_key["SAMPLE-002"]["$setOnInsert"] == {"first_seen_at": now}
+        print("✓ One upsert per source job, expiry from expires_date")
+
+
+class TestIngestionRun:
+    """End-to-end run: stub APIs -> aggregated_jobs"""
+
+    def test_run_upserts_and_reingest_updates(self, stub, aggregator, mongo_url, mongo_db_name):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        ingested = []
+
+        async def scenario():
+            client = AsyncIOMotorClient(mongo_url)
+            collection = client[mongo_db_name].aggregated_jobs
+            worker = JobIngestionWorker(
+                aggregator, collection, queries=["designer", "nurse"], locations=["India"],
+                on_ingested=ingested.extend
+            )
+            await worker.ensure_indexes()
+            first = await worker.run_once()
+            second = await worker.run_once()
+            count = await collection.count_documents({})
+            doc = await collection.find_one({"source": "adzuna"})
+            client.close()
+            return first, second, count, doc
+
+        first, second, count, doc = asyncio.run(scenario())
+        assert stub.requests == 8
+        assert first["fetched"] == 40 and first["upserted"] == 40 and not first["errors"]
+        assert second["upserted"] == 0
+        assert count == 40
+        assert doc["expires_at"] > datetime.now(timezone.utc).replace(tzinfo=None) and doc["first_seen_at"] <= doc["ingested_at"]
+        assert len(ingested) == 80
+        print("✓ 40 jobs materialized, re-run upserts in place")
+
+    def test_unconfigured_sources_skipped(self, stub):
+        service = JobAggregatorService()
+        service.jsearch = JSearchClient(api_key="", base_url=f"{stub.url}/jsearch")
+        service.adzuna = AdzunaClient(app_id="", app_key="", base_url=f"{stub.url}/adzuna")
+        worker = JobIngestionWorker(service, collection=None, queries=["designer"])
+
+        run = asyncio.run(worker.run_once())
+        assert run["fetched"] == 0 and not run["errors"]
+        assert stub.requests == 0
+
+
+class TestQuotaBudget:
+    """Scheduled runs stay within each source's free-tier quota"""
+
+    def test_default_intervals_fit_quotas(self, aggregator):
+        worker = JobIngestionWorker(aggregator, collection=None, quotas={"jsearch": 100, "adzuna": 1000})
+        status = worker.status()["sources"]
+
+        assert len(worker.targets) == 9
+        assert status["jsearch"]["calls_per_month"] <= 50 and status["adzuna"]["calls_per_month"] <= 500
+        assert worker.source_interval(aggregator.jsearch) == pytest.approx(5.4 * 24 * 3600)
+        print("✓ JSearch every 5.4 days, Adzuna every 13h by default")
+
+    def test_only_due_sources_called(self, stub, aggregator):
+        worker = JobIngestionWorker(aggregator, collection=None, queries=["designer"], interval=60,
+                                    quotas={"jsearch": 100, "adzuna": 1000})
+        assert [s.NAME for s in worker.due_sources()] == ["jsearch", "adzuna"]
+
+        worker.last_source_run = {"jsearch": 0.0, "adzuna": 0.0}
+        due = worker.due_sources(now=worker.source_interval(aggregator.adzuna))
+        assert [s.NAME for s in due] == ["adzuna"]
+
+        run = asyncio.run(worker.run_once(due))  # no collection: the upsert step errors, fetches still count
+        assert run["sources"] == ["adzuna"] and stub.requests == 1
+        assert worker.last_source_run["adzuna"] > 0 and worker.last_source_run["jsearch"] == 0.0
+
+    def test_manual_run_respects_budget(self, stub, aggregator):
+        worker = JobIngestionWorker(aggregator, collection=None, queries=["designer"], interval=60,
+                                    quotas={"jsearch": 100, "adzuna": 1000})
+
+        async def scenario():
+            first = await worker.run_due()
+            calls = stub.requests
+            skipped = await worker.run_due()
+            assert stub.requests == calls
+            forced = await worker.run_due(force=True)
+            return first, calls, skipped, forced
+
+        first, calls, skipped, forced = asyncio.run(scenario())
+        assert first["sources"] == ["jsearch", "adzuna"] and calls == 2
+        assert skipped["skipped"] and set(skipped["next_run_at"]) == {"jsearch", "adzuna"}
+        assert forced["sources"] == ["jsearch", "adzuna"] and stub.requests == 4
+        print("✓ Manual runs skip sources that aren't due unless forced")
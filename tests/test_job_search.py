@@ -0,0 +1,92 @@
+"""
+Job Search Tests
+Filters for GET /api/jobs (Mongo tests need a local mongod)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from job_search import build_jobs_filter, find_jobs, ensure_job_indexes, backfill_pincode_prefix, pincode_prefix  # noqa: E402
+
+JOBS = [
+    {"id": "1", "title": "Software Developer", "description": "Build apps using React and Python", "company_name": "TechCorp India", "pincode": "560001", "is_active": True, "created_at": "2025-01-01"},
+    {"id": "2", "title": "Data Entry Operator", "description": "Python scripts a plus", "company_name": "TechCorp India", "pincode": "560 002", "is_active": True, "created_at": "2025-01-03"},
+    {"id": "3", "title": "Nurse - ICU", "description": "Critical care nursing", "company_name": "HealthFirst Hospital", "pincode": "400001", "is_active": True, "created_at": "2025-01-02"},
+    {"id": "4", "title": "Python Developer", "description": "Backend services", "company_name": "Closed Co", "pincode": "560003", "is_active": False, "created_at": "2025-01-04"},
+]
+
+
+class TestJobsFilter:
+    """Test filter construction"""
+
+    def test_pincode_prefix(self):
+        assert pincode_prefix("560001") == "560"
+        assert pincode_prefix(" 560 001 ") == "560"
+        assert pincode_prefix(None) == ""
+
+    def test_text_mode(self):
+        query = build_jobs_filter(division="Technology", pincode="560034", search="react developer", mode="text")
+        assert query == {
+            "is_active": True, "division": "Technology", "pincode_prefix": "560",
+            "$text": {"$search": "react developer"}
+        }
+
+    def test_regex_is_default(self):
+        query = build_jobs_filter(search="dev")
+        assert "$text" not in query
+        assert query["$or"][0] == {"title": {"$regex": "dev", "$options": "i"}}
+
+    def test_short_pincode_keeps_prefix_regex(self):
+        assert build_jobs_filter(pincode="56") == {"is_active": True, "pincode": {"$regex": "^56"}}
+        assert build_jobs_filter(pincode="5") == {"is_active": True, "pincode": {"$regex": "^5"}}
+
+    def test_regex_mode_escapes_search(self):
+        query = build_jobs_filter(search="c++ (senior)", mode="regex")
+        assert query["$or"][0] == {"title": {"$regex": r"c\+\+\ \(senior\)", "$options": "i"}}
+        print("✓ Regex search is a literal substring match")
+
+
+class TestJobsSearchMongo:
+    """Indexes, backfill and ranking against a real mongod"""
+
+    def test_backfill_indexes_and_search(self, mongo_url, mongo_db_name):
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def scenario():
+            client = AsyncIOMotorClient(mongo_url)
+            collection = client[mongo_db_name].jobs
+            await collection.insert_many([dict(job) for job in JOBS])
+
+            regex_before_index = await find_jobs(collection, search="python")
+            backfilled = await backfill_pincode_prefix(collection, batch_size=3)
+            await ensure_job_indexes(collection)
+            await ensure_job_indexes(collection)  # idempotent
+
+            results = {
+                "text": await find_jobs(collection, search="data python", mode="text"),
+                "stemmed": await find_jobs(collection, search="nursing", mode="text"),
+                "pincode": await find_jobs(collection, pincode="560099"),
+                "pincode_text": await find_jobs(collection, pincode="560", search="developer", mode="text"),
+                "substring": await find_jobs(collection, search="dev"),
+                "short_pincode": await find_jobs(collection, pincode="56"),
+            }
+            plan = await collection.find({"is_active": True, "pincode_prefix": "560"}).sort("created_at", -1).limit(20).explain()
+            client.close()
+            return regex_before_index, backfilled, results, plan
+
+        regex_before_index, backfilled, results, plan = asyncio.run(scenario())
+        assert [job["id"] for job in regex_before_index] == ["2", "1"]
+        assert backfilled == 4
+        # Title match outranks a description-only match; inactive jobs excluded
+        assert [job["id"] for job in results["text"]] == ["2", "1"]
+        assert [job["id"] for job in results["stemmed"]] == ["3"]
+        assert [job["id"] for job in results["pincode"]] == ["2", "1"]
+        assert [job["id"] for job in results["pincode_text"]] == ["1"]
+        assert [job["id"] for job in results["substring"]] == ["1"]
+        assert [job["id"] for job in results["short_pincode"]] == ["2", "1"]
+        assert all("score" not in job and "pincode_prefix" not in job for found in results.values() for job in found)
+        assert "jobs_active_pincode_recent" in str(plan["queryPlanner"]["winningPlan"])
+        print("✓ Text index ranks title matches first, pincode filter uses compound index")
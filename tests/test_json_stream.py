@@ -0,0 +1,65 @@
+"""
+Incremental JSON Field Parser Tests
+Fields must come out as soon as they close, however the text is chunked
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from json_stream import JSONFieldStream  # noqa: E402
+
+REPLY = {
+    "spokenText": "Python is the \"first\" skill to learn.",
+    "displayText": "Start with Python\\basics, then ML.\nTry Kaggle 🚀 or हिंदी courses.",
+    "followUp": "Want {free} courses?"
+}
+
+
+def feed_all(text, size):
+    parser = JSONFieldStream()
+    events = []
+    for start in range(0, len(text), size):
+        for name, value in parser.feed(text[start:start + size]):
+            events.append((start + size, name, value))
+    return parser, events
+
+
+class TestJSONFieldStream:
+    """Test field emission under arbitrary chunking"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+    def test_any_chunking_gives_same_fields(self, size):
+        text = "```json\n" + json.dumps(REPLY, ensure_ascii=False) + "\n```"
+        parser, events = feed_all(text, size)
+        assert [(name, value) for _, name, value in events] == list(REPLY.items())
+        assert parser.done and parser.fields == REPLY
+
+    def test_spoken_text_emitted_before_rest_arrives(self):
+        text = json.dumps(REPLY)
+        spoken_end = text.index('", "displayText"') + 1
+        parser = JSONFieldStream()
+        assert parser.feed(text[:spoken_end - 1]) == []
+        assert parser.feed(text[spoken_end - 1:spoken_end]) == [("spokenText", REPLY["spokenText"])]
+        print(f"✓ spokenText available after {spoken_end} of {len(text)} characters")
+
+    def test_non_string_values(self):
+        text = '{"n": -1.5e2, "ok": true, "tags": ["a", "b]"], "meta": {"x": {"y": "}"}}, "s": "z"}'
+        parser, events = feed_all(text, 1)
+        assert parser.fields == json.loads(text)
+        assert [name for _, name, _ in events] == ["n", "ok", "tags", "meta", "s"]
+
+    def test_invalid_object_raises(self):
+        with pytest.raises(ValueError):
+            JSONFieldStream().feed('{"a" "b"}')
+        with pytest.raises(ValueError):
+            JSONFieldStream().feed('{"a": "b" x}')
+
+    def test_prose_without_object_emits_nothing(self):
+        parser = JSONFieldStream()
+        assert parser.feed("Sure! Python is a great start.") == []
+        assert not parser.done
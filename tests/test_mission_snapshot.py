@@ -0,0 +1,135 @@
+"""
+Mission Board Snapshot Tests
+Snapshot readiness, caching and invalidation (Mongo test needs a local mongod)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import captain_command  # noqa: E402
+from captain_command import BusinessVertical, vertical_progress  # noqa: E402
+
+
+class RowsCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def to_list(self, length):
+        return self.rows
+
+
+class RowsCollection:
+    """Minimal stand-in for Motor aggregate(); returns fixed rows and counts calls"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def aggregate(self, pipeline):
+        self.calls += 1
+        return RowsCursor(self.rows)
+
+
+class RowsDB:
+    def __init__(self, leaders, sessions):
+        self.vertical_leaders = RowsCollection(leaders)
+        self.onboarding_sessions = RowsCollection(sessions)
+
+
+@pytest.fixture
+def board_db():
+    fake = RowsDB(
+        leaders=[
+            {"_id": "B2G", "leader": {"leader_name": "Asha", "designation": "Vertical Director", "team_size": 3}},
+            {"_id": "B2C", "leader": {"leader_name": "Ravi", "designation": "Vertical Director", "team_size": 10}},
+        ],
+        sessions=[
+            {"_id": "B2G", "session": {"current_kata": 2, "status": "kata_2"}},
+            {"_id": "D2D", "session": {"current_kata": 4, "status": "orbit"}},  # no active leader: ignored
+        ]
+    )
+    previous = captain_command.db
+    captain_command.set_database(fake)
+    captain_command.invalidate_mission_board()
+    yield fake
+    captain_command.set_database(previous)
+    captain_command.invalidate_mission_board()
+
+
+class TestMissionSnapshot:
+    """Test readiness and the cached snapshot"""
+
+    def test_vertical_progress_readiness(self):
+        leader = {"leader_name": "Asha", "team_size": 3}
+        assert vertical_progress(BusinessVertical.B2G, None, None)["status"] == "vacant"
+        assigned = vertical_progress(BusinessVertical.B2G, leader, None)
+        assert (assigned["status"], assigned["kata_progress"], assigned["readiness_percent"]) == ("assigned", 10, 50)
+        onboarding = vertical_progress(BusinessVertical.B2G, leader, {"current_kata": 2, "status": "kata_2"})
+        assert (onboarding["kata_progress"], onboarding["readiness_percent"]) == (50, 70)
+
+    def test_board_and_leaderboard_share_one_snapshot(self, board_db):
+        async def scenario():
+            board = await captain_command.get_mission_board()
+            again = await captain_command.get_mission_board()
+            leaderboard = await captain_command.get_vertical_leaderboard()
+            return board, again, leaderboard
+
+        board, again, leaderboard = asyncio.run(scenario())
+        by_code = {v["code"]: v for v in board["verticals_progress"]}
+        assert by_code["B2G"]["readiness_percent"] == 70
+        assert by_code["B2C"]["status"] == "assigned" and by_code["B2C"]["readiness_percent"] == 55
+        assert by_code["D2D"]["status"] == "vacant"
+        assert board["launch_readiness_percent"] == int((70 + 55) / 7)
+        assert [v["code"] for v in leaderboard["leaderboard"][:2]] == ["B2G", "B2C"]
+        assert "rank" not in again["verticals_progress"][0]
+        assert board_db.vertical_leaders.calls == 1 and board_db.onboarding_sessions.calls == 1
+        print("✓ Board, board and leaderboard served from one pair of aggregations")
+
+    def test_writes_invalidate(self, board_db):
+        async def scenario():
+            await captain_command.get_mission_board()
+            board_db.vertical_leaders.rows = []
+            captain_command.invalidate_mission_board()
+            return await captain_command.get_mission_board()
+
+        board = asyncio.run(scenario())
+        assert board["launch_readiness_percent"] == 0 and board["mission_status"] == "MOBILIZING"
+        assert board_db.vertical_leaders.calls == 2
+
+
+class TestMissionSnapshotMongo:
+    """Aggregations against a real mongod"""
+
+    def test_latest_session_and_active_leader(self, mongo_url, mongo_db_name):
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def scenario():
+            client = AsyncIOMotorClient(mongo_url)
+            db = client[mongo_db_name]
+            await db.vertical_leaders.insert_many([
+                {"vertical": "B2G", "leader_name": "Old", "status": "replaced", "assigned_at": "2025-01-01", "team_size": 9},
+                {"vertical": "B2G", "leader_name": "Asha", "status": "active", "assigned_at": "2025-02-01", "team_size": 3},
+            ])
+            await db.onboarding_sessions.insert_many([
+                {"vertical": "B2G", "status": "kata_1", "current_kata": 1, "started_at": "2025-02-02"},
+                {"vertical": "B2G", "status": "kata_3", "current_kata": 3, "started_at": "2025-02-05"},
+                {"vertical": "B2G", "status": "not_started", "current_kata": 4, "started_at": "2025-02-09"},
+            ])
+            previous = captain_command.db
+            captain_command.set_database(db)
+            captain_command.invalidate_mission_board()
+            try:
+                return await captain_command.build_mission_snapshot()
+            finally:
+                captain_command.set_database(previous)
+                captain_command.invalidate_mission_board()
+                client.close()
+
+        snapshot = asyncio.run(scenario())
+        b2g = next(v for v in snapshot["verticals_progress"] if v["code"] == "B2G")
+        assert (b2g["leader_name"], b2g["status"], b2g["kata_progress"], b2g["team_size"]) == ("Asha", "kata_3", 75, 3)
@@ -0,0 +1,129 @@
+"""
+LLM Response Cache Tests
+Normalization, exact and similar-prompt tiers, keying, TTL/LRU and hit-rate metrics
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from job_dedup import jaccard  # noqa: E402
+from response_cache import ResponseCache, normalize_prompt, prompt_version, shingles  # noqa: E402
+
+# Near-identical prompts that need different answers
+OPPOSITE_PAIRS = [
+    ("not interested in sales", "interested in sales"),
+    ("what after 10th", "what after 12th"),
+    ("jobs for women", "jobs for men"),
+]
+
+
+class TestNormalization:
+    """Test prompt normalization"""
+
+    def test_case_punctuation_and_spacing(self):
+        assert normalize_prompt("  What CAREER suits me?? ") == "what career suits me"
+        assert normalize_prompt("How to improve\tincome…") == "how to improve income"
+
+    def test_symbols_kept(self):
+        """Questions differing only in a symbol are different questions"""
+        keys = {normalize_prompt(f"How do I learn {lang}?") for lang in ["C++", "C#", "C"]}
+        assert keys == {"how do i learn c++", "how do i learn c#", "how do i learn c"}
+        assert normalize_prompt("Is a 10% raise good?") != normalize_prompt("Is a 10 raise good?")
+        assert normalize_prompt("Salary ₹20000 or $250?") == "salary ₹20000 or $250"
+
+    def test_symbol_pairs_not_shared(self):
+        cache = ResponseCache()
+        cache.set("chat", "How do I learn C++?", "cpp", version="v")
+        cache.set("chat", "Is a 10% raise good?", "percent", version="v")
+        assert cache.get("chat", "How do I learn C#?", version="v") is None
+        assert cache.get("chat", "How do I learn C?", version="v") is None
+        assert cache.get("chat", "Is a 10 raise good?", version="v") is None
+        assert cache.get("chat", "how do i learn c++", version="v") == "cpp"
+
+    def test_indic_vowel_signs_kept(self):
+        assert normalize_prompt("నాకు ఏ కెరీర్ సరిపోతుంది?") == "నాకు ఏ కెరీర్ సరిపోతుంది"
+        assert normalize_prompt("ಆದಾಯ ಹೆಚ್ಚಿಸುವುದು ಹೇಗೆ?") == "ಆದಾಯ ಹೆಚ್ಚಿಸುವುದು ಹೇಗೆ"
+
+    def test_prompt_version_changes_with_prompt(self):
+        assert prompt_version("A", {"t": 1}) == prompt_version("A", {"t": 1})
+        assert prompt_version("A", {"t": 1}) != prompt_version("B", {"t": 1})
+
+
+class TestResponseCache:
+    """Test the two lookup tiers"""
+
+    def test_exact_tier_after_normalization(self):
+        cache = ResponseCache(similarity_threshold=None)
+        cache.set("chat", "What career suits me?", "Try nursing", version="v1")
+        assert cache.get("chat", "what career suits me", version="v1") == "Try nursing"
+        assert cache.get("chat", "what career suits me best", version="v1") is None
+        print("✓ Exact tier ignores case and punctuation")
+
+    def test_keyed_by_language_and_version(self):
+        cache = ResponseCache()
+        cache.set("gemma", "career", "en answer", language="en", version="v1")
+        assert cache.get("gemma", "career", language="te", version="v1") is None
+        assert cache.get("gemma", "career", language="en", version="v2") is None
+        assert cache.get("gemma", "career", language="en", version="v1") == "en answer"
+
+    def test_default_is_exact_only(self):
+        """Negation, number and gender pairs never share an answer by default"""
+        cache = ResponseCache()
+        assert cache.similarity_threshold is None
+        for first, second in OPPOSITE_PAIRS:
+            cache.set("chat", first, first, version="v")
+            assert cache.get("chat", second, version="v") is None
+            cache.set("chat", second, second, version="v")
+            assert cache.get("chat", first, version="v") == first
+        assert cache.stats()["endpoints"]["chat"]["similar_hits"] == 0
+
+    def test_similarity_tier_conflates_negation(self):
+        """Why the similarity tier is opt-in: a negation stays above 0.8 Jaccard"""
+        first, second = OPPOSITE_PAIRS[0]
+        assert jaccard(shingles(normalize_prompt(first)), shingles(normalize_prompt(second))) >= 0.8
+        cache = ResponseCache(similarity_threshold=0.8)
+        cache.set("chat", first, "no sales roles", version="v")
+        assert cache.get("chat", second, version="v") == "no sales roles"
+
+    def test_similar_tier(self):
+        cache = ResponseCache(similarity_threshold=0.75)
+        cache.set("chat", "How to improve income?", "Learn a trade", version="v1")
+        cache.set("chat", "How to improve my English?", "Practice daily", version="v1")
+        assert cache.get("chat", "how to improve my income", version="v1") == "Learn a trade"
+        assert cache.get("chat", "how can I improve my english speaking", version="v1") is None
+        assert cache.get("chat", "government schemes for farmers", version="v1") is None
+        stats = cache.stats()["endpoints"]["chat"]
+        assert (stats["exact_hits"], stats["similar_hits"], stats["misses"]) == (0, 1, 2)
+        print("✓ Similar tier matches rephrasings above the threshold only")
+
+    def test_best_candidate_wins(self):
+        cache = ResponseCache(similarity_threshold=0.5)
+        cache.set("chat", "what career suits me", "generic", version="v")
+        cache.set("chat", "what career suits me best", "best", version="v")
+        assert cache.get("chat", "what career suits me the best", version="v") == "best"
+
+    def test_ttl_and_lru(self, clock):
+        cache = ResponseCache(ttl=60, maxsize=2, similarity_threshold=0.8, clock=clock)
+        cache.set("chat", "a question", 1)
+        cache.set("chat", "b question", 2)
+        assert cache.get("chat", "a question") == 1  # a is now most recent
+        cache.set("chat", "c question", 3)
+        assert cache.get("chat", "b question") is None and cache.get("chat", "a question") == 1
+        clock.now += 61
+        assert cache.get("chat", "a question") is None and cache.get("chat", "c question") is None
+        assert cache.stats()["size"] == 0
+        assert not cache._buckets  # expired entries leave no LSH bucket behind
+
+    def test_hit_rate_per_endpoint_and_bypass(self):
+        cache = ResponseCache()
+        cache.set("simple", "hi there", "hello", version="v")
+        cache.get("simple", "hi there", version="v")
+        cache.get("stream", "hi there", version="v")  # same prompt version: shared entry
+        cache.get("stream", "something else", version="v")
+        cache.bypass("aimee_chat")
+        endpoints = cache.stats()["endpoints"]
+        assert endpoints["simple"]["hit_rate"] == 1.0
+        assert endpoints["stream"]["hit_rate"] == 0.5
+        assert endpoints["aimee_chat"]["bypassed"] == 1 and endpoints["aimee_chat"]["hit_rate"] is None
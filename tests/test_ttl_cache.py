@@ -0,0 +1,112 @@
+"""
+TTL Cache Tests
+Expiry, coalescing, invalidation and failure handling
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from ttl_cache import TTLCache  # noqa: E402
+
+
+class Counter:
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("primary unavailable")
+        return {"value": self.calls}
+
+
+class TestTTLCache:
+    """Test the dashboard result cache"""
+
+    def test_hit_until_ttl_then_recompute(self, clock):
+        cache = TTLCache(ttl=5, clock=clock)
+        compute = Counter()
+
+        async def scenario():
+            first = await cache.get_or_compute("stats", compute)
+            clock.now += 4
+            second = await cache.get_or_compute("stats", compute)
+            clock.now += 2
+            third = await cache.get_or_compute("stats", compute)
+            return first, second, third
+
+        assert asyncio.run(scenario()) == ({"value": 1}, {"value": 1}, {"value": 2})
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+        print("✓ Served from cache within TTL")
+
+    def test_concurrent_misses_share_one_computation(self):
+        cache = TTLCache(ttl=5)
+        compute = Counter(delay=0.05)
+
+        async def scenario():
+            return await asyncio.gather(*(cache.get_or_compute("stats", compute) for _ in range(20)))
+
+        results = asyncio.run(scenario())
+        assert compute.calls == 1 and all(result == {"value": 1} for result in results)
+        assert cache.stats()["coalesced"] == 19
+        print("✓ 20 concurrent dashboard polls, 1 aggregation")
+
+    def test_failures_not_cached(self):
+        cache = TTLCache(ttl=5)
+        compute = Counter(fail=True)
+
+        async def scenario():
+            results = await asyncio.gather(*(cache.get_or_compute("stats", compute) for _ in range(3)), return_exceptions=True)
+            compute.fail = False
+            return results, await cache.get_or_compute("stats", compute)
+
+        results, recovered = asyncio.run(scenario())
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert recovered == {"value": 2}
+
+    def test_invalidate_during_compute_not_stored(self):
+        cache = TTLCache(ttl=5)
+        compute = Counter(delay=0.05)
+
+        async def scenario():
+            pending = asyncio.ensure_future(cache.get_or_compute("stats", compute))
+            await asyncio.sleep(0.01)
+            cache.invalidate("stats")
+            stale = await pending
+            fresh = await cache.get_or_compute("stats", compute)
+            return stale, fresh
+
+        assert asyncio.run(scenario()) == ({"value": 1}, {"value": 2})
+
+    def test_lru_bound(self, clock):
+        cache = TTLCache(ttl=60, maxsize=2, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+        cache.invalidate()
+        assert cache.get("a") is None
+
+    def test_cancelled_computation_propagates(self):
+        cache = TTLCache(ttl=5)
+        compute = Counter(delay=1)
+
+        async def scenario():
+            task = asyncio.ensure_future(cache.get_or_compute("stats", compute))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            compute.delay = 0
+            return await cache.get_or_compute("stats", compute)
+
+        assert asyncio.run(scenario()) == {"value": 2}